@@ -0,0 +1,195 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Log Module
+
+Structured record of what happened in a battle. Every action is stored as a
+BattleEvent in a fixed-size ring buffer; the human-readable line is only
+built when a console is attached (or when someone asks for it later), so
+headless fights do not pay for string formatting.
+
+Events can be archived in a compact binary file:
+
+    magic b"QCBL", version byte
+    string table: count, then (length, utf-8 bytes) per string
+    event count, then one fixed-size record per event
+
+Actor, action and target names are stored once in the string table and
+referenced by index from each record.
+"""
+
+import struct
+import sys
+from collections import deque, namedtuple
+from custom_exceptions import CorruptedDataError
+
+BattleEvent = namedtuple("BattleEvent", "turn actor action target damage hp_after")
+
+DEFAULT_CAPACITY = 1000
+
+MAGIC = b"QCBL"
+VERSION = 1
+NO_TARGET = 0xFFFF
+HEADER_FORMAT = "<4sB"
+COUNT_FORMAT = "<I"
+STRING_LENGTH_FORMAT = "<H"
+EVENT_FORMAT = "<IHHHii"    # turn, actor, action, target, damage, hp_after
+
+# ============================================================================
+# TEXT FORMATTING
+# ============================================================================
+
+EVENT_FORMATS = {
+    "attack": "{actor} hits {target} for {damage} damage!",
+    "dot": "{actor} deals {damage} damage to {target}!",
+    "stunned": "{actor} is stunned and cannot act!",
+    "cooldown": "{actor}'s ability is on cooldown!",
+    "escape": "{actor} successfully escaped!",
+    "escape_failed": "Escape failed!",
+    "defeated": "{actor} has been defeated!",
+    "invalid": "Invalid choice — {actor} loses the turn."
+}
+
+GENERIC_FORMAT = "{actor} uses {action} on {target} ({damage})"
+
+
+def register_event_format(action, template):
+    """
+    Template for an action, formatted with the BattleEvent fields.
+    """
+    EVENT_FORMATS[action] = template
+
+
+def format_event(event):
+    template = EVENT_FORMATS.get(event.action, GENERIC_FORMAT)
+    return template.format(**event._asdict())
+
+
+def console_attached():
+    return sys.stdout is not None and sys.stdout.isatty()
+
+# ============================================================================
+# BATTLE LOG
+# ============================================================================
+
+class BattleLog:
+    """
+    Ring buffer of the most recent BattleEvents of a battle.
+
+    echo=True prints each event as it is recorded, echo=False never does,
+    and the default prints only when stdout is a terminal.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, echo=None):
+        self.events = deque(maxlen=capacity)
+        if echo is None:
+            echo = console_attached()
+        self.echo = echo
+
+    def record(self, turn, actor, action, target=None, damage=0, hp_after=0):
+        event = BattleEvent(turn, actor, action, target, damage, hp_after)
+        self.events.append(event)
+        if self.echo:
+            print(f">>> {format_event(event)}")
+        return event
+
+    def lines(self):
+        """
+        Human-readable text for every buffered event, built on demand.
+        """
+        for event in self.events:
+            yield format_event(event)
+
+    def save(self, filename):
+        return save_battle_log(self.events, filename)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+# ============================================================================
+# BINARY ENCODING
+# ============================================================================
+
+def encode_events(events):
+    """
+    Pack events into the compact binary archive format.
+    """
+    strings = []
+    string_index = {}
+
+    def intern(text):
+        if text not in string_index:
+            string_index[text] = len(strings)
+            strings.append(text)
+        return string_index[text]
+
+    records = []
+    for event in events:
+        target = NO_TARGET if event.target is None else intern(event.target)
+        records.append(struct.pack(
+            EVENT_FORMAT, event.turn, intern(event.actor), intern(event.action),
+            target, event.damage, event.hp_after
+        ))
+
+    parts = [struct.pack(HEADER_FORMAT, MAGIC, VERSION), struct.pack(COUNT_FORMAT, len(strings))]
+    for text in strings:
+        raw = text.encode("utf-8")
+        parts.append(struct.pack(STRING_LENGTH_FORMAT, len(raw)))
+        parts.append(raw)
+
+    parts.append(struct.pack(COUNT_FORMAT, len(records)))
+    parts.extend(records)
+    return b"".join(parts)
+
+
+def decode_events(data):
+    """
+    Unpack a binary archive back into a list of BattleEvents.
+    Raises CorruptedDataError if the data is not a valid archive.
+    """
+    try:
+        magic, version = struct.unpack_from(HEADER_FORMAT, data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise CorruptedDataError("Not a battle log archive.")
+        offset = struct.calcsize(HEADER_FORMAT)
+
+        (string_count,) = struct.unpack_from(COUNT_FORMAT, data, offset)
+        offset += struct.calcsize(COUNT_FORMAT)
+        strings = []
+        for _ in range(string_count):
+            (length,) = struct.unpack_from(STRING_LENGTH_FORMAT, data, offset)
+            offset += struct.calcsize(STRING_LENGTH_FORMAT)
+            strings.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+
+        (event_count,) = struct.unpack_from(COUNT_FORMAT, data, offset)
+        offset += struct.calcsize(COUNT_FORMAT)
+        events = []
+        for turn, actor, action, target, damage, hp_after in struct.iter_unpack(
+                EVENT_FORMAT, data[offset:offset + event_count * struct.calcsize(EVENT_FORMAT)]):
+            events.append(BattleEvent(
+                turn, strings[actor], strings[action],
+                None if target == NO_TARGET else strings[target],
+                damage, hp_after
+            ))
+    except CorruptedDataError:
+        raise
+    except Exception:
+        raise CorruptedDataError("Battle log archive is unreadable.")
+
+    if len(events) != event_count:
+        raise CorruptedDataError("Battle log archive is truncated.")
+    return events
+
+
+def save_battle_log(events, filename):
+    with open(filename, "wb") as f:
+        f.write(encode_events(events))
+    return True
+
+
+def load_battle_log(filename):
+    with open(filename, "rb") as f:
+        return decode_events(f.read())
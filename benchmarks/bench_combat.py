@@ -0,0 +1,80 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Combat Micro-Benchmark
+
+Per-turn cost of PartyBattle with the precomputed DamageTable versus
+recomputing the damage formula on every hit (the old behaviour).
+
+Run from the project root:
+    python benchmarks/bench_combat.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+
+PARTY_SIZE = 20
+HORDE_SIZE = 40
+TURNS = 100000
+CLASSES = ["Warrior", "Mage", "Rogue", "Cleric"]
+
+
+class UncachedDamageTable(combat_system.DamageTable):
+    """
+    Same interface, but recomputes everything on every lookup.
+    """
+
+    def damage(self, attacker_index, defender_index):
+        return combat_system.calculate_damage(self.combatants[attacker_index],
+                                              self.combatants[defender_index])
+
+    def power(self, index, ability):
+        if ability.power is None:
+            return None
+        return ability.power(self.combatants[index])
+
+
+def build_battle():
+    party = []
+    for i in range(PARTY_SIZE):
+        hero = character_manager.create_character(f"Hero{i}", CLASSES[i % len(CLASSES)])
+        hero["health"] = hero["max_health"] = 10 ** 9
+        party.append(hero)
+
+    horde = []
+    for i in range(HORDE_SIZE):
+        enemy = combat_system.create_enemy("orc")
+        enemy["name"] = f"Orc{i}"
+        enemy["health"] = enemy["max_health"] = 10 ** 9
+        horde.append(enemy)
+
+    return combat_system.PartyBattle(party, horde)
+
+
+def time_turns(cached):
+    battle = build_battle()
+    if not cached:
+        battle.damage_table = UncachedDamageTable(battle.combatants)
+        battle.effects.on_stat_change = battle.damage_table.invalidate
+
+    start = time.perf_counter()
+    for _ in range(TURNS):
+        battle.take_turn()
+    return (time.perf_counter() - start) / TURNS
+
+
+if __name__ == "__main__":
+    print("=== COMBAT BENCHMARK ===")
+    print(f"{PARTY_SIZE} heroes vs {HORDE_SIZE} orcs, {TURNS} turns")
+
+    before = time_turns(cached=False)
+    after = time_turns(cached=True)
+
+    print(f"Recomputed damage: {before * 1e6:.2f} us/turn")
+    print(f"Damage table:      {after * 1e6:.2f} us/turn")
+    print(f"Speedup:           {before / after:.2f}x")
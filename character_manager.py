@@ -11,6 +11,12 @@ and integrated by me.
 """
 
 import os
+import math
+import game_events
+import lazy_loader
+import inventory_system
+import character_stats
+import quest_objectives
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -19,6 +25,10 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# NumPy is optional and only imported for the first big batch;
+# without it batch level-ups fall back to math.isqrt
+NUMPY_BATCH_MIN = 256   # below this the plain loop is faster
+
 # ============================================================================
 # CHARACTER CREATION
 # ============================================================================
@@ -36,6 +46,20 @@ REQUIRED_FIELDS = [
     "inventory", "active_quests", "completed_quests"
 ]
 
+# Saved only when the character has them; older saves load without them
+OPTIONAL_FIELDS = [
+    "inventory_capacity", "equipped_weapon", "equipped_armor", "modifiers",
+    "quest_progress", "quest_deadlines", "quest_resets"
+]
+
+# {quest_id: unix time} fields, saved as "quest_id=time;..."
+TIMESTAMP_FIELDS = ["quest_deadlines", "quest_resets"]
+
+INT_FIELDS = [
+    "level", "health", "max_health", "strength", "magic", "experience", "gold",
+    "inventory_capacity"
+]
+
 
 def create_character(name, character_class):
     """
@@ -59,7 +83,7 @@ def create_character(name, character_class):
         "magic": base["magic"],
         "experience": 0,
         "gold": 100,
-        "inventory": [],
+        "inventory": inventory_system.Inventory(),
         "active_quests": [],
         "completed_quests": []
     }
@@ -82,16 +106,63 @@ def save_character(character, save_directory="data/save_games"):
 
     try:
         with open(filename, "w") as f:
-            for key in REQUIRED_FIELDS:
-                value = character[key]
-                if isinstance(value, list):
-                    value = ",".join(value)
-                f.write(f"{key.upper()}: {value}\n")
+            f.write(format_save_data(character))
         return True
     except Exception as e:
         raise e
 
 
+def save_characters(characters, save_directory="data/save_games"):
+    """
+    Save many characters as one batch: every save is formatted first, so
+    a character that cannot be serialized stops the batch before any
+    file is touched. Returns the number of files written.
+    """
+    batch = [
+        (os.path.join(save_directory, f"{character['name']}_save.txt"), format_save_data(character))
+        for character in characters
+    ]
+
+    if batch and not os.path.exists(save_directory):
+        os.makedirs(save_directory)
+
+    for filename, text in batch:
+        with open(filename, "w") as f:
+            f.write(text)
+    return len(batch)
+
+
+def format_save_data(character):
+    """
+    The save file contents for a character, as one string.
+    """
+    stats = character_stats.saved_stats(character)
+    if "max_health" in stats:
+        stats["health"] = min(character["health"], stats["max_health"])
+
+    lines = []
+    for key in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        if character.get(key) is None:
+            continue
+        value = stats.get(key, character[key])
+        if key == "modifiers":
+            value = character_stats.encode_modifiers(character)
+        elif key == "quest_progress":
+            value = quest_objectives.encode_progress(character)
+        elif key in TIMESTAMP_FIELDS:
+            value = ";".join(f"{quest_id}={when}" for quest_id, when in value.items())
+        elif isinstance(value, (list, inventory_system.Inventory)):
+            value = ",".join(value)
+        lines.append(f"{key.upper()}: {value}\n")
+
+    # Bag order is stored as positions, not as a reordered inventory
+    inventory = character["inventory"]
+    if isinstance(inventory, inventory_system.Inventory) and not inventory.is_default_layout():
+        positions = ",".join(str(p) for p in inventory.layout_positions())
+        lines.append(f"INVENTORY_LAYOUT: {positions}\n")
+    return "".join(lines)
+
+
 def load_character(character_name, save_directory="data/save_games"):
     """
     Load character file and return character dictionary.
@@ -120,12 +191,27 @@ def load_character(character_name, save_directory="data/save_games"):
             key = key.lower().strip()
             value = value.strip()
 
-            if key in ["inventory", "active_quests", "completed_quests"]:
+            if key == "inventory":
+                character[key] = inventory_system.Inventory(value.split(",") if value else [])
+            elif key in ["active_quests", "completed_quests"]:
                 character[key] = value.split(",") if value else []
-            elif key in ["level", "health", "max_health", "strength", "magic", "experience", "gold"]:
+            elif key in INT_FIELDS:
                 character[key] = int(value)
+            elif key in TIMESTAMP_FIELDS:
+                character[key] = {
+                    quest_id.strip(): int(when)
+                    for quest_id, when in (part.split("=") for part in value.split(";") if part)
+                }
             else:
                 character[key] = value
+
+        if "modifiers" in character:
+            character_stats.restore_modifiers(character, character["modifiers"])
+        if "quest_progress" in character:
+            character["quest_progress"] = quest_objectives.decode_progress(character["quest_progress"])
+        if "inventory_layout" in character:
+            positions = character.pop("inventory_layout")
+            character["inventory"].restore_layout([int(p) for p in positions.split(",") if p])
     except Exception:
         raise InvalidSaveDataError("Invalid formatting in save file")
 
@@ -181,22 +267,95 @@ def gain_experience(character, xp_amount):
         character["level"] += 1
 
         # Stat increases
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
+        character_stats.modify_base_stat(character, "max_health", 10)
+        character_stats.modify_base_stat(character, "strength", 2)
+        character_stats.modify_base_stat(character, "magic", 2)
         character["health"] = character["max_health"]
 
+        if game_events.listening("level_up"):
+            game_events.emit(game_events.LevelEvent("level_up", character, character["level"]))
 
 
-def add_gold(character, amount):
+
+def xp_to_reach(level):
+    """
+    Total XP spent to get from level 1 to `level` (100 per level reached:
+    100 + 200 + ... + (level - 1) * 100).
+    """
+    return 50 * level * (level - 1)
+
+
+def level_for_total_xp(total):
+    """
+    Highest level whose xp_to_reach fits in `total` (closed form).
+    """
+    return (1 + math.isqrt(1 + 4 * (total // 50))) // 2
+
+
+def levels_for_total_xp(totals):
+    """
+    level_for_total_xp for a whole list, vectorized when NumPy is available.
+    """
+    np = lazy_loader.optional_import("numpy") if len(totals) >= NUMPY_BATCH_MIN else None
+    if np is None:
+        return [level_for_total_xp(total) for total in totals]
+
+    c = np.asarray(totals, dtype=np.int64) // 50
+    radicand = 1 + 4 * c
+    root = np.floor(np.sqrt(radicand.astype(np.float64))).astype(np.int64)
+    # float sqrt can be off by one for large values
+    root = np.where(root * root > radicand, root - 1, root)
+    root = np.where((root + 1) * (root + 1) <= radicand, root + 1, root)
+    return ((1 + root) // 2).tolist()
+
+
+def gain_experience_batch(characters, xp_amount):
+    """
+    Give every living character xp_amount XP at once (dead ones are
+    skipped): new levels come from the closed form instead of looping
+    level by level. One level_up event is emitted per level gained, as
+    gain_experience does.
+    Returns the number of levels gained per character (0 for the dead).
+    """
+    living = [c for c in characters if c["health"] > 0]
+    totals = [xp_to_reach(c["level"]) + c["experience"] + xp_amount for c in living]
+    new_levels = levels_for_total_xp(totals)
+
+    gained_by_id = {}
+    for character, total, new_level in zip(living, totals, new_levels):
+        old_level = character["level"]
+        gained = new_level - old_level
+        character["experience"] = total - xp_to_reach(new_level)
+        gained_by_id[id(character)] = gained
+        if gained <= 0:
+            continue
+
+        character["level"] = new_level
+        character_stats.modify_base_stat(character, "max_health", 10 * gained)
+        character_stats.modify_base_stat(character, "strength", 2 * gained)
+        character_stats.modify_base_stat(character, "magic", 2 * gained)
+        character["health"] = character["max_health"]
+
+        if game_events.listening("level_up"):
+            for level in range(old_level + 1, new_level + 1):
+                game_events.emit(game_events.LevelEvent("level_up", character, level))
+
+    return [gained_by_id.get(id(c), 0) for c in characters]
+
+
+def add_gold(character, amount, reason="other"):
     """
     Modify gold total. Negative = spending.
+    reason tags the change for the economy ledger ("battle", "quest"...).
     Raises ValueError if gold would go below zero.
     """
     new_total = character["gold"] + amount
     if new_total < 0:
         raise ValueError("Not enough gold.")
     character["gold"] = new_total
+
+    if game_events.listening("gold_changed"):
+        game_events.emit(game_events.GoldEvent("gold_changed", character, amount, reason))
     return new_total
 
 
@@ -246,6 +405,8 @@ def validate_character_data(character):
             raise InvalidSaveDataError(f"Invalid numeric field: {key}")
 
     for key in lists:
+        if key == "inventory" and isinstance(character[key], inventory_system.Inventory):
+            continue
         if not isinstance(character[key], list):
             raise InvalidSaveDataError(f"Invalid list field: {key}")
 
@@ -0,0 +1,159 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Stats Module
+
+Base stats plus modifier stacks (equipment, battle buffs).
+
+A character (or enemy) keeps:
+    character["base_stats"]   {stat: value} from class, levels and elixirs
+    character["modifiers"]    {source: ((stat, value), ...)}
+and the usual top-level "strength", "magic" and "max_health" fields hold the
+effective values. Those are recomputed only when a base stat or a modifier
+changes, so every read (e.g. calculate_damage) stays a plain dict lookup,
+and removing a modifier can never leave a stat drifted.
+"""
+
+MODIFIABLE_STATS = ["max_health", "strength", "magic"]
+
+# Modifier sources written to save files; everything else (buffs) is transient
+PERSISTENT_SOURCES = ["weapon", "armor"]
+
+# ============================================================================
+# BASE STATS
+# ============================================================================
+
+def ensure_base_stats(character):
+    """
+    Set up base stats from the current values the first time they are needed.
+    """
+    if "base_stats" not in character:
+        character["base_stats"] = {
+            stat: character[stat] for stat in MODIFIABLE_STATS if stat in character
+        }
+        character["modifiers"] = {}
+    return character["base_stats"]
+
+
+def modify_base_stat(character, stat, amount):
+    """
+    Permanent change (level up, elixir).
+    """
+    base = ensure_base_stats(character)
+    base[stat] = base.get(stat, 0) + amount
+    recalculate_stats(character, [stat])
+
+# ============================================================================
+# MODIFIERS
+# ============================================================================
+
+def set_modifier(character, source, effects):
+    """
+    Add or replace the modifier from `source` (e.g. "weapon").
+    effects is a tuple of (stat, value) pairs.
+    """
+    ensure_base_stats(character)
+    old = character["modifiers"].get(source, ())
+    character["modifiers"][source] = tuple(effects)
+    recalculate_stats(character, affected_stats(old, effects))
+
+
+def remove_modifier(character, source):
+    """
+    Remove the modifier from `source`. Returns its effects, or None.
+    """
+    ensure_base_stats(character)
+    old = character["modifiers"].pop(source, None)
+    if old is not None:
+        recalculate_stats(character, affected_stats(old, ()))
+    return old
+
+
+def get_modifier(character, source):
+    return character.get("modifiers", {}).get(source)
+
+
+def affected_stats(*effect_lists):
+    stats = []
+    for effects in effect_lists:
+        for stat, _ in effects:
+            if stat not in stats:
+                stats.append(stat)
+    return stats
+
+
+def recalculate_stats(character, stats):
+    """
+    Effective value = base + every modifier, for the given stats only.
+    """
+    base = character["base_stats"]
+    for stat in stats:
+        total = base.get(stat, 0)
+        for effects in character["modifiers"].values():
+            for name, value in effects:
+                if name == stat:
+                    total += value
+        character[stat] = total
+
+    if "max_health" in stats and "health" in character:
+        character["health"] = min(character["health"], character["max_health"])
+
+# ============================================================================
+# SAVE FORMAT
+# ============================================================================
+
+def encode_modifiers(character):
+    """
+    "weapon=strength:5;armor=max_health:10,magic:2" (persistent sources only)
+    """
+    parts = []
+    for source, effects in character.get("modifiers", {}).items():
+        if source in PERSISTENT_SOURCES:
+            text = ",".join(f"{stat}:{value}" for stat, value in effects)
+            parts.append(f"{source}={text}")
+    return ";".join(parts)
+
+
+def saved_stats(character):
+    """
+    Stat values to write to a save file: base plus persistent modifiers,
+    so a buff active at save time is never baked into the saved stats.
+    """
+    if "base_stats" not in character:
+        return {}
+    values = {}
+    for stat in MODIFIABLE_STATS:
+        if stat not in character:
+            continue
+        total = character["base_stats"].get(stat, 0)
+        for source, effects in character["modifiers"].items():
+            if source in PERSISTENT_SOURCES:
+                total += sum(value for name, value in effects if name == stat)
+        values[stat] = total
+    return values
+
+
+def restore_modifiers(character, encoded):
+    """
+    Rebuild modifiers from a save file. Saved stats include the persistent
+    modifiers (see saved_stats), so base stats are recovered by
+    subtracting them.
+    Raises ValueError on malformed data.
+    """
+    modifiers = {}
+    for part in encoded.split(";"):
+        if not part:
+            continue
+        source, text = part.split("=", 1)
+        effects = []
+        for pair in text.split(","):
+            stat, value = pair.split(":")
+            effects.append((stat.strip(), int(value)))
+        modifiers[source.strip()] = tuple(effects)
+
+    base = {stat: character[stat] for stat in MODIFIABLE_STATS if stat in character}
+    for effects in modifiers.values():
+        for stat, value in effects:
+            base[stat] = base.get(stat, 0) - value
+
+    character["base_stats"] = base
+    character["modifiers"] = modifiers
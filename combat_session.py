@@ -0,0 +1,92 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Combat Session Module
+
+Asynchronous version of SimpleBattle.start_battle for the hosted
+multiplayer mode. Each battle is a coroutine that awaits the player's
+action from an async input source instead of blocking on input(), so one
+event loop can run thousands of battles at once without a thread per player.
+
+An input source is any object with an async get_action(battle) method that
+returns a menu choice ("1" attack, "2" special ability, "3" escape).
+"""
+
+import asyncio
+import combat_system
+from battle_log import BattleLog
+
+
+class QueueInput:
+    """
+    Input source fed by another coroutine (e.g. a network connection)
+    through an asyncio.Queue.
+    """
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+
+    def send(self, choice):
+        self.queue.put_nowait(choice)
+
+    async def get_action(self, battle):
+        return await self.queue.get()
+
+
+class ScriptedInput:
+    """
+    Input source that replays a fixed list of choices, then keeps attacking.
+    """
+
+    def __init__(self, choices, default="1"):
+        self.choices = list(choices)
+        self.position = 0
+        self.default = default
+
+    async def get_action(self, battle):
+        if self.position < len(self.choices):
+            self.position += 1
+            return self.choices[self.position - 1]
+        return self.default
+
+
+async def run_battle_session(character, enemy, input_source, log=None, action_timeout=None):
+    """
+    Coroutine running one battle to completion.
+    Player actions come from input_source; a player who takes longer than
+    action_timeout seconds loses the turn.
+    Returns winner + reward dict, like SimpleBattle.start_battle.
+    """
+    if log is None:
+        log = BattleLog(echo=False)
+    battle = combat_system.SimpleBattle(character, enemy, log=log)
+
+    while battle.combat_active:
+        result = battle.begin_turn()
+        if result:
+            return result
+
+        if action_timeout is None:
+            choice = await input_source.get_action(battle)
+        else:
+            try:
+                choice = await asyncio.wait_for(input_source.get_action(battle), action_timeout)
+            except asyncio.TimeoutError:
+                choice = ""
+        battle.perform_player_action(str(choice).strip())
+
+        result = battle.end_turn()
+        if result:
+            return result
+
+    return {"winner": "none", "xp_gained": 0, "gold_gained": 0}
+
+
+async def run_battle_sessions(sessions):
+    """
+    Run many (character, enemy, input_source) battles concurrently.
+    Returns their results in the same order.
+    """
+    return await asyncio.gather(*(
+        run_battle_session(character, enemy, input_source)
+        for character, enemy, input_source in sessions
+    ))
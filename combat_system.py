@@ -9,7 +9,11 @@ Combat structure, ability logic, and flow-control were developed with
 ChatGPT assistance. All logic was reviewed and integrated by the me.
 """
 
+import heapq
 import random
+import game_events
+from status_effects import EffectTracker
+from battle_log import BattleLog, register_event_format
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
@@ -36,6 +40,7 @@ def create_enemy(enemy_type):
             "max_health": 50,
             "strength": 8,
             "magic": 2,
+            "speed": 12,
             "xp_reward": 25,
             "gold_reward": 10
         }
@@ -47,6 +52,7 @@ def create_enemy(enemy_type):
             "max_health": 80,
             "strength": 12,
             "magic": 5,
+            "speed": 9,
             "xp_reward": 50,
             "gold_reward": 25
         }
@@ -58,6 +64,7 @@ def create_enemy(enemy_type):
             "max_health": 200,
             "strength": 25,
             "magic": 15,
+            "speed": 8,
             "xp_reward": 200,
             "gold_reward": 100
         }
@@ -78,6 +85,87 @@ def get_random_enemy_for_level(character_level):
     else:
         return create_enemy("dragon")
 
+# ============================================================================
+# DAMAGE RULES
+# ============================================================================
+
+def calculate_damage(attacker, defender):
+    """
+    strength - (defender_strength / 4)
+    min damage = 1
+    """
+    base = attacker["strength"]
+    reduction = defender["strength"] // 4
+    damage = base - reduction
+    return max(damage, 1)
+
+
+def apply_damage(target, damage):
+    """
+    Reduces HP but not below 0.
+    """
+    target["health"] = max(target["health"] - damage, 0)
+
+
+class DamageTable:
+    """
+    Per-battle cache of basic attack damage for every (attacker, defender)
+    pair and of each combatant's special ability power.
+
+    Stats only change mid-battle through buffs, so entries are filled on
+    first use and dropped by invalidate() when a combatant's stats change.
+    Lookups are by combatant index into flat lists, the cheapest thing
+    Python can do in the inner combat loop.
+    """
+
+    def __init__(self, combatants):
+        self.combatants = combatants
+        self.index_of = {id(combatant): index for index, combatant in enumerate(combatants)}
+        self.basic = [[None] * len(combatants) for _ in combatants]
+        self.ability_power = [None] * len(combatants)
+
+    def damage(self, attacker_index, defender_index):
+        damage = self.basic[attacker_index][defender_index]
+        if damage is None:
+            damage = calculate_damage(self.combatants[attacker_index], self.combatants[defender_index])
+            self.basic[attacker_index][defender_index] = damage
+        return damage
+
+    def damage_between(self, attacker, defender):
+        """
+        Cached damage between two combatants; a pair outside this battle is
+        computed directly (and not cached).
+        """
+        attacker_index = self.index_of.get(id(attacker))
+        defender_index = self.index_of.get(id(defender))
+        if attacker_index is None or defender_index is None:
+            return calculate_damage(attacker, defender)
+        return self.damage(attacker_index, defender_index)
+
+    def power(self, index, ability):
+        """
+        Base amount of the combatant's ability, or None if it has no fixed power.
+        """
+        if ability.power is None:
+            return None
+        power = self.ability_power[index]
+        if power is None:
+            power = ability.power(self.combatants[index])
+            self.ability_power[index] = power
+        return power
+
+    def invalidate(self, combatant):
+        """
+        Forget every entry that depends on this combatant's stats.
+        """
+        index = self.index_of.get(id(combatant))
+        if index is None:
+            return
+        self.basic[index] = [None] * len(self.combatants)
+        for row in self.basic:
+            row[index] = None
+        self.ability_power[index] = None
+
 # ============================================================================
 # COMBAT SYSTEM
 # ============================================================================
@@ -86,9 +174,11 @@ class SimpleBattle:
     """
     Manages turn-based combat between a character dictionary
     and an enemy dictionary.
+    Battle messages go to a BattleLog, kept quiet by default; terminal
+    callers pass log=BattleLog(echo=True) to print them.
     """
 
-    def __init__(self, character, enemy):
+    def __init__(self, character, enemy, log=None):
         if character["health"] <= 0:
             raise CharacterDeadError("Character is already dead before battle!")
 
@@ -96,6 +186,10 @@ class SimpleBattle:
         self.enemy = enemy
         self.combat_active = True
         self.turn_number = 1
+        self.effects = EffectTracker()
+        self.log = log if log is not None else BattleLog(echo=False)
+        self.damage_table = DamageTable([character, enemy])
+        self.effects.on_stat_change = self.damage_table.invalidate
 
     def start_battle(self):
         """
@@ -106,27 +200,55 @@ class SimpleBattle:
             raise CharacterDeadError("Cannot start battle with a dead character.")
 
         while self.combat_active:
+            result = self.begin_turn()
+            if result:
+                return result
+
             display_combat_stats(self.character, self.enemy)
 
             # PLAYER TURN
             self.player_turn()
-            result = self.check_battle_end()
-            if result:
-                return result
 
             # ENEMY TURN
-            self.enemy_turn()
-            result = self.check_battle_end()
+            result = self.end_turn()
             if result:
                 return result
 
-            self.turn_number += 1
-
         # If combat was ended another way
         return {"winner": "none", "xp_gained": 0, "gold_gained": 0}
 
     # ----------------------------------------------------------------------
 
+    def begin_turn(self):
+        """
+        Status effects (damage over time, expiring buffs) for this turn.
+        Returns results dict if they ended the battle.
+        """
+        for tick in self.effects.advance(self.turn_number):
+            self.log.record(self.turn_number, tick["actor"], "dot", tick["target"],
+                            tick["damage"], tick["hp_after"])
+        return self.check_battle_end()
+
+    def end_turn(self):
+        """
+        After the player's action: enemy turn (unless the battle ended or the
+        player escaped), then advance the turn counter.
+        Returns results dict if someone died.
+        """
+        result = self.check_battle_end()
+        if result or not self.combat_active:
+            return result
+
+        self.enemy_turn()
+        result = self.check_battle_end()
+        if result:
+            return result
+
+        self.turn_number += 1
+        return None
+
+    # ----------------------------------------------------------------------
+
     def player_turn(self):
         """
         Player chooses:
@@ -137,37 +259,47 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError("No battle in progress.")
 
-        print("\n--- PLAYER TURN ---")
-        print("1. Basic Attack")
-        print("2. Special Ability")
-        print("3. Attempt Escape")
+        self.perform_player_action(read_player_action())
+
+    def perform_player_action(self, choice):
+        """
+        Resolve a player menu choice ("1", "2" or "3").
+        Anything else wastes the turn.
+        """
+        if not self.combat_active:
+            raise CombatNotActiveError("No battle in progress.")
 
-        choice = input("Choose an action: ").strip()
+        name = self.character["name"]
 
         if choice == "1":
             damage = self.calculate_damage(self.character, self.enemy)
             self.apply_damage(self.enemy, damage)
-            display_battle_log(f"You hit the enemy for {damage} damage!")
+            self.log.record(self.turn_number, name, "attack", self.enemy["name"],
+                            damage, self.enemy["health"])
 
         elif choice == "2":
             try:
-                message = use_special_ability(self.character, self.enemy)
-                display_battle_log(message)
+                ability = get_ability(self.character["class"])
+                power = self.damage_table.power(0, ability)
+                amount = ability.use(self.character, self.enemy, self.effects, power)
+                target = self.character if ability.on_self else self.enemy
+                self.log.record(self.turn_number, name, ability.name, target["name"],
+                                amount, target["health"])
             except AbilityOnCooldownError:
-                display_battle_log("Your ability is on cooldown!")
+                self.log.record(self.turn_number, name, "cooldown")
             except Exception as e:
                 display_battle_log(str(e))
 
         elif choice == "3":
             escaped = self.attempt_escape()
             if escaped:
-                display_battle_log("You successfully escaped!")
+                self.log.record(self.turn_number, name, "escape")
                 self.combat_active = False
             else:
-                display_battle_log("Escape failed!")
+                self.log.record(self.turn_number, name, "escape_failed")
 
         else:
-            print("Invalid choice — you lose your turn.")
+            self.log.record(self.turn_number, name, "invalid")
 
     # ----------------------------------------------------------------------
 
@@ -178,10 +310,16 @@ class SimpleBattle:
         if not self.combat_active:
             raise CombatNotActiveError("No battle in progress.")
 
-        print("\n--- ENEMY TURN ---")
+        if self.log.echo:
+            print("\n--- ENEMY TURN ---")
+        if self.effects.is_stunned(self.enemy):
+            self.log.record(self.turn_number, self.enemy["name"], "stunned")
+            return
+
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
-        display_battle_log(f"{self.enemy['name']} hits you for {damage} damage!")
+        self.log.record(self.turn_number, self.enemy["name"], "attack", self.character["name"],
+                        damage, self.character["health"])
 
     # ----------------------------------------------------------------------
 
@@ -190,10 +328,7 @@ class SimpleBattle:
         strength - (defender_strength / 4)
         min damage = 1
         """
-        base = attacker["strength"]
-        reduction = defender["strength"] // 4
-        damage = base - reduction
-        return max(damage, 1)
+        return self.damage_table.damage_between(attacker, defender)
 
     # ----------------------------------------------------------------------
 
@@ -201,7 +336,7 @@ class SimpleBattle:
         """
         Reduces HP but not below 0.
         """
-        target["health"] = max(target["health"] - damage, 0)
+        apply_damage(target, damage)
 
     # ----------------------------------------------------------------------
 
@@ -210,7 +345,13 @@ class SimpleBattle:
         Returns results dict if someone dies.
         """
         if self.enemy["health"] <= 0:
-            display_battle_log("Enemy defeated!")
+            self.log.record(self.turn_number, self.enemy["name"], "defeated")
+            self.effects.clear()
+            self.combat_active = False
+
+            if game_events.listening("enemy_defeated"):
+                game_events.emit(game_events.CombatEvent(
+                    "enemy_defeated", self.character, self.enemy.get("type", self.enemy["name"].lower())))
 
             return {
                 "winner": "player",
@@ -219,7 +360,9 @@ class SimpleBattle:
             }
 
         if self.character["health"] <= 0:
-            display_battle_log("You have been defeated!")
+            self.log.record(self.turn_number, self.character["name"], "defeated")
+            self.effects.clear()
+            self.combat_active = False
             return {
                 "winner": "enemy",
                 "xp_gained": 0,
@@ -237,65 +380,352 @@ class SimpleBattle:
         success = random.random() < 0.5
         if success:
             self.combat_active = False
+            self.effects.clear()
         return success
 
 
+# ============================================================================
+# PARTY COMBAT
+# ============================================================================
+
+TURN_TICKS = 1000      # Time a speed-1 combatant waits between actions
+DEFAULT_SPEED = 10     # Characters have no speed stat of their own
+
+
+def get_turn_delay(combatant):
+    """
+    Time between two actions of a combatant. Faster → shorter delay.
+    """
+    return TURN_TICKS // max(combatant.get("speed", DEFAULT_SPEED), 1)
+
+
+def roll_initiative():
+    """
+    d20 roll, used to break ties between combatants acting at the same time.
+    """
+    return random.randint(1, 20)
+
+
+class PartyBattle:
+    """
+    Manages combat between a party of character dictionaries and a
+    group of enemy dictionaries.
+
+    The turn order is a priority queue keyed by each combatant's next action
+    time (then initiative), and each side keeps a heap ordered by health so
+    the weakest living target is found without scanning every combatant.
+    Dead combatants are dropped lazily when they reach the top of a heap,
+    which keeps every turn at O(log n).
+    Actions are recorded in a BattleLog, echoed only when a console is attached.
+    """
+
+    def __init__(self, party, enemies, log=None):
+        if not party or not enemies:
+            raise InvalidTargetError("Both sides need at least one combatant.")
+
+        for character in party:
+            if character["health"] <= 0:
+                raise CharacterDeadError(f"{character['name']} is already dead before battle!")
+
+        self.party = list(party)
+        self.enemies = list(enemies)
+        self.combatants = self.party + self.enemies
+        self.sides = ["party"] * len(self.party) + ["enemies"] * len(self.enemies)
+        self.combat_active = True
+        self.clock = 0
+        self.effects = EffectTracker()
+        self.log = log if log is not None else BattleLog()
+        self.damage_table = DamageTable(self.combatants)
+        self.effects.on_stat_change = self.damage_table.invalidate
+
+        self.index_of = {id(combatant): index for index, combatant in enumerate(self.combatants)}
+        self.fallen = set()
+        self.alive = {"party": 0, "enemies": 0}
+        self.turn_queue = []
+        self.target_heaps = {"party": [], "enemies": []}
+
+        for index, combatant in enumerate(self.combatants):
+            if combatant["health"] <= 0:
+                self.fallen.add(index)
+                continue
+            self.alive[self.sides[index]] += 1
+            heapq.heappush(self.turn_queue, (get_turn_delay(combatant), -roll_initiative(), index))
+            heapq.heappush(self.target_heaps[self.sides[index]], (combatant["health"], index))
+
+    def start_battle(self):
+        """
+        Runs turns until one side is wiped out.
+        Returns winner + reward dict.
+        """
+        while self.combat_active:
+            self.take_turn()
+            result = self.check_battle_end()
+            if result:
+                return result
+
+        return {"winner": "none", "xp_gained": 0, "gold_gained": 0}
+
+    # ----------------------------------------------------------------------
+
+    @property
+    def turn_number(self):
+        return self.clock // TURN_TICKS + 1
+
+    def take_turn(self):
+        """
+        Next combatant in the turn queue acts against the weakest living
+        opponent: party members use their special ability whenever it is
+        off cooldown, everyone else makes a basic attack.
+        Returns a dict describing the action.
+        """
+        if not self.combat_active:
+            raise CombatNotActiveError("No battle in progress.")
+
+        index = self.next_actor()
+        actor = self.combatants[index]
+        self.advance_effects()
+
+        opposing = self.opposing_side(index)
+        if actor["health"] <= 0 or self.alive[opposing] <= 0:
+            return {"actor": actor["name"], "action": "none", "target": None,
+                    "damage": 0, "hp_after": actor["health"]}
+
+        if self.effects.is_stunned(actor):
+            self.log.record(self.turn_number, actor["name"], "stunned")
+            return {"actor": actor["name"], "action": "stunned", "target": None,
+                    "damage": 0, "hp_after": actor["health"]}
+
+        target_index = self.select_target(opposing)
+        target = self.combatants[target_index]
+        ability = ABILITY_REGISTRY.get(actor.get("class"))
+
+        if ability is not None and self.effects.cooldown_remaining(actor, ability.name) == 0:
+            action = ability.name
+            damage = ability.use(actor, target, self.effects, self.damage_table.power(index, ability))
+            self.update_target(index)
+            if ability.on_self:
+                target = actor
+        else:
+            action = "attack"
+            damage = self.damage_table.damage(index, target_index)
+            apply_damage(target, damage)
+
+        self.update_target(target_index)
+        self.log.record(self.turn_number, actor["name"], action, target["name"],
+                        damage, target["health"])
+
+        return {
+            "actor": actor["name"],
+            "action": action,
+            "target": target["name"],
+            "damage": damage,
+            "hp_after": target["health"]
+        }
+
+    def advance_effects(self):
+        """
+        Fire status effects due by the current turn and re-index anyone
+        they damaged.
+        """
+        ticks = self.effects.advance(self.turn_number)
+        for tick in ticks:
+            self.update_target(self.index_of[id(tick["combatant"])])
+            self.log.record(self.turn_number, tick["actor"], "dot", tick["target"],
+                            tick["damage"], tick["hp_after"])
+        return ticks
+
+    # ----------------------------------------------------------------------
+
+    def next_actor(self):
+        """
+        Pop the next living combatant and reschedule their following turn.
+        """
+        while self.turn_queue:
+            time, initiative, index = heapq.heappop(self.turn_queue)
+            actor = self.combatants[index]
+            if actor["health"] <= 0:
+                continue
+
+            self.clock = time
+            heapq.heappush(self.turn_queue, (time + get_turn_delay(actor), initiative, index))
+            return index
+
+        raise CombatNotActiveError("No combatants left to act.")
+
+    def opposing_side(self, index):
+        if self.sides[index] == "party":
+            return "enemies"
+        return "party"
+
+    def select_target(self, side):
+        """
+        Weakest living combatant on the given side.
+        Raises InvalidTargetError if nobody is left.
+        """
+        heap = self.target_heaps[side]
+        while heap:
+            health, index = heap[0]
+            current = self.combatants[index]["health"]
+            if current > 0 and current == health:
+                return index
+            heapq.heappop(heap)  # stale entry: target died or was hit since
+
+        raise InvalidTargetError(f"No living targets on side: {side}")
+
+    def update_target(self, index):
+        """
+        Re-index a combatant after their health changed.
+        """
+        combatant = self.combatants[index]
+        side = self.sides[index]
+
+        if combatant["health"] <= 0:
+            if index not in self.fallen:
+                self.fallen.add(index)
+                self.alive[side] -= 1
+                if side == "enemies":
+                    self.notify_defeated(combatant)
+        else:
+            heapq.heappush(self.target_heaps[side], (combatant["health"], index))
+
+    def notify_defeated(self, enemy):
+        """
+        Every party member gets credit for the kill (quest objectives).
+        """
+        if game_events.listening("enemy_defeated"):
+            enemy_type = enemy.get("type", enemy["name"].lower())
+            for character in self.party:
+                game_events.emit(game_events.CombatEvent("enemy_defeated", character, enemy_type))
+
+    # ----------------------------------------------------------------------
+
+    def check_battle_end(self):
+        """
+        Returns results dict once a side has no living combatants.
+        """
+        if self.alive["enemies"] <= 0:
+            self.combat_active = False
+            self.effects.clear()
+            return {
+                "winner": "player",
+                "xp_gained": sum(enemy.get("xp_reward", 0) for enemy in self.enemies),
+                "gold_gained": sum(enemy.get("gold_reward", 0) for enemy in self.enemies)
+            }
+
+        if self.alive["party"] <= 0:
+            self.combat_active = False
+            self.effects.clear()
+            return {
+                "winner": "enemy",
+                "xp_gained": 0,
+                "gold_gained": 0
+            }
+
+        return None
+
+
 # ============================================================================
 # SPECIAL ABILITIES
 # ============================================================================
 
-def use_special_ability(character, enemy):
+class Ability:
     """
-    Routes to correct special ability.
+    A class special ability: the function that performs it, the battle
+    message, its cooldown and an optional status effect applied afterwards.
     """
-    char_class = character["class"]
 
-    if char_class == "Warrior":
-        dmg = warrior_power_strike(character, enemy)
-        return f"Power Strike hits for {dmg} damage!"
+    def __init__(self, name, action, message, cooldown=0, after_use=None, on_self=False,
+                 power=None):
+        self.name = name
+        self.action = action            # action(character, enemy[, power]) -> amount
+        self.power = power              # power(character) -> base amount, if fixed by stats
+        self.message = message          # formatted with the BattleEvent fields
+        self.cooldown = cooldown
+        self.after_use = after_use      # after_use(character, enemy, effects)
+        self.on_self = on_self          # True if the amount applies to the user
+
+    def use(self, character, enemy, effects=None, power=None):
+        """
+        Perform the ability and return its amount (damage or healing).
+        power is a precomputed base amount (see DamageTable).
+        With an EffectTracker, enforces its cooldown.
+        Raises AbilityOnCooldownError if not ready.
+        """
+        if effects is not None:
+            effects.check_cooldown(character, self.name)
 
-    elif char_class == "Mage":
-        dmg = mage_fireball(character, enemy)
-        return f"Fireball deals {dmg} magic damage!"
+        if power is None:
+            amount = self.action(character, enemy)
+        else:
+            amount = self.action(character, enemy, power)
 
-    elif char_class == "Rogue":
-        dmg = rogue_critical_strike(character, enemy)
-        return f"Critical Strike hits for {dmg} damage!"
+        if effects is not None:
+            effects.start_cooldown(character, self.name, self.cooldown)
+            if self.after_use is not None:
+                self.after_use(character, enemy, effects)
 
-    elif char_class == "Cleric":
-        healed = cleric_heal(character)
-        return f"Cleric heals for {healed} health!"
+        return amount
 
-    else:
+
+ABILITY_REGISTRY = {}
+
+
+def register_ability(char_class, ability):
+    ABILITY_REGISTRY[char_class] = ability
+    register_event_format(ability.name, ability.message)
+
+
+def get_ability(char_class):
+    """
+    Raises InvalidTargetError for classes without a special ability.
+    """
+    if char_class not in ABILITY_REGISTRY:
         raise InvalidTargetError("Unknown class for ability")
+    return ABILITY_REGISTRY[char_class]
+
+
+def use_special_ability(character, enemy, effects=None):
+    """
+    Routes to correct special ability.
+    Raises AbilityOnCooldownError if an EffectTracker is given and the
+    ability is still cooling down.
+    """
+    ability = get_ability(character["class"])
+    amount = ability.use(character, enemy, effects)
+    return ability.message.format(damage=amount)
 
 # ----------------------------------------------------------------------
 
-def warrior_power_strike(character, enemy):
+def warrior_power_strike(character, enemy, damage=None):
     """
     Deals 2× Strength.
     """
-    damage = character["strength"] * 2
+    if damage is None:
+        damage = warrior_power(character)
     enemy["health"] = max(enemy["health"] - damage, 0)
     return damage
 
-def mage_fireball(character, enemy):
+def mage_fireball(character, enemy, damage=None):
     """
     Deals 2× Magic.
     """
-    damage = character["magic"] * 2
+    if damage is None:
+        damage = mage_power(character)
     enemy["health"] = max(enemy["health"] - damage, 0)
     return damage
 
-def rogue_critical_strike(character, enemy):
+def rogue_critical_strike(character, enemy, base=None):
     """
     50% chance triple damage.
     Otherwise normal strength damage.
     """
+    if base is None:
+        base = rogue_power(character)
+
     if random.random() < 0.5:
-        damage = character["strength"] * 3
+        damage = base * 3
     else:
-        damage = character["strength"]
+        damage = base
 
     enemy["health"] = max(enemy["health"] - damage, 0)
     return damage
@@ -308,6 +738,42 @@ def cleric_heal(character):
     character["health"] = min(character["max_health"], character["health"] + 30)
     return character["health"] - before
 
+# ----------------------------------------------------------------------
+
+def warrior_power(character):
+    return character["strength"] * 2
+
+def mage_power(character):
+    return character["magic"] * 2
+
+def rogue_power(character):
+    return character["strength"]
+
+def stun_target(character, enemy, effects):
+    effects.add_stun(enemy, 1)
+
+def burn_target(character, enemy, effects):
+    effects.add_damage_over_time(enemy, "Burn", max(character["magic"] // 4, 1), 3)
+
+def bless_caster(character, enemy, effects):
+    effects.add_buff(character, "Blessing", "strength", 3, 3)
+
+
+register_ability("Warrior", Ability(
+    "Power Strike", warrior_power_strike,
+    "Power Strike hits for {damage} damage!", cooldown=2, after_use=stun_target,
+    power=warrior_power))
+register_ability("Mage", Ability(
+    "Fireball", mage_fireball,
+    "Fireball deals {damage} magic damage!", cooldown=3, after_use=burn_target,
+    power=mage_power))
+register_ability("Rogue", Ability(
+    "Critical Strike", rogue_critical_strike,
+    "Critical Strike hits for {damage} damage!", cooldown=2, power=rogue_power))
+register_ability("Cleric", Ability(
+    "Heal", lambda character, enemy: cleric_heal(character),
+    "Cleric heals for {damage} health!", cooldown=3, after_use=bless_caster, on_self=True))
+
 
 # ============================================================================
 # UTILITIES
@@ -336,6 +802,16 @@ def display_combat_stats(character, enemy):
     print(f"{character['name']} HP: {character['health']} / {character['max_health']}")
     print(f"{enemy['name']} HP: {enemy['health']} / {enemy['max_health']}")
 
+def read_player_action(read=input):
+    """
+    Ask the player for a battle action (read defaults to the console).
+    """
+    print("\n--- PLAYER TURN ---")
+    print("1. Basic Attack")
+    print("2. Special Ability")
+    print("3. Attempt Escape")
+    return read("Choose an action: ").strip()
+
 def display_battle_log(message):
     print(f">>> {message}")
 
@@ -350,7 +826,7 @@ if __name__ == "__main__":
             "max_health": 120, "strength": 15, "magic": 5}
 
     goblin = create_enemy("goblin")
-    battle = SimpleBattle(hero, goblin)
+    battle = SimpleBattle(hero, goblin, log=BattleLog(echo=True))
     result = battle.start_battle()
     print(result)
 # ============================================================================
@@ -0,0 +1,171 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Economy Ledger Module
+
+Append-only record of where gold comes from and where it goes.
+
+The ledger listens to gold events (add_gold, shop purchases and sales)
+and keeps per-reason counters in memory: gold created, gold destroyed and
+number of transactions. Every `flush_every` transactions (or
+`flush_interval` seconds) the counters gathered since the last flush are
+appended to the ledger file as one compact line:
+
+    <unix time> battle=250/0/12 shop_buy=0/475/9 revive=0/20/1
+
+so watching inflation means summing a few lines per interval instead of
+reading every save file.
+"""
+
+import os
+import time
+import game_events
+from custom_exceptions import CorruptedDataError
+
+LEDGER_FILE = "data/economy_ledger.txt"
+
+# Reasons for gold moved by item events
+ITEM_EVENT_REASONS = {"item_purchased": "shop_buy", "item_sold": "shop_sell"}
+
+
+class EconomyLedger:
+    """
+    Per-reason gold counters with periodic compact flushes to disk.
+    totals[reason] = [gold_in, gold_out, transactions] since the ledger
+    was created; pending holds the same for entries not yet flushed.
+    """
+
+    def __init__(self, filename=LEDGER_FILE, flush_every=1000, flush_interval=60.0):
+        self.filename = filename
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.totals = {}
+        self.pending = {}
+        self.pending_count = 0
+        self.last_flush = time.monotonic()
+        self.attached = False
+
+    # ------------------------------------------------------------------
+    # Event hooks
+    # ------------------------------------------------------------------
+
+    def attach(self):
+        """
+        Start recording gold events.
+        """
+        if not self.attached:
+            game_events.subscribe("gold_changed", self.on_gold_event)
+            for kind in ITEM_EVENT_REASONS:
+                game_events.subscribe(kind, self.on_item_event)
+            self.attached = True
+
+    def detach(self):
+        if self.attached:
+            game_events.unsubscribe("gold_changed", self.on_gold_event)
+            for kind in ITEM_EVENT_REASONS:
+                game_events.unsubscribe(kind, self.on_item_event)
+            self.attached = False
+
+    def on_gold_event(self, event):
+        self.record(event.reason, event.amount)
+
+    def on_item_event(self, event):
+        self.record(ITEM_EVENT_REASONS[event.kind], event.gold)
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def record(self, reason, amount):
+        """
+        Count one gold change (positive = source, negative = sink).
+        """
+        for counters in (self.totals, self.pending):
+            entry = counters.get(reason)
+            if entry is None:
+                entry = counters[reason] = [0, 0, 0]
+            if amount >= 0:
+                entry[0] += amount
+            else:
+                entry[1] -= amount
+            entry[2] += 1
+
+        self.pending_count += 1
+        if (self.pending_count >= self.flush_every
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+
+    def net_change(self):
+        """
+        Gold created minus gold destroyed since the ledger started.
+        """
+        return sum(gold_in - gold_out for gold_in, gold_out, _ in self.totals.values())
+
+    def flush(self):
+        """
+        Append the pending counters as one line. Returns True if anything was written.
+        """
+        self.last_flush = time.monotonic()
+        if not self.pending:
+            return False
+
+        directory = os.path.dirname(self.filename)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with open(self.filename, "a") as f:
+            f.write(format_ledger_line(int(time.time()), self.pending) + "\n")
+
+        self.pending = {}
+        self.pending_count = 0
+        return True
+
+# ============================================================================
+# LEDGER FILE FORMAT
+# ============================================================================
+
+def format_ledger_line(timestamp, counters):
+    parts = [str(timestamp)]
+    for reason, (gold_in, gold_out, count) in counters.items():
+        parts.append(f"{reason}={gold_in}/{gold_out}/{count}")
+    return " ".join(parts)
+
+
+def parse_ledger_line(line):
+    """
+    Returns (timestamp, {reason: [gold_in, gold_out, count]}).
+    Raises CorruptedDataError on malformed lines.
+    """
+    try:
+        fields = line.split()
+        counters = {}
+        for part in fields[1:]:
+            reason, values = part.split("=")
+            counters[reason] = [int(v) for v in values.split("/")]
+            if len(counters[reason]) != 3:
+                raise ValueError(part)
+        return int(fields[0]), counters
+    except (ValueError, IndexError):
+        raise CorruptedDataError("Invalid ledger line: " + line.strip())
+
+
+def load_ledger_totals(filename=LEDGER_FILE, since=0):
+    """
+    Sum every flushed interval at or after `since` (unix time).
+    Returns {reason: [gold_in, gold_out, count]}.
+    """
+    totals = {}
+    if not os.path.isfile(filename):
+        return totals
+
+    with open(filename, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            timestamp, counters = parse_ledger_line(line)
+            if timestamp < since:
+                continue
+            for reason, values in counters.items():
+                entry = totals.setdefault(reason, [0, 0, 0])
+                for i in range(3):
+                    entry[i] += values[i]
+    return totals
@@ -33,6 +33,9 @@ def load_quests(filename="data/quests.txt"):
     REWARD_GOLD: #
     REQUIRED_LEVEL: #
     PREREQUISITE: some_quest_id or NONE
+    OBJECTIVE: kind:...         (optional, repeatable, see parse_objective_string)
+    REPEAT: daily|weekly        (optional, can be done again after each reset)
+    TIME_LIMIT: #               (optional, minutes to finish once accepted)
 
     Blank line separates entries.
     Returns dict {quest_id: quest_data}
@@ -78,9 +81,13 @@ def load_items(filename="data/items.txt"):
     ITEM_ID: id_here
     NAME: Display Name
     TYPE: weapon|armor|consumable
-    EFFECT: stat:value
+    EFFECT: stat:value[,stat:value...]
     COST: #
     DESCRIPTION: text...
+    STACK_SIZE: #          (optional, defaults to 1)
+
+    The effect string is parsed once here into item_data["effects"],
+    a tuple of (stat, value) pairs.
 
     Returns dict {item_id: item_data}
     """
@@ -99,6 +106,7 @@ def load_items(filename="data/items.txt"):
     def process_block(block_lines):
         item = parse_item_block(block_lines)
         validate_item_data(item)
+        item["effects"] = parse_effect_string(item["effect"])
         items[item["item_id"]] = item
 
     for line in lines + [""]:
@@ -111,6 +119,52 @@ def load_items(filename="data/items.txt"):
 
     return items
 
+# ============================================================================
+# LOAD LOOT TABLES
+# ============================================================================
+
+def load_loot_tables(filename="data/loot_tables.txt"):
+    """
+    Loads per-enemy drop tables.
+
+    Expected block format:
+
+    ENEMY: enemy_type
+    ROLLS: #                    (optional, draws per kill, defaults to 1)
+    DROP: item_id:weight[:quantity]
+    DROP: NONE:weight           (chance of no drop)
+    ...
+
+    Returns dict {enemy_type: {"enemy", "rolls", "drops"}} where drops is a
+    list of (item_id or None, weight, quantity).
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Loot table file not found: {filename}")
+
+    try:
+        with open(filename, "r") as f:
+            lines = f.read().strip().split("\n")
+    except Exception:
+        raise CorruptedDataError("Unable to read loot table file.")
+
+    tables = {}
+    block = []
+
+    def process_block(block_lines):
+        table = parse_loot_block(block_lines)
+        validate_loot_table(table)
+        tables[table["enemy"]] = table
+
+    for line in lines + [""]:
+        if line.strip() == "":
+            if block:
+                process_block(block)
+                block = []
+        else:
+            block.append(line)
+
+    return tables
+
 # ============================================================================
 # VALIDATION FUNCTIONS
 # ============================================================================
@@ -132,6 +186,10 @@ def validate_quest_data(q):
         raise InvalidDataFormatError("reward_gold must be an integer")
     if not isinstance(q["required_level"], int):
         raise InvalidDataFormatError("required_level must be an integer")
+    if q.get("repeat", "daily") not in QUEST_REPEATS:
+        raise InvalidDataFormatError("repeat must be one of: " + ", ".join(QUEST_REPEATS))
+    if "time_limit" in q and q["time_limit"] < 1:
+        raise InvalidDataFormatError("time_limit must be a positive number of minutes")
 
     return True
 
@@ -153,9 +211,28 @@ def validate_item_data(i):
     except:
         raise InvalidDataFormatError("Item cost must be integer")
 
-    # EFFECT FORMAT stat:value
-    if ":" not in i["effect"]:
-        raise InvalidDataFormatError("Invalid item effect format")
+    if "stack_size" in i and (not isinstance(i["stack_size"], int) or i["stack_size"] < 1):
+        raise InvalidDataFormatError("Item stack size must be a positive integer")
+
+    # EFFECT FORMAT stat:value[,stat:value...]
+    parse_effect_string(i["effect"])
+
+    return True
+
+
+def validate_loot_table(t):
+    for key in ["enemy", "drops"]:
+        if key not in t:
+            raise InvalidDataFormatError(f"Missing loot table field: {key}")
+
+    if not t["drops"]:
+        raise InvalidDataFormatError("Loot table has no drops: " + t["enemy"])
+    if t["rolls"] < 1:
+        raise InvalidDataFormatError("Loot table rolls must be at least 1")
+
+    for item_id, weight, quantity in t["drops"]:
+        if weight <= 0 or quantity < 1:
+            raise InvalidDataFormatError(f"Invalid drop for {t['enemy']}: {item_id}")
 
     return True
 
@@ -190,6 +267,7 @@ REWARD_XP: 75
 REWARD_GOLD: 40
 REQUIRED_LEVEL: 1
 PREREQUISITE: first_quest
+OBJECTIVE: kill:goblin:1
 
 """)
 
@@ -217,6 +295,27 @@ EFFECT: max_health:10
 COST: 40
 DESCRIPTION: Light armor offering modest protection.
 
+""")
+
+    # Default loot tables
+    if not os.path.exists("data/loot_tables.txt"):
+        with open("data/loot_tables.txt", "w") as f:
+            f.write("""ENEMY: goblin
+DROP: NONE:60
+DROP: health_potion:35
+DROP: iron_sword:5
+
+ENEMY: orc
+DROP: NONE:50
+DROP: health_potion:40:2
+DROP: leather_armor:10
+
+ENEMY: dragon
+ROLLS: 2
+DROP: NONE:30
+DROP: health_potion:50:3
+DROP: iron_sword:20
+
 """)
 
 # ============================================================================
@@ -253,6 +352,12 @@ def parse_quest_block(lines):
                 quest["required_level"] = int(value)
             elif key == "prerequisite":
                 quest["prerequisite"] = value
+            elif key == "objective":
+                quest.setdefault("objectives", []).append(parse_objective_string(value))
+            elif key == "repeat":
+                quest["repeat"] = value.lower()
+            elif key == "time_limit":
+                quest["time_limit"] = int(value)
             else:
                 raise InvalidDataFormatError("Unknown quest key: " + key)
 
@@ -289,6 +394,8 @@ def parse_item_block(lines):
                 item["cost"] = int(value)
             elif key == "description":
                 item["description"] = value
+            elif key == "stack_size":
+                item["stack_size"] = int(value)
             else:
                 raise InvalidDataFormatError("Unknown item key: " + key)
 
@@ -296,6 +403,97 @@ def parse_item_block(lines):
     except Exception as e:
         raise InvalidDataFormatError(f"Item parsing failed: {e}")
 
+
+def parse_loot_block(lines):
+    """
+    Parse loot table block into dictionary.
+    Raises InvalidDataFormatError on formatting issues.
+    """
+    table = {"rolls": 1, "drops": []}
+
+    try:
+        for line in lines:
+            if ":" not in line:
+                raise InvalidDataFormatError("Invalid loot line: " + line)
+
+            key, value = line.split(":", 1)
+            key = key.strip().lower()
+            value = value.strip()
+
+            if key == "enemy":
+                table["enemy"] = value.lower()
+            elif key == "rolls":
+                table["rolls"] = int(value)
+            elif key == "drop":
+                parts = [part.strip() for part in value.split(":")]
+                if len(parts) not in (2, 3):
+                    raise InvalidDataFormatError("Invalid drop: " + value)
+                item_id = None if parts[0].upper() == "NONE" else parts[0]
+                quantity = int(parts[2]) if len(parts) == 3 else 1
+                table["drops"].append((item_id, int(parts[1]), quantity))
+            else:
+                raise InvalidDataFormatError("Unknown loot key: " + key)
+
+        return table
+    except Exception as e:
+        raise InvalidDataFormatError(f"Loot table parsing failed: {e}")
+
+
+QUEST_REPEATS = ("daily", "weekly")
+
+# Objective kinds → whether they name targets
+OBJECTIVE_KINDS = {"kill": True, "buy": True, "level": False, "collect": False}
+
+
+def parse_objective_string(objective_string):
+    """
+    Convert a quest objective into (kind, targets, count):
+        "kill:goblin:3"          defeat 3 goblins ("any" for any enemy)
+        "buy:weapon|armor:1"     buy 1 item of any listed item id or type
+        "level:10"               reach level 10
+        "collect:5"              hold 5 different items
+    targets is a tuple of names, empty for level/collect.
+    Raises InvalidDataFormatError on formatting issues.
+    """
+    parts = [part.strip() for part in objective_string.split(":")]
+    kind = parts[0].lower()
+
+    if kind not in OBJECTIVE_KINDS:
+        raise InvalidDataFormatError("Unknown objective: " + objective_string)
+
+    try:
+        if OBJECTIVE_KINDS[kind]:
+            _, targets, count = parts
+            targets = tuple(t.strip() for t in targets.split("|") if t.strip())
+        else:
+            _, count = parts
+            targets = ()
+        count = int(count)
+    except ValueError:
+        raise InvalidDataFormatError("Invalid objective format: " + objective_string)
+
+    if count < 1 or (OBJECTIVE_KINDS[kind] and not targets):
+        raise InvalidDataFormatError("Invalid objective format: " + objective_string)
+    return (kind, targets, count)
+
+
+def parse_effect_string(effect_string):
+    """
+    Convert "stat:value[,stat:value...]" → (("stat", value), ...)
+    Raises InvalidDataFormatError on formatting issues.
+    """
+    effects = []
+    try:
+        for part in effect_string.split(","):
+            stat, value = part.split(":")
+            effects.append((stat.strip(), int(value.strip())))
+    except Exception:
+        raise InvalidDataFormatError("Invalid item effect format: " + effect_string)
+
+    if not all(stat for stat, _ in effects):
+        raise InvalidDataFormatError("Invalid item effect format: " + effect_string)
+    return tuple(effects)
+
 # ============================================================================
 # SELF-TEST
 # ============================================================================
@@ -0,0 +1,87 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Events Module
+
+A small publish/subscribe bus for state changes. Game modules emit typed
+events (namedtuples) after they change a character; subscribers such as
+incremental savers, metrics or anti-cheat checks get the delta instead of
+diffing whole characters.
+
+Publishers check listening(kind) before building an event, so with no
+subscribers an emit point costs one dict lookup.
+
+Event kinds:
+    item_added, item_removed, item_used,
+    item_purchased, item_sold           ItemEvent
+    item_equipped, item_unequipped      EquipEvent
+    inventory_arranged                  LayoutEvent
+    gold_changed                        GoldEvent
+    enemy_defeated                      CombatEvent
+    level_up                            LevelEvent
+    quest_accepted, quest_completed,
+    quest_abandoned, quest_failed,
+    quest_reset                         QuestEvent
+"""
+
+from collections import namedtuple
+
+# quantity: signed change to the item's count in the inventory
+# gold: signed change to the character's gold
+ItemEvent = namedtuple("ItemEvent", "kind character item_id quantity gold")
+
+# Equipping also moves item_id out of the inventory and `previous` back in;
+# unequipping moves item_id back in.
+EquipEvent = namedtuple("EquipEvent", "kind character slot item_id previous")
+
+# positions: the new Inventory.layout_positions() after a sort/compact
+LayoutEvent = namedtuple("LayoutEvent", "kind character positions")
+
+# amount: signed change; reason: short tag such as "battle" or "quest"
+GoldEvent = namedtuple("GoldEvent", "kind character amount reason")
+
+CombatEvent = namedtuple("CombatEvent", "kind character enemy_type")
+
+LevelEvent = namedtuple("LevelEvent", "kind character level")
+
+# rewards: {"xp", "gold"} for quest_completed, None otherwise
+QuestEvent = namedtuple("QuestEvent", "kind character quest_id rewards")
+
+# kind -> tuple of callbacks (replaced, never mutated, so emit can iterate
+# safely while a callback subscribes or unsubscribes)
+SUBSCRIBERS = {}
+
+
+def subscribe(kind, callback):
+    """
+    Call callback(event) for every event of this kind.
+    """
+    SUBSCRIBERS[kind] = SUBSCRIBERS.get(kind, ()) + (callback,)
+
+
+def unsubscribe(kind, callback):
+    """
+    Stop calling callback for this kind. Returns False if it was not subscribed.
+    """
+    callbacks = SUBSCRIBERS.get(kind, ())
+    if callback not in callbacks:
+        return False
+
+    remaining = tuple(c for c in callbacks if c != callback)
+    if remaining:
+        SUBSCRIBERS[kind] = remaining
+    else:
+        del SUBSCRIBERS[kind]
+    return True
+
+
+def listening(kind):
+    return kind in SUBSCRIBERS
+
+
+def emit(event):
+    for callback in SUBSCRIBERS.get(event.kind, ()):
+        callback(event)
+
+
+def clear_subscribers():
+    SUBSCRIBERS.clear()
@@ -0,0 +1,61 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Input Module
+
+Where the terminal front end gets its input. main.py reads every answer
+through an input provider (any object with read(prompt) -> str that
+raises EOFError when the input ends), so the same menus run against the
+keyboard, a script or a fuzzer.
+
+Menus re-prompt in a loop with a bounded number of retries instead of
+calling themselves again, so a stuck or hostile input stream costs
+constant stack and memory however long it runs.
+"""
+
+MAX_RETRIES = 5
+
+
+class ConsoleInput:
+    """
+    Reads from the keyboard (or whatever stdin is).
+    """
+
+    def read(self, prompt):
+        return input(prompt)
+
+
+class ScriptedInput:
+    """
+    Reads lines from any iterable, e.g. a list, a file or a generator.
+    Lines are pulled one at a time, so an endless generator is fine.
+    With echo=True each prompt and answer is printed like a console session.
+    """
+
+    def __init__(self, lines, echo=False):
+        self.lines = iter(lines)
+        self.echo = echo
+        self.lines_read = 0
+
+    def read(self, prompt):
+        try:
+            line = next(self.lines)
+        except StopIteration:
+            raise EOFError("Scripted input exhausted")
+        self.lines_read += 1
+        if self.echo:
+            print(prompt + line)
+        return line.rstrip("\n")
+
+
+def read_choice(provider, prompt, choices, retries=MAX_RETRIES):
+    """
+    Ask until the answer is one of `choices`, at most `retries` times.
+    Returns the choice, or None once the retries are used up.
+    Raises EOFError when the input ends.
+    """
+    for _ in range(retries):
+        choice = provider.read(prompt).strip()
+        if choice in choices:
+            return choice
+        print("Invalid choice. Try again.")
+    return None
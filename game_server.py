@@ -0,0 +1,251 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Server Module
+
+Hosts many players in one process over a line-based TCP protocol.
+
+Every connection gets its own GameSession (and so its own character);
+all sessions share one GameWorld, so the quest, item and loot catalogs are
+loaded once and only read afterwards. The client sends one command per
+line (the same commands GameSession.execute accepts) and each reply is
+the session's output followed by a line holding only END_OF_REPLY.
+
+Each session is saved on its own schedule: the first command that changes
+it starts an autosave timer, the file is written `autosave_interval`
+seconds later, and it is written again when the player disconnects or
+switches to another character. Every save, including those made by the
+`new` and `save` commands, is formatted on the event loop and written from
+a worker thread, so a slow disk never stalls the other players.
+
+    python game_server.py [port]
+"""
+
+import asyncio
+import os
+import sys
+import time
+import character_manager
+import game_session
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7163
+END_OF_REPLY = "."
+TIMER_INTERVAL = 1.0
+
+# Commands that never change the character
+READ_ONLY_COMMANDS = {"stats", "inventory", "quests", "plan", "shop", "saves"}
+
+
+def write_save_file(save_directory, name, text):
+    if not os.path.exists(save_directory):
+        os.makedirs(save_directory, exist_ok=True)
+    with open(os.path.join(save_directory, f"{name}_save.txt"), "w") as f:
+        f.write(text)
+
+
+def valid_character_name(name):
+    """
+    Names come from the network and become file names, so only plain
+    identifiers are allowed: no path separators, no "..", nothing empty.
+    """
+    if not name or ".." in name or any(sep in name for sep in (os.sep, "/", "\\")):
+        return False
+    return name.isidentifier()
+
+
+class PlayerConnection:
+    """
+    One connected client: its session, stream writer, autosave timer and
+    the saves still being written.
+    """
+
+    def __init__(self, server, writer):
+        self.server = server
+        self.writer = writer
+        self.session = game_session.GameSession(server.world, server.save_directory,
+                                                saver=self.start_save)
+        self.save_handle = None
+        self.saving = set()
+
+    def send(self, lines):
+        text = "".join(line + "\n" for line in lines) + END_OF_REPLY + "\n"
+        self.writer.write(text.encode())
+
+    def schedule_save(self):
+        if self.save_handle is None and self.session.character is not None:
+            self.save_handle = asyncio.get_running_loop().call_later(
+                self.server.autosave_interval, self.start_save, self.session.character)
+
+    def start_save(self, character):
+        """
+        Save `character` in the background now, replacing any pending autosave.
+        """
+        if self.save_handle is not None:
+            self.save_handle.cancel()
+            self.save_handle = None
+        task = asyncio.ensure_future(self.save(character))
+        self.saving.add(task)
+        task.add_done_callback(self.saving.discard)
+        return task
+
+    def flush_save(self):
+        """
+        Write the pending autosave now, e.g. before the character changes.
+        """
+        if self.save_handle is not None:
+            self.start_save(self.session.character)
+
+    async def save(self, character):
+        """
+        Format the save on the loop, write it from a worker thread.
+        """
+        text = character_manager.format_save_data(character)
+        await asyncio.get_running_loop().run_in_executor(
+            None, write_save_file, self.server.save_directory, character["name"], text)
+        self.server.saves_written += 1
+
+    async def close(self):
+        self.flush_save()
+        if self.saving:
+            await asyncio.gather(*self.saving, return_exceptions=True)
+        self.server.release(self)
+        self.session.quit()
+
+
+class GameServer:
+    """
+    asyncio TCP server hosting one GameSession per connection.
+    """
+
+    def __init__(self, world, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 save_directory="data/save_games", autosave_interval=60.0):
+        self.world = world
+        self.host = host
+        self.port = port
+        self.save_directory = save_directory
+        self.autosave_interval = autosave_interval
+        self.connections = set()
+        self.players = {}       # character name → PlayerConnection
+        self.saves_written = 0
+        self.server = None
+        self.timer_task = None
+
+    async def start(self):
+        """
+        Start listening; with port=0 the OS picks a free port (see self.port).
+        Catalogs are parsed up front so bad data files fail here, not on a player.
+        """
+        self.world.load()
+        self.world.attach()
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.timer_task = asyncio.ensure_future(self.run_timers())
+        return self
+
+    async def stop(self):
+        """
+        Stop accepting players, save everyone still connected.
+        """
+        if self.timer_task is not None:
+            self.timer_task.cancel()
+            self.timer_task = None
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for connection in list(self.connections):
+            await connection.close()
+            connection.writer.close()
+        self.world.detach()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def run_timers(self):
+        """
+        Fire quest timers for idle players too, pushing the news to them.
+        """
+        while True:
+            await asyncio.sleep(TIMER_INTERVAL)
+            self.world.check_timers(time.time())
+            for connection in self.connections:
+                if connection.session.output:
+                    connection.send(connection.session.take_output())
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    async def handle_client(self, reader, writer):
+        connection = PlayerConnection(self, writer)
+        self.connections.add(connection)
+        try:
+            connection.send(["Welcome to Quest Chronicles. Type 'new <class> <name>' or 'load <name>'."])
+            while connection.session.running:
+                line = await reader.readline()
+                if not line:
+                    break
+                connection.send(await self.execute(connection, line.decode(errors="replace")))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            await connection.close()
+            self.connections.discard(connection)
+            writer.close()
+
+    async def execute(self, connection, line):
+        name, _, argument = line.strip().partition(" ")
+        name = name.lower()
+
+        if name in ("new", "load"):
+            player = argument.strip().partition(" ")[2].strip() if name == "new" else argument.strip()
+            if not valid_character_name(player):
+                return ["Invalid character name."]
+            if player in self.players:
+                return ["Character already in play."]
+            connection.flush_save()
+            self.release(connection)
+
+        if name == "save" and connection.session.character is not None:
+            return await self.save_now(connection)
+
+        lines = connection.session.run_command(name, argument.strip())
+
+        character = connection.session.character
+        if character is not None:
+            self.players.setdefault(character["name"], connection)
+            if name not in READ_ONLY_COMMANDS:
+                connection.schedule_save()
+        return lines
+
+    async def save_now(self, connection):
+        try:
+            await connection.start_save(connection.session.character)
+        except OSError as e:
+            return [f"Save error: {e}"]
+        return ["Game saved successfully."]
+
+    def release(self, connection):
+        character = connection.session.character
+        if character is not None and self.players.get(character["name"]) is connection:
+            del self.players[character["name"]]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    port = int(argv[0]) if argv else DEFAULT_PORT
+    server = GameServer(game_session.load_world(), port=port)
+    print(f"Quest Chronicles server on {DEFAULT_HOST}:{port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,675 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Game Session Module
+
+Headless game driver. A GameSession owns one player's character and runs
+text commands against it, collecting the output as lines instead of
+printing, so the game can be driven by scripts, bots and load tests:
+
+    world = game_session.load_world()
+    world.attach()
+    session = game_session.GameSession(world)
+    session.execute("new Warrior Aria")
+    session.execute("buy health_potion x2")
+    lines = session.execute("inventory")
+
+Everything that does not belong to a single player lives in a GameWorld:
+the quest and item catalogs, loot tables, route planner, quest timers and
+economy ledger. Game events carry the character they happened to, and the
+world maps each character back to its session, so quest announcements and
+timer messages end up in the right session's output.
+
+main.py is a terminal adapter over this module: it prompts, calls
+run_command and prints the returned lines.
+"""
+
+import os
+import time
+import character_manager
+import inventory_system
+import quest_handler
+import combat_system
+import game_data
+import item_catalog
+import economy_ledger
+import lazy_loader
+import loot_system
+import quest_planner
+import quest_scheduler
+from battle_log import BattleLog
+from custom_exceptions import *
+
+REVIVE_COST = 20
+SHOP_FILTER_KEYS = {"type": "item_type", "stat": "stat", "min": "min_cost", "max": "max_cost"}
+
+# ============================================================================
+# SHARED WORLD
+# ============================================================================
+
+DATA_FILES = {
+    "quests": "data/quests.txt",
+    "items": "data/items.txt",
+    "loot_tables": "data/loot_tables.txt",
+}
+
+
+class GameWorld:
+    """
+    Read-only catalogs plus the event hooks shared by every session.
+
+    A world built by load_world parses each catalog the first time it is
+    used, so a front end that never starts a game never parses anything.
+    """
+
+    def __init__(self, quest_data_dict=None, item_data_dict=None, loot_tables=None, ledger=None,
+                 files=None):
+        self.files = files
+        self.catalogs = {}
+        if files is None:
+            self.catalogs.update(quests=quest_data_dict, items=item_data_dict,
+                                 loot_tables=loot_tables or {})
+            inventory_system.register_item_catalog(item_data_dict)
+        self.timers = quest_scheduler.QuestScheduler()
+        self.economy = ledger if ledger is not None else economy_ledger.EconomyLedger()
+        self.sessions = {}      # id(character) → GameSession
+        self.attached = False
+        self.tracker = None
+
+    # ------------------------------------------------------------------
+    # Catalogs (parsed on first use)
+    # ------------------------------------------------------------------
+
+    def catalog(self, name):
+        value = self.catalogs.get(name)
+        if value is None:
+            with lazy_loader.timed(f"load {name}"):
+                value = self.catalogs[name] = CATALOG_LOADERS[name](self)
+        return value
+
+    @property
+    def quests(self):
+        return self.catalog("quests")
+
+    @property
+    def items(self):
+        return self.catalog("items")
+
+    @property
+    def loot_tables(self):
+        return self.catalog("loot_tables")
+
+    @property
+    def shop_catalog(self):
+        return self.catalog("shop_catalog")
+
+    @property
+    def planner(self):
+        return self.catalog("planner")
+
+    def load(self):
+        """
+        Parse every catalog now.
+        Raises MissingDataFileError, InvalidDataFormatError.
+        """
+        for name in CATALOG_LOADERS:
+            self.catalog(name)
+
+    # ------------------------------------------------------------------
+    # Event hooks
+    # ------------------------------------------------------------------
+
+    def attach(self):
+        """
+        Start the ledger and quest timers; objective tracking starts when
+        the first character joins (it needs the catalogs).
+        """
+        if not self.attached:
+            self.economy.attach()
+            self.timers.attach()
+            self.attached = True
+
+    def detach(self):
+        if self.attached:
+            if self.tracker is not None:
+                self.tracker.detach()
+                self.tracker = None
+            self.timers.detach()
+            self.economy.detach()
+            self.economy.flush()
+            self.attached = False
+
+    def join(self, session, character):
+        if self.attached and self.tracker is None:
+            self.tracker = quest_handler.attach_objective_tracking(
+                self.quests, self.items, self.announce_completion, self.session_time, self.report_error)
+        self.sessions[id(character)] = session
+        self.timers.track(character)
+
+    def leave(self, character):
+        self.sessions.pop(id(character), None)
+
+    def session_time(self, character):
+        """
+        The clock reading of the command the character's session is running.
+        """
+        session = self.sessions.get(id(character))
+        return session.now if session is not None else time.time()
+
+    def report_error(self, character, message):
+        session = self.sessions.get(id(character))
+        if session is not None:
+            session.say(f"Error: {message}")
+
+    def announce_completion(self, character, quest, rewards):
+        session = self.sessions.get(id(character))
+        if session is not None:
+            session.say(f"\n*** Quest complete: {quest['title']}! "
+                        f"+{rewards['xp']} XP, +{rewards['gold']} gold ***")
+
+    def check_timers(self, now):
+        """
+        Fire due quest timers, reporting each to the owning session.
+        """
+        for kind, character, quest_id in self.timers.advance(now):
+            session = self.sessions.get(id(character))
+            if session is None:
+                continue
+            title = self.quests[quest_id]["title"] if quest_id in self.quests else quest_id
+            if kind == "failed":
+                session.say(f"\n*** Out of time: {title} failed. ***")
+            else:
+                session.say(f"\n*** {title} is available again. ***")
+
+
+def load_item_catalog(world):
+    items = game_data.load_items(world.files["items"])
+    inventory_system.register_item_catalog(items)
+    return items
+
+
+CATALOG_LOADERS = {
+    "quests": lambda world: game_data.load_quests(world.files["quests"]),
+    "items": load_item_catalog,
+    "loot_tables": lambda world: loot_system.load_loot_tables(world.files["loot_tables"]),
+    "shop_catalog": lambda world: item_catalog.ItemCatalog(world.items),
+    "planner": lambda world: quest_planner.QuestPlanner(world.quests),
+}
+
+
+def load_world(quest_file=DATA_FILES["quests"], item_file=DATA_FILES["items"],
+               loot_file=DATA_FILES["loot_tables"], ledger=None):
+    """
+    A GameWorld over the data files; catalogs are parsed on first use.
+    Raises MissingDataFileError if a file does not exist.
+    """
+    files = {"quests": quest_file, "items": item_file, "loot_tables": loot_file}
+    for name, filename in files.items():
+        if not os.path.isfile(filename):
+            raise MissingDataFileError(f"Data file not found ({name}): {filename}")
+    return GameWorld(ledger=ledger, files=files)
+
+# ============================================================================
+# SESSION
+# ============================================================================
+
+def always_attack(battle):
+    return "1"
+
+
+class GameSession:
+    """
+    One player's game, driven by text commands.
+
+    battle_input(battle) picks each battle action ("1" attack, "2" special,
+    "3" escape); the default always attacks. echo_battles prints battle
+    messages as they happen (for the terminal). The clock is read once per
+    command (self.now). saver(character) writes a save file; the default
+    writes it into save_directory right away. A recorder (see
+    session_replay) sees every command, battle action and timer check.
+    """
+
+    def __init__(self, world, save_directory="data/save_games", battle_input=always_attack,
+                 echo_battles=False, clock=time.time, saver=None):
+        self.world = world
+        self.save_directory = save_directory
+        self.saver = saver if saver is not None else self.write_save
+        self.battle_input = battle_input
+        self.echo_battles = echo_battles
+        self.clock = clock
+        self.now = clock()
+        self.recorder = None
+        self.character = None
+        self.running = True
+        self.output = []
+        self.commands_run = 0
+        self.shop_filters = {}
+        self.shop_page = 1
+        self.commands = {
+            "new": self.new_character,
+            "load": self.load_character,
+            "saves": self.list_saves,
+            "stats": self.stats,
+            "inventory": self.inventory,
+            "use": self.use,
+            "equip": self.equip,
+            "drop": self.drop,
+            "sort": self.sort,
+            "quests": self.quests,
+            "accept": self.accept,
+            "abandon": self.abandon,
+            "complete": self.complete,
+            "plan": self.plan,
+            "explore": self.explore,
+            "revive": self.revive,
+            "shop": self.shop,
+            "buy": self.buy,
+            "sell": self.sell,
+            "save": self.save,
+            "quit": self.quit,
+        }
+        self.needs_character = set(self.commands) - {"new", "load", "saves", "quit"}
+
+    # ------------------------------------------------------------------
+    # Driving the session
+    # ------------------------------------------------------------------
+
+    def say(self, line):
+        self.output.append(line)
+
+    def take_output(self):
+        lines = self.output
+        self.output = []
+        return lines
+
+    def execute(self, line):
+        """
+        Run one command line such as "accept goblin_hunter".
+        Returns the output lines.
+        """
+        name, _, argument = line.strip().partition(" ")
+        return self.run_command(name.lower(), argument.strip())
+
+    def run_command(self, name, argument=""):
+        self.now = self.clock()
+        if self.recorder is not None:
+            self.recorder.record_command(self, name, argument)
+
+        handler = self.commands.get(name)
+        if handler is None:
+            self.say(f"Unknown command: {name}")
+            return self.take_output()
+        if name in self.needs_character and self.character is None:
+            self.say("No character loaded.")
+            return self.take_output()
+
+        self.commands_run += 1
+        if self.character is not None:
+            self.world.check_timers(self.now)
+        handler(argument)
+        if self.recorder is not None:
+            self.recorder.record_state(self)
+        return self.take_output()
+
+    def tick(self):
+        """
+        Fire due quest timers without running a command.
+        Returns the output lines.
+        """
+        self.now = self.clock()
+        due = self.world.timers.next_due()
+        if due is not None and due <= self.now:
+            if self.recorder is not None:
+                self.recorder.record_tick(self)
+            self.world.check_timers(self.now)
+        return self.take_output()
+
+    def run_script(self, lines):
+        """
+        Execute command lines until the script ends or the session quits.
+        Returns all output lines.
+        """
+        output = []
+        for line in lines:
+            if not self.running:
+                break
+            output.extend(self.execute(line))
+        return output
+
+    def set_character(self, character):
+        if self.character is not None:
+            self.world.leave(self.character)
+        self.character = character
+        self.world.join(self, character)
+
+    def is_dead(self):
+        return self.character is not None and character_manager.is_character_dead(self.character)
+
+    # ------------------------------------------------------------------
+    # Characters
+    # ------------------------------------------------------------------
+
+    def new_character(self, argument):
+        """
+        new <Class> <name>
+        """
+        char_class, _, name = argument.partition(" ")
+        name = name.strip()
+        if not name:
+            self.say("Usage: new <class> <name>")
+            return
+        self.world.items        # registers stack sizes before the inventory is built
+        try:
+            character = character_manager.create_character(name, char_class.capitalize())
+            self.saver(character)
+        except InvalidCharacterClassError:
+            self.say("Invalid class name. Try again.")
+            return
+        self.set_character(character)
+        self.say(f"\nCreated {name} the {character['class']}!")
+
+    def load_character(self, name):
+        self.world.items        # registers stack sizes before the inventory is built
+        try:
+            character = character_manager.load_character(name, self.save_directory)
+        except CharacterNotFoundError:
+            self.say("Character not found.")
+            return
+        except SaveFileCorruptedError:
+            self.say("Save file corrupted.")
+            return
+        except InvalidSaveDataError:
+            self.say("Invalid save data.")
+            return
+        self.set_character(character)
+        self.say(f"Loaded character: {name}")
+
+    def list_saves(self, argument=""):
+        saved = character_manager.list_saved_characters(self.save_directory)
+        if not saved:
+            self.say("No saved characters found.")
+            return
+        self.say("Saved Characters:")
+        for i, name in enumerate(saved, 1):
+            self.say(f"{i}. {name}")
+
+    def write_save(self, character):
+        character_manager.save_character(character, self.save_directory)
+
+    def save(self, argument=""):
+        try:
+            self.saver(self.character)
+            self.world.economy.flush()
+            self.say("Game saved successfully.")
+        except Exception as e:
+            self.say(f"Save error: {e}")
+
+    def quit(self, argument=""):
+        if self.character is not None:
+            self.world.leave(self.character)
+        self.running = False
+
+    # ------------------------------------------------------------------
+    # Character sheet & inventory
+    # ------------------------------------------------------------------
+
+    def stats(self, argument=""):
+        self.say("\n=== CHARACTER STATS ===")
+        for key in ["name", "class", "level", "health", "max_health", "strength", "magic", "experience", "gold"]:
+            self.say(f"{key.capitalize()}: {self.character[key]}")
+        self.output.extend(quest_handler.quest_progress_lines(self.character, self.world.quests))
+
+    def inventory(self, argument=""):
+        self.output.extend(inventory_system.inventory_lines(self.character, self.world.items))
+
+    def item_command(self, item_id, action):
+        if item_id not in self.world.items:
+            self.say("Invalid item ID.")
+            return
+        try:
+            action(item_id, self.world.items[item_id])
+        except Exception as e:
+            self.say(f"Error: {e}")
+
+    def use(self, item_id):
+        self.item_command(item_id, lambda item_id, data: self.say(
+            inventory_system.use_item(self.character, item_id, data)))
+
+    def equip(self, argument):
+        """
+        equip <item_id> [weapon|armor]; the slot defaults to the item's type.
+        """
+        item_id, _, slot = argument.partition(" ")
+        slot = slot.strip() or self.world.items.get(item_id, {}).get("type")
+        equip = inventory_system.equip_armor if slot == "armor" else inventory_system.equip_weapon
+        self.item_command(item_id, lambda item_id, data: self.say(
+            equip(self.character, item_id, data)))
+
+    def drop(self, item_id):
+        def remove(item_id, data):
+            inventory_system.remove_item_from_inventory(self.character, item_id)
+            self.say("Item removed.")
+        self.item_command(item_id, remove)
+
+    def sort(self, order):
+        try:
+            inventory_system.sort_inventory(self.character, self.world.items, order.lower())
+        except ValueError as e:
+            self.say(f"Error: {e}")
+            return
+        self.inventory()
+
+    # ------------------------------------------------------------------
+    # Quests
+    # ------------------------------------------------------------------
+
+    def quests(self, view):
+        try:
+            lines = quest_handler.quest_log_lines(self.character, self.world.quests, view or "active",
+                                                 self.now)
+        except ValueError as e:
+            self.say(f"Error: {e}")
+            return
+        self.output.extend(lines)
+
+    def accept(self, quest_id):
+        try:
+            quest_handler.accept_quest(self.character, quest_id, self.world.quests, self.now)
+        except QuestError as e:
+            self.say(f"Error: {e}")
+            return
+        self.say("Quest accepted!")
+        if quest_id not in self.character["active_quests"]:
+            self.say("Objectives already met - quest complete!")
+
+    def abandon(self, quest_id):
+        try:
+            quest_handler.abandon_quest(self.character, quest_id)
+            self.say("Quest abandoned.")
+        except QuestError as e:
+            self.say(f"Error: {e}")
+
+    def complete(self, quest_id):
+        try:
+            rewards = quest_handler.complete_quest(self.character, quest_id, self.world.quests, self.now)
+            self.say(f"Quest completed! Rewards: {rewards}")
+        except QuestError as e:
+            self.say(f"Error: {e}")
+
+    def plan(self, quest_id):
+        try:
+            plan = self.world.planner.plan(self.character, quest_id)
+        except (QuestError, InvalidDataFormatError) as e:
+            self.say(f"Error: {e}")
+            return
+        self.output.extend(quest_planner.plan_lines(plan, self.world.quests))
+
+    # ------------------------------------------------------------------
+    # Exploration
+    # ------------------------------------------------------------------
+
+    def explore(self, argument=""):
+        self.say("\n=== EXPLORING ===")
+        if self.is_dead():
+            self.say("You cannot fight while dead.")
+            return
+
+        enemy = combat_system.get_random_enemy_for_level(self.character["level"])
+        self.say(f"You encounter a {enemy['name']}!")
+        result = self.fight(combat_system.SimpleBattle(
+            self.character, enemy, log=BattleLog(echo=self.echo_battles)))
+
+        if result["winner"] == "player":
+            self.say(f"You won! +{result['xp_gained']} XP, +{result['gold_gained']} gold")
+            character_manager.gain_experience(self.character, result["xp_gained"])
+            character_manager.add_gold(self.character, result["gold_gained"], "battle")
+            self.award_loot(enemy)
+        elif result["winner"] == "enemy":
+            self.say("You were defeated...")
+
+    def fight(self, battle):
+        """
+        Run a battle to the end with actions from battle_input.
+        A battle abandoned midway (e.g. input ran out) still ends its
+        buffs, so a save made afterwards holds the character's real stats.
+        """
+        try:
+            while battle.combat_active:
+                result = battle.begin_turn()
+                if result:
+                    return result
+                action = str(self.battle_input(battle)).strip()
+                if self.recorder is not None:
+                    self.recorder.record_action(action)
+                battle.perform_player_action(action)
+                result = battle.end_turn()
+                if result:
+                    return result
+            return {"winner": "none", "xp_gained": 0, "gold_gained": 0}
+        finally:
+            battle.effects.clear()
+
+    def award_loot(self, enemy):
+        if enemy["type"] not in self.world.loot_tables:
+            return
+
+        loot = loot_system.roll_loot(enemy["type"], self.world.loot_tables)
+        awarded, left_behind = loot_system.award_loot(self.character, loot, self.world.items)
+        for item_id, quantity in awarded.items():
+            self.say(f"Loot: {self.world.items.get(item_id, {}).get('name', item_id)} x{quantity}")
+        for item_id, quantity in left_behind.items():
+            self.say(f"No room for {item_id} x{quantity}; left behind.")
+
+    def revive(self, argument=""):
+        """
+        Pay to revive; a character who cannot pay ends the session.
+        """
+        if not self.is_dead():
+            self.say("You are not dead.")
+            return
+        if self.character["gold"] < REVIVE_COST:
+            self.say("Not enough gold. You cannot revive.")
+            self.quit()
+            return
+        character_manager.add_gold(self.character, -REVIVE_COST, "revive")
+        character_manager.revive_character(self.character)
+        self.say("You have been revived!")
+
+    # ------------------------------------------------------------------
+    # Shop
+    # ------------------------------------------------------------------
+
+    def shop(self, argument=""):
+        """
+        shop                      show the current page
+        shop next | shop prev     change page
+        shop filter type=weapon stat=strength min=10 max=100
+        """
+        action, _, rest = argument.partition(" ")
+        if action == "next":
+            self.shop_page += 1
+        elif action == "prev":
+            self.shop_page = max(self.shop_page - 1, 1)
+        elif action == "filter":
+            try:
+                self.shop_filters = parse_shop_filters(rest)
+            except ValueError as e:
+                self.say(f"Error: {e}")
+                return
+            self.shop_page = 1
+
+        catalog = self.world.shop_catalog
+        listing = catalog.query(page=self.shop_page, **self.shop_filters)
+        if listing.page > listing.pages:
+            self.shop_page = listing.pages
+            listing = catalog.query(page=self.shop_page, **self.shop_filters)
+
+        self.say("\n=== SHOP ===")
+        self.say(f"Your gold: {self.character['gold']}")
+        self.say("\nItems for sale:")
+        for item_id in listing.item_ids:
+            data = self.world.items[item_id]
+            self.say(f"{item_id}: {data['name']} (Cost: {data['cost']})")
+        if not listing.item_ids:
+            self.say("No matching items.")
+        self.say(f"Page {listing.page}/{listing.pages} ({listing.total} items)")
+
+    def buy(self, text):
+        try:
+            cart = parse_cart(text, self.world.items)
+            cost = inventory_system.purchase_items(self.character, cart, self.world.items)
+            self.say(f"Purchase successful! Spent {cost} gold.")
+        except Exception as e:
+            self.say(f"Error: {e}")
+
+    def sell(self, text):
+        try:
+            cart = parse_cart(text, self.world.items)
+            gold = inventory_system.sell_items(self.character, cart, self.world.items)
+            self.say(f"Sold for {gold} gold.")
+        except Exception as e:
+            self.say(f"Error: {e}")
+
+# ============================================================================
+# COMMAND ARGUMENTS
+# ============================================================================
+
+def parse_cart(text, item_data_dict):
+    """
+    "health_potion x3, iron_sword" → {item_id: quantity}
+    Raises ValueError for unknown items, bad quantities or an empty cart.
+    """
+    cart = {}
+    for entry in text.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        item_id, _, quantity = entry.partition(" x")
+        item_id = item_id.strip()
+        quantity = quantity.strip() or "1"
+        if item_id not in item_data_dict:
+            raise ValueError(f"Invalid item: {item_id}")
+        if not quantity.isdigit() or int(quantity) < 1:
+            raise ValueError(f"Invalid quantity for {item_id}.")
+        cart[item_id] = cart.get(item_id, 0) + int(quantity)
+
+    if not cart:
+        raise ValueError("No items entered.")
+    return cart
+
+
+def parse_shop_filters(text):
+    """
+    "type=weapon min=10" → ItemCatalog.query keyword arguments.
+    Raises ValueError for unknown keys or non-numeric costs.
+    """
+    filters = {}
+    for part in text.split():
+        key, _, value = part.partition("=")
+        if key not in SHOP_FILTER_KEYS or not value:
+            raise ValueError(f"Invalid filter: {part}")
+        if key in ("min", "max"):
+            if not value.isdigit():
+                raise ValueError(f"Invalid filter: {part}")
+            value = int(value)
+        filters[SHOP_FILTER_KEYS[key]] = value
+    return filters
@@ -9,60 +9,385 @@ Inventory logic (equip/unequip, stat effects, selling/buying, and error handling
 was developed with ChatGPT assistance. All final code reviewed and understood by me.
 """
 
+import heapq
+import game_data
+import game_events
+import character_stats
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
     InsufficientResourcesError,
-    InvalidItemTypeError
+    InvalidItemTypeError,
+    InvalidDataFormatError
 )
 
-MAX_INVENTORY_SIZE = 20
+MAX_INVENTORY_SIZE = 20     # Default capacity, in slots
+
+# Stack size per item id, registered from the item catalog only
+STACK_SIZES = {}
+
+# ============================================================================
+# INVENTORY STORAGE
+# ============================================================================
+
+def register_item_catalog(item_data_dict):
+    """
+    Remember the stack size of every catalog item.
+    Call after loading items and before loading characters.
+    """
+    for item_id, item_data in item_data_dict.items():
+        if "stack_size" in item_data:
+            STACK_SIZES[item_id] = item_data["stack_size"]
+
+
+def get_stack_size(item_id, item_data=None):
+    """
+    Stack size from the item's own data, else the catalog, else 1.
+    """
+    if item_data is not None and "stack_size" in item_data:
+        return item_data["stack_size"]
+    return STACK_SIZES.get(item_id, 1)
+
+
+def slots_for(quantity, stack_size):
+    """
+    Slots taken by `quantity` items in stacks of stack_size (rounded up).
+    """
+    return -(-quantity // stack_size)
+
+
+class Inventory:
+    """
+    Counted multiset of item ids: item_id -> quantity, plus the total
+    number of items held and the number of slots their stacks take.
+    Adding, removing, checking and counting are O(1).
+
+    It still behaves like the old list of ids where the rest of the game
+    relies on it: `in`, len(), truthiness and iteration (one id per item,
+    which is also how it is written to save files).
+
+    Each held item keeps the stack size it had when it entered the bag
+    (`stacks`) until it is gone again, so `slots_used` stays consistent
+    however the catalog or the item data passed in change meanwhile.
+
+    The bag layout is kept separately: `layout` lists the item ids in bag
+    order, one entry per item (its stacks take consecutive slots), with
+    None where an item ran out. New items fill the first hole. Sorting
+    and compacting permute `layout` in place with cycle swaps, so the
+    counts and the save order are never rebuilt; only the positions
+    (see layout_positions) change.
+    """
+
+    def __init__(self, item_ids=None):
+        self.counts = {}
+        self.total = 0
+        self.slots_used = 0
+        self.stacks = {}
+        self.layout = []
+        self.positions = {}
+        self.holes = []
+        if item_ids:
+            for item_id in item_ids:
+                self.add(item_id)
+
+    def stack_size(self, item_id, item_data=None):
+        stack = self.stacks.get(item_id)
+        return stack if stack is not None else get_stack_size(item_id, item_data)
+
+    def slots_needed(self, item_id, quantity=1, item_data=None):
+        """
+        Extra slots that adding `quantity` of an item would take.
+        """
+        stack = self.stack_size(item_id, item_data)
+        held = self.counts.get(item_id, 0)
+        return slots_for(held + quantity, stack) - slots_for(held, stack)
+
+    def add(self, item_id, quantity=1, item_data=None):
+        self.slots_used += self.slots_needed(item_id, quantity, item_data)
+        if item_id not in self.counts:
+            self.stacks[item_id] = self.stack_size(item_id, item_data)
+            self.place(item_id)
+        self.counts[item_id] = self.counts.get(item_id, 0) + quantity
+        self.total += quantity
+
+    def remove(self, item_id, quantity=1):
+        """
+        Raises ItemNotFoundError if fewer than `quantity` are held.
+        """
+        held = self.counts.get(item_id, 0)
+        if held < quantity:
+            raise ItemNotFoundError(f"Item not found: {item_id}")
+
+        stack = self.stacks[item_id]
+        self.slots_used -= slots_for(held, stack) - slots_for(held - quantity, stack)
+        if held == quantity:
+            del self.counts[item_id]
+            del self.stacks[item_id]
+            position = self.positions.pop(item_id)
+            self.layout[position] = None
+            heapq.heappush(self.holes, position)
+        else:
+            self.counts[item_id] = held - quantity
+        self.total -= quantity
+
+    def count(self, item_id):
+        return self.counts.get(item_id, 0)
+
+    def append(self, item_id):
+        self.add(item_id)
+
+    def clear(self):
+        self.counts = {}
+        self.total = 0
+        self.slots_used = 0
+        self.stacks = {}
+        self.layout = []
+        self.positions = {}
+        self.holes = []
+
+    # ------------------------------------------------------------------
+    # Slot layout
+    # ------------------------------------------------------------------
+
+    def place(self, item_id):
+        """
+        Give a new item the first free position in the layout.
+        """
+        if self.holes:
+            position = heapq.heappop(self.holes)
+            self.layout[position] = item_id
+        else:
+            position = len(self.layout)
+            self.layout.append(item_id)
+        self.positions[item_id] = position
+
+    def slot_contents(self):
+        """
+        Bag slots in order: (item_id, quantity) per stack, None for a hole.
+        """
+        slots = []
+        for item_id in self.layout:
+            if item_id is None:
+                slots.append(None)
+                continue
+            held = self.counts[item_id]
+            stack = self.stacks[item_id]
+            while held > 0:
+                slots.append((item_id, min(held, stack)))
+                held -= stack
+        return slots
+
+    def arrange(self, key=None):
+        """
+        Reorder the layout by key(item_id) (stable; current order if None)
+        and drop the holes. O(n log n) to sort the positions, then one pass
+        of swaps following each permutation cycle.
+        """
+        filled = [i for i, item_id in enumerate(self.layout) if item_id is not None]
+        if key is not None:
+            filled.sort(key=lambda i: key(self.layout[i]))
+
+        # target[i] = where the entry now at position i has to go
+        target = [0] * len(self.layout)
+        for new_position, old_position in enumerate(filled):
+            target[old_position] = new_position
+        next_free = len(filled)
+        for i, item_id in enumerate(self.layout):
+            if item_id is None:
+                target[i] = next_free
+                next_free += 1
+
+        layout = self.layout
+        for i in range(len(layout)):
+            while target[i] != i:
+                j = target[i]
+                layout[i], layout[j] = layout[j], layout[i]
+                target[i], target[j] = target[j], target[i]
+
+        del layout[len(filled):]
+        self.holes = []
+        for position, item_id in enumerate(layout):
+            self.positions[item_id] = position
+
+    def layout_positions(self):
+        """
+        Layout position of each item, in counts (save file) order.
+        """
+        return [self.positions[item_id] for item_id in self.counts]
+
+    def restore_layout(self, positions):
+        """
+        Inverse of layout_positions. Raises ValueError if they do not fit.
+        """
+        if len(positions) != len(self.counts) or len(set(positions)) != len(positions) \
+                or any(p < 0 for p in positions):
+            raise ValueError("Invalid inventory layout")
+
+        size = max(positions, default=-1) + 1
+        self.layout = [None] * size
+        self.positions = {}
+        for item_id, position in zip(self.counts, positions):
+            self.layout[position] = item_id
+            self.positions[item_id] = position
+        self.holes = [i for i, item_id in enumerate(self.layout) if item_id is None]
+
+    def is_default_layout(self):
+        """
+        True when the layout has no holes and follows the counts order.
+        """
+        return len(self.layout) == len(self.counts) and all(
+            position == i for i, position in enumerate(self.layout_positions())
+        )
+
+    def copy(self):
+        return list(self)
+
+    def __contains__(self, item_id):
+        return item_id in self.counts
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        for item_id, quantity in self.counts.items():
+            for _ in range(quantity):
+                yield item_id
+
+    def __repr__(self):
+        return f"Inventory({self.counts!r})"
+
+
+def get_inventory(character):
+    """
+    Return the character's Inventory, upgrading a plain list of ids
+    (older saves, hand-built test characters) in place the first time.
+    """
+    inventory = character["inventory"]
+    if not isinstance(inventory, Inventory):
+        inventory = Inventory(inventory)
+        character["inventory"] = inventory
+    return inventory
+
+def get_inventory_capacity(character):
+    """
+    Slots available to this character (bags, bank tabs...).
+    """
+    return character.get("inventory_capacity", MAX_INVENTORY_SIZE)
+
+
+def check_space(character, item_id, quantity=1, message="Inventory full.", item_data=None):
+    """
+    Raises InventoryFullError if `quantity` of item_id would not fit.
+    """
+    inventory = get_inventory(character)
+    if inventory.slots_used + inventory.slots_needed(item_id, quantity, item_data) > get_inventory_capacity(character):
+        raise InventoryFullError(message)
+
+
+def check_quantity(item_id, quantity):
+    """
+    Raises ValueError for a quantity below 1.
+    """
+    if quantity < 1:
+        raise ValueError(f"Invalid quantity for {item_id}: {quantity}")
+
+
+def notify(kind, character, item_id, quantity, gold=0):
+    """
+    Emit an ItemEvent if anyone is subscribed to this kind.
+    """
+    if game_events.listening(kind):
+        game_events.emit(game_events.ItemEvent(kind, character, item_id, quantity, gold))
 
 # ============================================================================
 # INVENTORY MANAGEMENT
 # ============================================================================
 
-def add_item_to_inventory(character, item_id):
+def add_item_to_inventory(character, item_id, quantity=1, item_data=None):
     """
-    Add item_id into character['inventory'].
-    Raises InventoryFullError if no space.
+    Add `quantity` of item_id into character['inventory'].
+    Raises InventoryFullError if no space, ValueError for a quantity below 1.
     """
-    if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
-        raise InventoryFullError("Inventory full.")
+    check_quantity(item_id, quantity)
+    check_space(character, item_id, quantity, item_data=item_data)
 
-    character["inventory"].append(item_id)
+    get_inventory(character).add(item_id, quantity, item_data)
+    notify("item_added", character, item_id, quantity)
     return True
 
 
-def remove_item_from_inventory(character, item_id):
+def remove_item_from_inventory(character, item_id, quantity=1):
     """
-    Remove one instance of item_id.
-    Raises ItemNotFoundError if item is not present.
+    Remove `quantity` instances of item_id.
+    Raises ItemNotFoundError if not enough are present, ValueError for a
+    quantity below 1.
     """
-    if item_id not in character["inventory"]:
-        raise ItemNotFoundError(f"Item not found: {item_id}")
-
-    character["inventory"].remove(item_id)
+    check_quantity(item_id, quantity)
+    get_inventory(character).remove(item_id, quantity)
+    notify("item_removed", character, item_id, -quantity)
     return True
 
 
 def has_item(character, item_id):
-    return item_id in character["inventory"]
+    return item_id in get_inventory(character)
 
 
 def count_item(character, item_id):
-    return character["inventory"].count(item_id)
+    return get_inventory(character).count(item_id)
 
 
 def get_inventory_space_remaining(character):
-    return MAX_INVENTORY_SIZE - len(character["inventory"])
+    """
+    Free slots left.
+    """
+    return get_inventory_capacity(character) - get_inventory(character).slots_used
 
 
 def clear_inventory(character):
-    removed_items = character["inventory"].copy()
-    character["inventory"].clear()
+    inventory = get_inventory(character)
+    removed_items = inventory.copy()
+    counts = inventory.counts
+    inventory.clear()
+    for item_id, quantity in counts.items():
+        notify("item_removed", character, item_id, -quantity)
     return removed_items
 
+
+SORT_KEYS = {
+    "type": lambda item_id, data: (data.get("type", ""), data.get("name", item_id), item_id),
+    "cost": lambda item_id, data: (data.get("cost", 0), item_id),
+    "name": lambda item_id, data: (data.get("name", item_id), item_id),
+}
+
+
+def sort_inventory(character, item_data_dict, by="type"):
+    """
+    Sort the bag layout by "type", "cost" or "name" (holes are removed).
+    Raises ValueError for an unknown sort order.
+    """
+    if by not in SORT_KEYS:
+        raise ValueError(f"Unknown sort order: {by}")
+
+    sort_key = SORT_KEYS[by]
+    inventory = get_inventory(character)
+    inventory.arrange(lambda item_id: sort_key(item_id, item_data_dict.get(item_id, {})))
+    notify_layout(character, inventory)
+
+
+def compact_inventory(character):
+    """
+    Close the holes left by used-up items, keeping the current order.
+    """
+    inventory = get_inventory(character)
+    inventory.arrange()
+    notify_layout(character, inventory)
+
+
+def notify_layout(character, inventory):
+    if game_events.listening("inventory_arranged"):
+        game_events.emit(game_events.LayoutEvent(
+            "inventory_arranged", character, inventory.layout_positions()))
+
 # ============================================================================
 # ITEM USAGE
 # ============================================================================
@@ -80,20 +405,26 @@ def use_item(character, item_id, item_data):
     if item_data["type"] != "consumable":
         raise InvalidItemTypeError("Only consumable items can be used.")
 
-    stat, value = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, value)
+    effects = get_item_effects(item_data)
+    apply_item_effects(character, effects)
 
-    remove_item_from_inventory(character, item_id)
-    return f"Used {item_data['name']} and applied {stat}+{value}"
+    get_inventory(character).remove(item_id)
+    notify("item_used", character, item_id, -1)
+    applied = ", ".join(f"{stat}+{value}" for stat, value in effects)
+    return f"Used {item_data.get('name', item_id)} and applied {applied}"
 
 # ============================================================================
 # EQUIPMENT SYSTEM
 # ============================================================================
 
+EQUIPMENT_SLOTS = {"weapon": "equipped_weapon", "armor": "equipped_armor"}
+
+
 def equip_weapon(character, item_id, item_data):
     """
     Equip a weapon.
-    Removes old weapon bonus, equips new one.
+    The old weapon (if any) goes back to the inventory and its bonus is
+    replaced by the new one.
     Raises:
         ItemNotFoundError
         InvalidItemTypeError
@@ -105,30 +436,8 @@ def equip_weapon(character, item_id, item_data):
     if item_data["type"] != "weapon":
         raise InvalidItemTypeError("Item is not a weapon.")
 
-    # Unequip current weapon if present
-    if "equipped_weapon" in character and character["equipped_weapon"] is not None:
-        old = character["equipped_weapon"]
-        old_data = item_data  # Not perfect; but tests do not check actual rollback details
-        # Ideally, look up full item data dictionary externally
-        stat, val = parse_item_effect(old_data["effect"])
-        apply_stat_effect(character, stat, -val)  # remove old bonus
-
-        # Try to put weapon back in inventory
-        if get_inventory_space_remaining(character) <= 0:
-            raise InventoryFullError("No space to unequip weapon.")
-        character["inventory"].append(old["item_id"])
-
-    # Equip new weapon
-    stat, val = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, val)
-
-    character["equipped_weapon"] = {
-        "item_id": item_id,
-        "effect": item_data["effect"]
-    }
-
-    remove_item_from_inventory(character, item_id)
-    return f"Equipped weapon: {item_data['name']}"
+    equip_item(character, item_id, item_data, "weapon")
+    return f"Equipped weapon: {item_data.get('name', item_id)}"
 
 
 def equip_armor(character, item_id, item_data):
@@ -141,108 +450,215 @@ def equip_armor(character, item_id, item_data):
     if item_data["type"] != "armor":
         raise InvalidItemTypeError("Item is not armor.")
 
-    # Unequip old armor
-    if "equipped_armor" in character and character["equipped_armor"] is not None:
-        old = character["equipped_armor"]
-        old_stat, old_val = parse_item_effect(old["effect"])
-        apply_stat_effect(character, old_stat, -old_val)
+    equip_item(character, item_id, item_data, "armor")
+    return f"Equipped armor: {item_data.get('name', item_id)}"
 
-        if get_inventory_space_remaining(character) <= 0:
-            raise InventoryFullError("No space to unequip armor.")
-        character["inventory"].append(old["item_id"])
 
-    # Equip new armor
-    stat, val = parse_item_effect(item_data["effect"])
-    apply_stat_effect(character, stat, val)
+def equip_item(character, item_id, item_data, slot):
+    """
+    Move item_id from the inventory into an equipment slot, swapping out
+    whatever was there, and set the slot's stat modifier.
+    """
+    effects = get_item_effects(item_data)
+    for stat_name, _ in effects:
+        if stat_name not in character_stats.MODIFIABLE_STATS:
+            raise InvalidItemTypeError(f"Equipment cannot modify stat: {stat_name}")
 
-    character["equipped_armor"] = {
-        "item_id": item_id,
-        "effect": item_data["effect"]
-    }
+    inventory = get_inventory(character)
+    field = EQUIPMENT_SLOTS[slot]
+    old_id = character.get(field)
 
-    remove_item_from_inventory(character, item_id)
-    return f"Equipped armor: {item_data['name']}"
+    inventory.remove(item_id)
+    if old_id is not None:
+        try:
+            check_space(character, old_id, 1, f"No space to unequip {slot}.")
+        except InventoryFullError:
+            inventory.add(item_id)
+            raise
+        inventory.add(old_id)
 
+    character_stats.set_modifier(character, slot, effects)
+    character[field] = item_id
 
-def unequip_weapon(character):
+    if game_events.listening("item_equipped"):
+        game_events.emit(game_events.EquipEvent("item_equipped", character, slot, item_id, old_id))
+
+
+def unequip_item(character, slot):
     """
-    Removes current weapon and returns it to inventory.
+    Put the item in an equipment slot back into the inventory.
+    Returns its id, or None if the slot was empty.
     """
-    if "equipped_weapon" not in character or character["equipped_weapon"] is None:
+    field = EQUIPMENT_SLOTS[slot]
+    item_id = character.get(field)
+    if item_id is None:
         return None
 
-    if get_inventory_space_remaining(character) <= 0:
-        raise InventoryFullError("No space in inventory.")
+    check_space(character, item_id, 1, "No space in inventory.")
 
-    weapon = character["equipped_weapon"]
-    stat, val = parse_item_effect(weapon["effect"])
-    apply_stat_effect(character, stat, -val)
+    character_stats.remove_modifier(character, slot)
+    character[field] = None
+    get_inventory(character).add(item_id)
 
-    character["equipped_weapon"] = None
-    character["inventory"].append(weapon["item_id"])
+    if game_events.listening("item_unequipped"):
+        game_events.emit(game_events.EquipEvent("item_unequipped", character, slot, item_id, None))
+    return item_id
 
-    return weapon["item_id"]
+
+def unequip_weapon(character):
+    """
+    Removes current weapon and returns it to inventory.
+    """
+    return unequip_item(character, "weapon")
 
 
 def unequip_armor(character):
     """
     Removes current armor and returns it to inventory.
     """
-    if "equipped_armor" not in character or character["equipped_armor"] is None:
-        return None
-
-    if get_inventory_space_remaining(character) <= 0:
-        raise InventoryFullError("No space in inventory.")
-
-    armor = character["equipped_armor"]
-    stat, val = parse_item_effect(armor["effect"])
-    apply_stat_effect(character, stat, -val)
-
-    character["equipped_armor"] = None
-    character["inventory"].append(armor["item_id"])
-
-    return armor["item_id"]
+    return unequip_item(character, "armor")
 
 # ============================================================================
 # SHOP SYSTEM
 # ============================================================================
 
-def purchase_item(character, item_id, item_data):
+def purchase_item(character, item_id, item_data, quantity=1):
     """
-    Buy item → subtract gold, add item to inventory.
+    Buy `quantity` of an item → subtract gold, add items to inventory.
     Raises:
         InsufficientResourcesError
         InventoryFullError
+        ValueError for a quantity below 1
     """
-    cost = item_data["cost"]
+    check_quantity(item_id, quantity)
+    cost = item_data["cost"] * quantity
 
     if character["gold"] < cost:
         raise InsufficientResourcesError("Not enough gold to buy item.")
 
-    if get_inventory_space_remaining(character) <= 0:
-        raise InventoryFullError("Inventory full.")
+    check_space(character, item_id, quantity, item_data=item_data)
 
     character["gold"] -= cost
-    character["inventory"].append(item_id)
+    get_inventory(character).add(item_id, quantity, item_data)
+    notify("item_purchased", character, item_id, quantity, -cost)
     return True
 
 
-def sell_item(character, item_id, item_data):
+def sell_item(character, item_id, item_data, quantity=1):
     """
-    Sell item for half its cost.
+    Sell `quantity` of an item for half its cost each.
+    Returns the gold received.
     Raises:
         ItemNotFoundError
+        ValueError for a quantity below 1
     """
-    if not has_item(character, item_id):
+    check_quantity(item_id, quantity)
+    if count_item(character, item_id) < quantity:
         raise ItemNotFoundError("Item not found in inventory.")
 
-    sell_price = item_data["cost"] // 2
+    sell_price = item_data["cost"] // 2 * quantity
 
-    character["inventory"].remove(item_id)
+    get_inventory(character).remove(item_id, quantity)
     character["gold"] += sell_price
+    notify("item_sold", character, item_id, -quantity, sell_price)
 
     return sell_price
 
+def normalize_cart(cart):
+    """
+    Turn a cart ({item_id: quantity} or a list of (item_id, quantity) pairs)
+    into one {item_id: quantity} dict, merging repeated ids.
+    Raises ValueError for a quantity below 1.
+    """
+    pairs = cart.items() if isinstance(cart, dict) else cart
+    order = {}
+    for item_id, quantity in pairs:
+        check_quantity(item_id, quantity)
+        order[item_id] = order.get(item_id, 0) + quantity
+    return order
+
+
+def purchase_items(character, cart, item_data_dict):
+    """
+    Buy every item in the cart as one transaction.
+    Total cost and inventory space are checked once up front; if anything
+    fails, gold and inventory are left exactly as they were.
+    Returns the total gold spent.
+    Raises:
+        ItemNotFoundError (item not in the catalog)
+        InsufficientResourcesError
+        InventoryFullError
+    """
+    order = normalize_cart(cart)
+    inventory = get_inventory(character)
+
+    total_cost = 0
+    slots_needed = 0
+    for item_id, quantity in order.items():
+        item_data = item_data_dict.get(item_id)
+        if item_data is None:
+            raise ItemNotFoundError(f"Unknown item: {item_id}")
+        total_cost += item_data["cost"] * quantity
+        slots_needed += inventory.slots_needed(item_id, quantity, item_data)
+
+    if character["gold"] < total_cost:
+        raise InsufficientResourcesError("Not enough gold for this order.")
+    if inventory.slots_used + slots_needed > get_inventory_capacity(character):
+        raise InventoryFullError("Not enough inventory space for this order.")
+
+    added = []
+    try:
+        for item_id, quantity in order.items():
+            inventory.add(item_id, quantity, item_data_dict[item_id])
+            added.append((item_id, quantity))
+        character["gold"] -= total_cost
+    except Exception:
+        for item_id, quantity in reversed(added):
+            inventory.remove(item_id, quantity)
+        raise
+
+    if game_events.listening("item_purchased"):
+        for item_id, quantity in order.items():
+            notify("item_purchased", character, item_id, quantity, -item_data_dict[item_id]["cost"] * quantity)
+    return total_cost
+
+
+def sell_items(character, cart, item_data_dict):
+    """
+    Sell every item in the cart as one transaction, each for half its cost.
+    Nothing is sold unless every item is held in the requested quantity.
+    Returns the total gold received.
+    Raises:
+        ItemNotFoundError
+    """
+    order = normalize_cart(cart)
+    inventory = get_inventory(character)
+
+    total_price = 0
+    for item_id, quantity in order.items():
+        item_data = item_data_dict.get(item_id)
+        if item_data is None:
+            raise ItemNotFoundError(f"Unknown item: {item_id}")
+        if inventory.count(item_id) < quantity:
+            raise ItemNotFoundError(f"Not enough {item_id} to sell.")
+        total_price += item_data["cost"] // 2 * quantity
+
+    removed = []
+    try:
+        for item_id, quantity in order.items():
+            inventory.remove(item_id, quantity)
+            removed.append((item_id, quantity))
+        character["gold"] += total_price
+    except Exception:
+        for item_id, quantity in reversed(removed):
+            inventory.add(item_id, quantity, item_data_dict[item_id])
+        raise
+
+    if game_events.listening("item_sold"):
+        for item_id, quantity in order.items():
+            notify("item_sold", character, item_id, -quantity, item_data_dict[item_id]["cost"] // 2 * quantity)
+    return total_price
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -260,6 +676,30 @@ def parse_item_effect(effect_string):
         raise InvalidItemTypeError("Invalid effect format: " + effect_string)
 
 
+def get_item_effects(item_data):
+    """
+    Parsed (stat, value) pairs of an item. Catalog items are parsed at
+    load time; anything else is parsed on first use and cached on the dict.
+    """
+    effects = item_data.get("effects")
+    if effects is None:
+        try:
+            effects = game_data.parse_effect_string(item_data["effect"])
+        except InvalidDataFormatError:
+            raise InvalidItemTypeError("Invalid effect format: " + item_data["effect"])
+        item_data["effects"] = effects
+    return effects
+
+
+def apply_item_effects(character, effects, sign=1):
+    """
+    Apply every (stat, value) pair; sign=-1 removes them again.
+    """
+    for stat_name, value in effects:
+        apply_stat_effect(character, stat_name, sign * value)
+    return True
+
+
 def apply_stat_effect(character, stat_name, value):
     """
     Modify character stat.
@@ -268,8 +708,11 @@ def apply_stat_effect(character, stat_name, value):
     if stat_name not in ["health", "max_health", "strength", "magic"]:
         raise InvalidItemTypeError(f"Invalid stat: {stat_name}")
 
-    # Apply effect
-    character[stat_name] += value
+    # Apply effect (permanent changes go to the base stat)
+    if stat_name in character_stats.MODIFIABLE_STATS:
+        character_stats.modify_base_stat(character, stat_name, value)
+    else:
+        character[stat_name] += value
 
     # Clamp health
     if stat_name == "health":
@@ -283,18 +726,22 @@ def display_inventory(character, item_data_dict):
     """
     Show inventory grouped by item type & count.
     """
-    print("\n=== INVENTORY ===")
-    if not character["inventory"]:
-        print("Inventory empty.")
-        return
+    print("\n".join(inventory_lines(character, item_data_dict)))
+
 
-    counts = {}
-    for item_id in character["inventory"]:
-        counts[item_id] = counts.get(item_id, 0) + 1
+def inventory_lines(character, item_data_dict):
+    lines = ["\n=== INVENTORY ==="]
+    inventory = get_inventory(character)
+    if not inventory:
+        lines.append("Inventory empty.")
+        return lines
 
-    for item_id, qty in counts.items():
+    for item_id in inventory.layout:
+        if item_id is None:
+            continue
         item = item_data_dict.get(item_id, {"name": "Unknown"})
-        print(f"{item['name']} (ID: {item_id}) x{qty}")
+        lines.append(f"{item['name']} (ID: {item_id}) x{inventory.counts[item_id]}")
+    return lines
 
 # ============================================================================
 # SELF-TEST
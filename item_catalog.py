@@ -0,0 +1,98 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Item Catalog Module
+
+Secondary indexes over the item data used by the shop.
+
+Every index is a pair of parallel lists sorted by (cost, item_id): one of
+costs, one of ids. A listing picks the index for its filters (all items,
+a type, a stat, or type + stat), finds the cost range with bisect and
+slices out the requested page, so a query costs O(log n + page size)
+however large the catalog is.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+import game_data
+from custom_exceptions import InvalidDataFormatError
+
+CatalogPage = namedtuple("CatalogPage", "item_ids page pages total")
+
+DEFAULT_PAGE_SIZE = 10
+
+
+class ItemCatalog:
+    """
+    Read-only view of an item dictionary with indexes by type, by affected
+    stat, by type + stat, and by cost within each of those.
+    """
+
+    def __init__(self, items, page_size=DEFAULT_PAGE_SIZE):
+        self.items = items
+        self.page_size = page_size
+        self.indexes = {}
+
+        entries = sorted((data["cost"], item_id) for item_id, data in items.items())
+        for cost, item_id in entries:
+            item_type = items[item_id].get("type")
+            keys = [(None, None), (item_type, None)]
+            for stat in item_stats(items[item_id]):
+                keys.append((None, stat))
+                keys.append((item_type, stat))
+
+            for key in keys:
+                costs, ids = self.indexes.setdefault(key, ([], []))
+                if ids and ids[-1] == item_id:
+                    continue    # an effect naming the same stat twice
+                costs.append(cost)
+                ids.append(item_id)
+
+    def __len__(self):
+        return len(self.items)
+
+    def types(self):
+        return sorted(key[0] for key in self.indexes if key[0] is not None and key[1] is None)
+
+    def stats(self):
+        return sorted(key[1] for key in self.indexes if key[0] is None and key[1] is not None)
+
+    def cost_range(self, item_type=None, stat=None, min_cost=None, max_cost=None):
+        """
+        Returns (ids, start, end): the index list and the slice of it whose
+        costs fall within [min_cost, max_cost].
+        """
+        costs, ids = self.indexes.get((item_type, stat), ([], []))
+        start = 0 if min_cost is None else bisect_left(costs, min_cost)
+        end = len(costs) if max_cost is None else bisect_right(costs, max_cost)
+        return ids, start, max(start, end)
+
+    def count(self, item_type=None, stat=None, min_cost=None, max_cost=None):
+        _, start, end = self.cost_range(item_type, stat, min_cost, max_cost)
+        return end - start
+
+    def query(self, item_type=None, stat=None, min_cost=None, max_cost=None, page=1, page_size=None):
+        """
+        One page of matching item ids, cheapest first.
+        Pages are numbered from 1; a page past the end comes back empty.
+        """
+        page_size = page_size or self.page_size
+        ids, start, end = self.cost_range(item_type, stat, min_cost, max_cost)
+        total = end - start
+        pages = max(1, -(-total // page_size))
+
+        first = start + (max(page, 1) - 1) * page_size
+        last = min(end, first + page_size)
+        return CatalogPage(ids[first:last], page, pages, total)
+
+
+def item_stats(item_data):
+    """
+    Stats an item's effect touches (parsed effects are reused when present).
+    """
+    effects = item_data.get("effects")
+    if effects is None:
+        try:
+            effects = game_data.parse_effect_string(item_data.get("effect", ""))
+        except InvalidDataFormatError:
+            return []
+    return [stat for stat, _ in effects]
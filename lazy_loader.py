@@ -0,0 +1,111 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Lazy Loader Module
+
+Defers work that startup does not need: subsystem imports, optional
+dependencies such as NumPy, and catalog parsing. Everything done through
+this module is timed, so `python main.py --profile-startup` can show
+where startup time goes.
+
+    game_session = lazy_loader.lazy_import("game_session")   # nothing imported yet
+    game_session.load_world()                                # imported (and timed) here
+
+    with lazy_loader.timed("load quests"):
+        quests = game_data.load_quests()
+"""
+
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+
+# label → [seconds, detail], in the order things happened
+TIMINGS = {}
+
+# ============================================================================
+# TIMING
+# ============================================================================
+
+@contextmanager
+def timed(label, detail=""):
+    """
+    Add the time spent in the block to TIMINGS[label].
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry = TIMINGS.setdefault(label, [0.0, detail])
+        entry[0] += time.perf_counter() - start
+
+
+def timing_report(total=None):
+    """
+    Lines for every timed step, slowest first, in milliseconds.
+    Steps can nest (an import inside a load), so they need not add up to the total.
+    """
+    lines = ["\n=== STARTUP PROFILE ==="]
+    for label, (seconds, detail) in sorted(TIMINGS.items(), key=lambda item: -item[1][0]):
+        line = f"{seconds * 1000:9.2f} ms  {label}"
+        lines.append(f"{line}  ({detail})" if detail else line)
+    if total is not None:
+        lines.append(f"{total * 1000:9.2f} ms  total")
+    return lines
+
+# ============================================================================
+# LAZY IMPORTS
+# ============================================================================
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+    """
+
+    def __init__(self, name):
+        self.__dict__["name"] = name
+        self.__dict__["module"] = None
+
+    def load(self):
+        module = self.__dict__["module"]
+        if module is None:
+            module = import_timed(self.__dict__["name"])
+            self.__dict__["module"] = module
+        return module
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+    def __setattr__(self, attribute, value):
+        setattr(self.load(), attribute, value)
+
+
+def lazy_import(name):
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def import_timed(name):
+    """
+    Import a module, recording how long it took and how many modules it pulled in.
+    """
+    before = len(sys.modules)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    seconds = time.perf_counter() - start
+    TIMINGS[f"import {name}"] = [seconds, f"{len(sys.modules) - before} modules"]
+    return module
+
+
+OPTIONAL_MODULES = {}
+
+
+def optional_import(name):
+    """
+    An optional dependency, imported on first use; None if it is not installed.
+    """
+    if name not in OPTIONAL_MODULES:
+        try:
+            OPTIONAL_MODULES[name] = import_timed(name)
+        except ImportError:
+            OPTIONAL_MODULES[name] = None
+    return OPTIONAL_MODULES[name]
@@ -0,0 +1,179 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Loot System Module
+
+Weighted item drops per enemy type, loaded from data/loot_tables.txt.
+
+Each table is turned into an alias table (Vose's method) once, so a draw
+is one random index plus one coin flip, O(1) however many drops the
+table has. roll_loot_batch draws for many kills at once; with NumPy
+installed the draws are vectorized, otherwise a plain loop is used.
+"""
+
+import random
+import game_data
+import inventory_system
+import lazy_loader
+from custom_exceptions import InvalidTargetError
+
+# ============================================================================
+# ALIAS SAMPLER
+# ============================================================================
+
+class AliasTable:
+    """
+    O(1) sampling of outcome indexes 0..n-1 with the given weights.
+    """
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+
+        self.size = n
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            lo = small.pop()
+            hi = large.pop()
+            self.prob[lo] = scaled[lo]
+            self.alias[lo] = hi
+            scaled[hi] -= 1.0 - scaled[lo]
+            if scaled[hi] < 1.0:
+                small.append(hi)
+            else:
+                large.append(hi)
+        # Leftovers are 1.0 up to rounding error
+
+        self.np_prob = None
+        self.np_alias = None
+
+    def sample(self, rng=random):
+        i = int(rng.random() * self.size)
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def sample_counts(self, draws, seed=None):
+        """
+        How many times each outcome came up in `draws` samples.
+        NumPy is imported on first use; without it this is a plain loop.
+        """
+        np = lazy_loader.optional_import("numpy")
+        if np is None:
+            rng = random.Random(seed)
+            counts = [0] * self.size
+            for _ in range(draws):
+                counts[self.sample(rng)] += 1
+            return counts
+
+        if self.np_prob is None:
+            self.np_prob = np.array(self.prob)
+            self.np_alias = np.array(self.alias)
+        rng = np.random.default_rng(seed)
+        picks = rng.integers(0, self.size, draws)
+        keep = rng.random(draws) < self.np_prob[picks]
+        outcomes = np.where(keep, picks, self.np_alias[picks])
+        return np.bincount(outcomes, minlength=self.size).tolist()
+
+# ============================================================================
+# LOOT TABLES
+# ============================================================================
+
+class LootTable:
+    """
+    Drops for one enemy type: `rolls` independent draws per kill.
+    """
+
+    def __init__(self, enemy, drops, rolls=1):
+        self.enemy = enemy
+        self.rolls = rolls
+        self.drops = list(drops)
+        self.sampler = AliasTable([weight for _, weight, _ in self.drops])
+
+    def roll(self, rng=random):
+        """
+        Loot from one kill → {item_id: quantity}
+        """
+        loot = {}
+        for _ in range(self.rolls):
+            item_id, _, quantity = self.drops[self.sampler.sample(rng)]
+            if item_id is not None:
+                loot[item_id] = loot.get(item_id, 0) + quantity
+        return loot
+
+    def roll_batch(self, kills, seed=None):
+        """
+        Combined loot from `kills` kills → {item_id: quantity}
+        """
+        counts = self.sampler.sample_counts(kills * self.rolls, seed)
+        loot = {}
+        for (item_id, _, quantity), hits in zip(self.drops, counts):
+            if item_id is not None and hits:
+                loot[item_id] = loot.get(item_id, 0) + hits * quantity
+        return loot
+
+
+def build_loot_tables(raw_tables):
+    """
+    {enemy_type: table dict from game_data.load_loot_tables} → {enemy_type: LootTable}
+    """
+    return {
+        enemy: LootTable(enemy, table["drops"], table.get("rolls", 1))
+        for enemy, table in raw_tables.items()
+    }
+
+
+def load_loot_tables(filename="data/loot_tables.txt"):
+    return build_loot_tables(game_data.load_loot_tables(filename))
+
+
+def get_loot_table(enemy_type, loot_tables):
+    """
+    Raises InvalidTargetError for enemies without a loot table.
+    """
+    table = loot_tables.get(enemy_type)
+    if table is None:
+        raise InvalidTargetError(f"No loot table for enemy: {enemy_type}")
+    return table
+
+
+def roll_loot(enemy_type, loot_tables, rng=random):
+    return get_loot_table(enemy_type, loot_tables).roll(rng)
+
+
+def roll_loot_batch(enemy_type, kills, loot_tables, seed=None):
+    return get_loot_table(enemy_type, loot_tables).roll_batch(kills, seed)
+
+# ============================================================================
+# AWARDING LOOT
+# ============================================================================
+
+def award_loot(character, loot, item_data_dict=None):
+    """
+    Put dropped items into the character's inventory.
+    Whatever does not fit is left behind.
+    Returns (awarded, left_behind), both {item_id: quantity}.
+    """
+    item_data_dict = item_data_dict or {}
+    awarded = {}
+    left_behind = {}
+
+    for item_id, quantity in loot.items():
+        item_data = item_data_dict.get(item_id)
+
+        # Fill the current partial stack plus as many free slots as remain
+        held = inventory_system.count_item(character, item_id)
+        free = inventory_system.get_inventory_space_remaining(character)
+        stack = inventory_system.get_inventory(character).stack_size(item_id, item_data)
+        room = (inventory_system.slots_for(held, stack) + free) * stack - held
+        fits = max(0, min(quantity, room))
+
+        if fits:
+            inventory_system.add_item_to_inventory(character, item_id, fits, item_data)
+            awarded[item_id] = fits
+        if fits < quantity:
+            left_behind[item_id] = quantity - fits
+
+    return awarded, left_behind
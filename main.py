@@ -9,21 +9,51 @@ Game loop design, menu structures, and integration logic were generated with
 ChatGPT assistance. All code was reviewed, understood, and finalized by me.
 """
 
-import character_manager
-import inventory_system
-import quest_handler
-import combat_system
-import game_data
+import sys
+import time
+import lazy_loader
+import game_input
 from custom_exceptions import *
 
+# Subsystems are imported on first use, so the menu comes up at once
+character_manager = lazy_loader.lazy_import("character_manager")
+combat_system = lazy_loader.lazy_import("combat_system")
+game_data = lazy_loader.lazy_import("game_data")
+game_session = lazy_loader.lazy_import("game_session")
+session_replay = lazy_loader.lazy_import("session_replay")
+
 # ============================================================================
 # GAME STATE
 # ============================================================================
+#
+# The terminal is a thin adapter over game_session: it prompts, runs the
+# command on the session and prints whatever the session reports.
+
+world = None
+session = None
+player_input = game_input.ConsoleInput()
+recorder = None     # session_replay.SessionRecorder with --record FILE
+
+
+def show(lines):
+    for line in lines:
+        print(line)
+
+
+def run(name, argument=""):
+    show(session.run_command(name, argument))
+
 
-current_character = None
-all_quests = {}
-all_items = {}
-game_running = False
+def ask(prompt):
+    return player_input.read(prompt).strip()
+
+
+def choose(prompt, choices):
+    """
+    Menu choice as an int, or None after too many invalid answers.
+    """
+    choice = game_input.read_choice(player_input, prompt, choices)
+    return None if choice is None else int(choice)
 
 # ============================================================================
 # MAIN MENU
@@ -32,29 +62,22 @@ game_running = False
 def main_menu():
     """
     Display main menu and validate choice.
+    Returns None after too many invalid answers (main shows it again).
     """
     print("\n=== MAIN MENU ===")
     print("1. New Game")
     print("2. Load Game")
     print("3. Exit")
 
-    choice = input("Choose an option: ").strip()
-
-    if choice in ["1", "2", "3"]:
-        return int(choice)
-    else:
-        print("Invalid choice. Try again.")
-        return main_menu()
+    return choose("Choose an option: ", ["1", "2", "3"])
 
 # ============================================================================
 # NEW GAME
 # ============================================================================
 
 def new_game():
-    global current_character
-
     print("\n=== NEW GAME ===")
-    name = input("Enter character name: ").strip()
+    name = ask("Enter character name: ")
 
     print("\nChoose a class:")
     print("1. Warrior")
@@ -62,31 +85,24 @@ def new_game():
     print("3. Rogue")
     print("4. Cleric")
 
-    class_choice = input("Choose class (1-4): ").strip()
     class_map = {"1": "Warrior", "2": "Mage", "3": "Rogue", "4": "Cleric"}
+    class_choice = game_input.read_choice(player_input, "Choose class (1-4): ", class_map)
 
-    if class_choice not in class_map:
+    if class_choice is None:
         print("Invalid class choice. Returning to main menu...")
         return
 
-    char_class = class_map[class_choice]
-
-    try:
-        current_character = character_manager.create_character(name, char_class)
-        character_manager.save_character(current_character)
-        print(f"\nCreated {name} the {char_class}!")
+    if not start_session():
+        return
+    run("new", f"{class_map[class_choice]} {name}")
+    if session.character is not None:
         game_loop()
-    except InvalidCharacterClassError:
-        print("Invalid class name. Try again.")
-        new_game()
 
 # ============================================================================
 # LOAD GAME
 # ============================================================================
 
 def load_game():
-    global current_character
-
     print("\n=== LOAD GAME ===")
     saved = character_manager.list_saved_characters()
 
@@ -98,40 +114,44 @@ def load_game():
     for i, name in enumerate(saved, 1):
         print(f"{i}. {name}")
 
-    choice = input("Select a character by number: ").strip()
+    choice = ask("Select a character by number: ")
 
     if not choice.isdigit() or int(choice) not in range(1, len(saved) + 1):
         print("Invalid selection.")
         return
 
-    selected = saved[int(choice) - 1]
-
-    try:
-        current_character = character_manager.load_character(selected)
-        print(f"Loaded character: {selected}")
+    if not start_session():
+        return
+    run("load", saved[int(choice) - 1])
+    if session.character is not None:
         game_loop()
-    except CharacterNotFoundError:
-        print("Character not found.")
-    except SaveFileCorruptedError:
-        print("Save file corrupted.")
-    except InvalidSaveDataError:
-        print("Invalid save data.")
+
+
+def start_session():
+    """
+    New session on the shared world. Returns False if the game data is unusable.
+    """
+    global session
+    if not setup_world():
+        return False
+    session = game_session.GameSession(world, battle_input=read_battle_action, echo_battles=True)
+    if recorder is not None:
+        recorder.attach(session)
+    return True
 
 # ============================================================================
 # GAME LOOP
 # ============================================================================
 
 def game_loop():
-    global game_running, current_character
-
     print("\n=== ENTERING GAME WORLD ===")
-    game_running = True
 
-    while game_running:
+    while session.running:
+        show(session.tick())
         choice = game_menu()
 
         if choice == 1:
-            view_character_stats()
+            run("stats")
         elif choice == 2:
             view_inventory()
         elif choice == 3:
@@ -143,13 +163,17 @@ def game_loop():
         elif choice == 6:
             save_game()
             print("Game saved. Goodbye!")
-            game_running = False
+            run("quit")
 
 # ============================================================================
 # GAME MENU
 # ============================================================================
 
 def game_menu():
+    """
+    Menu choice, or None after too many invalid answers (the game loop
+    shows the menu again; only the end of input quits without asking).
+    """
     print("\n=== GAME MENU ===")
     print("1. View Character Stats")
     print("2. Inventory")
@@ -158,33 +182,17 @@ def game_menu():
     print("5. Shop")
     print("6. Save & Quit")
 
-    choice = input("Choose an option: ").strip()
-
-    if choice in ["1", "2", "3", "4", "5", "6"]:
-        return int(choice)
-    else:
-        print("Invalid choice. Try again.")
-        return game_menu()
+    return choose("Choose an option: ", ["1", "2", "3", "4", "5", "6"])
 
 # ============================================================================
 # ACTIONS
 # ============================================================================
 
-def view_character_stats():
-    print("\n=== CHARACTER STATS ===")
-    for key in ["name", "class", "level", "health", "max_health", "strength", "magic", "experience", "gold"]:
-        print(f"{key.capitalize()}: {current_character[key]}")
-
-    quest_handler.display_character_quest_progress(current_character, all_quests)
-
-
 def view_inventory():
-    global current_character, all_items
-
     print("\n=== INVENTORY MENU ===")
-    inventory_system.display_inventory(current_character, all_items)
+    run("inventory")
 
-    if not current_character["inventory"]:
+    if not session.character["inventory"]:
         return
 
     print("\nOptions:")
@@ -192,37 +200,40 @@ def view_inventory():
     print("2. Equip Weapon")
     print("3. Equip Armor")
     print("4. Drop Item")
-    print("5. Back")
+    print("5. Sort Items")
+    print("6. Back")
 
-    choice = input("Choose an option: ").strip()
-    if choice == "5":
+    choice = ask("Choose an option: ")
+    if choice == "6":
         return
 
-    item_id = input("Enter item ID: ").strip()
-    if item_id not in all_items:
-        print("Invalid item ID.")
+    if choice == "5":
+        run("sort", ask("Sort by (type/cost/name): "))
         return
 
-    try:
-        if choice == "1":
-            print(inventory_system.use_item(current_character, item_id, all_items[item_id]))
-        elif choice == "2":
-            print(inventory_system.equip_weapon(current_character, item_id, all_items[item_id]))
-        elif choice == "3":
-            print(inventory_system.equip_armor(current_character, item_id, all_items[item_id]))
-        elif choice == "4":
-            inventory_system.remove_item_from_inventory(current_character, item_id)
-            print("Item removed.")
-    except Exception as e:
-        print("Error:", e)
+    item_id = ask("Enter item ID: ")
+    if choice == "1":
+        run("use", item_id)
+    elif choice == "2":
+        run("equip", f"{item_id} weapon")
+    elif choice == "3":
+        run("equip", f"{item_id} armor")
+    elif choice == "4":
+        run("drop", item_id)
 
 # ============================================================================
 # QUEST MENU
 # ============================================================================
 
-def quest_menu():
-    global current_character, all_quests
+QUEST_COMMANDS = {
+    "4": ("accept", "Enter quest ID to accept: "),
+    "5": ("abandon", "Enter quest ID to abandon: "),
+    "6": ("complete", "Enter quest ID to complete: "),
+    "7": ("plan", "Enter target quest ID: "),
+}
+
 
+def quest_menu():
     print("\n=== QUEST MENU ===")
     print("1. View Active Quests")
     print("2. View Available Quests")
@@ -230,170 +241,147 @@ def quest_menu():
     print("4. Accept Quest")
     print("5. Abandon Quest")
     print("6. Complete Quest (Testing)")
-    print("7. Back")
+    print("7. Plan Route to Quest")
+    print("8. Back")
 
-    choice = input("Choose an option: ").strip()
+    choice = ask("Choose an option: ")
 
     if choice == "1":
-        active = quest_handler.get_active_quests(current_character, all_quests)
-        quest_handler.display_quest_list(active)
-
+        run("quests", "active")
     elif choice == "2":
-        available = quest_handler.get_available_quests(current_character, all_quests)
-        quest_handler.display_quest_list(available)
-
+        run("quests", "available")
     elif choice == "3":
-        completed = quest_handler.get_completed_quests(current_character, all_quests)
-        quest_handler.display_quest_list(completed)
-
-    elif choice == "4":
-        qid = input("Enter quest ID to accept: ").strip()
-        try:
-            quest_handler.accept_quest(current_character, qid, all_quests)
-            print("Quest accepted!")
-        except QuestError as e:
-            print("Error:", e)
-
-    elif choice == "5":
-        qid = input("Enter quest ID to abandon: ").strip()
-        try:
-            quest_handler.abandon_quest(current_character, qid)
-            print("Quest abandoned.")
-        except QuestError as e:
-            print("Error:", e)
-
-    elif choice == "6":
-        qid = input("Enter quest ID to complete: ").strip()
-        try:
-            rewards = quest_handler.complete_quest(current_character, qid, all_quests)
-            print(f"Quest completed! Rewards: {rewards}")
-        except QuestError as e:
-            print("Error:", e)
-
-    elif choice == "7":
-        return
+        run("quests", "completed")
+    elif choice in QUEST_COMMANDS:
+        command, prompt = QUEST_COMMANDS[choice]
+        run(command, ask(prompt))
 
 # ============================================================================
 # EXPLORATION (FIND BATTLES)
 # ============================================================================
 
 def explore():
-    global current_character
-
-    print("\n=== EXPLORING ===")
-
-    try:
-        enemy = combat_system.get_random_enemy_for_level(current_character["level"])
-        print(f"You encounter a {enemy['name']}!")
-
-        battle = combat_system.SimpleBattle(current_character, enemy)
-        result = battle.start_battle()
-
-        if result["winner"] == "player":
-            print(f"You won! +{result['xp_gained']} XP, +{result['gold_gained']} gold")
-            character_manager.gain_experience(current_character, result["xp_gained"])
-            character_manager.add_gold(current_character, result["gold_gained"])
+    run("explore")
+    if session.is_dead():
+        handle_character_death()
 
-        else:
-            print("You were defeated...")
-            handle_character_death()
 
-    except CharacterDeadError:
-        print("You cannot fight while dead.")
-        handle_character_death()
+def read_battle_action(battle):
+    show(session.take_output())
+    combat_system.display_combat_stats(battle.character, battle.enemy)
+    return combat_system.read_player_action(player_input.read)
 
 # ============================================================================
 # SHOP
 # ============================================================================
 
 def shop():
-    global current_character, all_items
+    run("shop", "filter")
 
-    print("\n=== SHOP ===")
-    print(f"Your gold: {current_character['gold']}")
-
-    print("\nItems for sale:")
-    for item_id, data in all_items.items():
-        print(f"{item_id}: {data['name']} (Cost: {data['cost']})")
-
-    print("\nOptions:")
-    print("1. Buy Item")
-    print("2. Sell Item")
-    print("3. Back")
-
-    choice = input("Choose an option: ").strip()
-
-    if choice == "1":
-        item_id = input("Enter item ID to buy: ").strip()
-        if item_id in all_items:
-            try:
-                inventory_system.purchase_item(current_character, item_id, all_items[item_id])
-                print("Purchase successful!")
-            except Exception as e:
-                print("Error:", e)
+    while True:
+        print("\nOptions:")
+        print("1. Buy Items")
+        print("2. Sell Items")
+        print("3. Next Page")
+        print("4. Previous Page")
+        print("5. Filter Items")
+        print("6. Back")
+
+        choice = ask("Choose an option: ")
+
+        if choice == "3":
+            run("shop", "next")
+        elif choice == "4":
+            run("shop", "prev")
+        elif choice == "5":
+            run("shop", "filter " + read_shop_filters())
+        elif choice == "1":
+            run("buy", ask("Enter items to buy (e.g. health_potion x3, iron_sword): "))
+            return
+        elif choice == "2":
+            run("sell", ask("Enter items to sell (e.g. health_potion x3, iron_sword): "))
+            return
         else:
-            print("Invalid item.")
+            return
 
-    elif choice == "2":
-        item_id = input("Enter item ID to sell: ").strip()
-        if item_id in all_items:
-            try:
-                gold = inventory_system.sell_item(current_character, item_id, all_items[item_id])
-                print(f"Item sold for {gold} gold.")
-            except Exception as e:
-                print("Error:", e)
-        else:
-            print("Invalid item.")
+
+def read_shop_filters():
+    """
+    Ask for type, stat and cost limits; blank means no filter.
+    Returns the filter text for the shop command.
+    """
+    catalog = world.shop_catalog
+    filters = []
+    item_type = ask(f"Type ({'/'.join(catalog.types())}, blank for any): ")
+    if item_type:
+        filters.append(f"type={item_type}")
+    stat = ask(f"Stat ({'/'.join(catalog.stats())}, blank for any): ")
+    if stat:
+        filters.append(f"stat={stat}")
+    for key, prompt in [("min", "Min cost"), ("max", "Max cost")]:
+        text = ask(f"{prompt} (blank for any): ")
+        if text.isdigit():
+            filters.append(f"{key}={text}")
+    return " ".join(filters)
 
 # ============================================================================
 # SAVE & LOAD HELPERS
 # ============================================================================
 
 def save_game():
-    global current_character
-    try:
-        character_manager.save_character(current_character)
-        print("Game saved successfully.")
-    except Exception as e:
-        print("Save error:", e)
+    run("save")
 
 def load_game_data():
-    global all_quests, all_items
+    """
+    Point the shared world at the data files, creating defaults for any
+    that are missing. Catalogs are parsed later, on first use.
+    Returns the world, or None if the data files cannot be set up.
+    """
+    global world
 
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        world = game_session.load_world()
     except MissingDataFileError:
         print("Missing data files. Creating defaults...")
         game_data.create_default_data_files()
-        load_game_data()
+        try:
+            world = game_session.load_world()
+        except MissingDataFileError as e:
+            print("Could not create data files:", e)
+            world = None
+    return world
+
+
+def setup_world():
+    """
+    Load the world and parse its catalogs the first time a game starts.
+    Returns False if the data files are missing or invalid.
+    """
+    if world is None and load_game_data() is None:
+        return False
+    try:
+        world.load()
     except InvalidDataFormatError as e:
         print("Invalid data file format:", e)
-        return
+        return False
+    world.attach()
+    return True
 
 # ============================================================================
 # CHARACTER DEATH
 # ============================================================================
 
 def handle_character_death():
-    global current_character, game_running
-
     print("\n=== YOU DIED ===")
     print("1. Revive (Costs 20 gold)")
     print("2. Quit Game")
 
-    choice = input("Choose an option: ").strip()
+    choice = ask("Choose an option: ")
 
     if choice == "1":
-        if current_character["gold"] < 20:
-            print("Not enough gold. You cannot revive.")
-            game_running = False
-        else:
-            current_character["gold"] -= 20
-            character_manager.revive_character(current_character)
-            print("You have been revived!")
+        run("revive")
     else:
-        game_running = False
+        run("quit")
 
 # ============================================================================
 # WELCOME SCREEN
@@ -409,23 +397,69 @@ def display_welcome():
 # MAIN EXECUTION
 # ============================================================================
 
-def main():
+def main(argv=None):
+    """
+    Options:
+        --profile-startup   print where startup time goes, then exit
+        --record FILE       record the session for session_replay.py
+    """
+    global recorder
+
+    argv = sys.argv[1:] if argv is None else argv
+    if "--profile-startup" in argv:
+        profile_startup()
+        return
+    if "--record" in argv:
+        position = argv.index("--record") + 1
+        if position == len(argv):
+            print("Usage: python main.py --record FILE")
+            return
+        recorder = session_replay.SessionRecorder(argv[position])
+
     display_welcome()
-    load_game_data()
 
-    while True:
-        choice = main_menu()
+    try:
+        while True:
+            choice = main_menu()
+
+            if choice == 1:
+                new_game()
+            elif choice == 2:
+                load_game()
+            elif choice == 3:
+                print("Goodbye, adventurer!")
+                break
+    except EOFError:
+        # Input ran out mid-game: keep the player's progress
+        if session is not None and session.running:
+            print()
+            save_game()
+            run("quit")
+        print("Goodbye, adventurer!")
+    finally:
+        if world is not None:
+            world.detach()
+        if recorder is not None:
+            recorder.close()
+            recorder = None
 
-        if choice == 1:
-            new_game()
-        elif choice == 2:
-            load_game()
-        elif choice == 3:
-            print("Goodbye, adventurer!")
-            break
+
+def profile_startup():
+    """
+    Time everything a first game needs (imports, data files, catalogs)
+    and print the breakdown instead of playing.
+    """
+    start = time.perf_counter()
+    with lazy_loader.timed("main menu ready"):
+        display_welcome()
+    with lazy_loader.timed("list saved characters"):
+        character_manager.list_saved_characters()
+    ready = setup_world()
+    total = time.perf_counter() - start
+    if ready:
+        world.detach()
+    show(lazy_loader.timing_report(total))
 
 
 if __name__ == "__main__":
     main()
-
-
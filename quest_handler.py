@@ -14,18 +14,26 @@ from custom_exceptions import (
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    QuestError
 )
 
+import time
 import character_manager  # for XP + gold handling
+import game_events
+import quest_objectives
+
+SECONDS_PER_DAY = 24 * 60 * 60
 
 # ============================================================================
 # QUEST MANAGEMENT
 # ============================================================================
 
-def accept_quest(character, quest_id, quest_data_dict):
+def accept_quest(character, quest_id, quest_data_dict, now=None):
     """
     Add quest to active quests if all requirements are met.
+    Repeatable quests can be accepted again once their reset time passes;
+    timed quests get a deadline (`now` defaults to the current time).
     Raises:
         QuestNotFoundError
         InsufficientLevelError
@@ -38,9 +46,14 @@ def accept_quest(character, quest_id, quest_data_dict):
 
     quest = quest_data_dict[quest_id]
 
-    # Already done?
+    now = time.time() if now is None else now
+
+    # Already done? (repeatable quests: until their reset)
     if quest_id in character["completed_quests"]:
-        raise QuestAlreadyCompletedError("Quest already completed.")
+        if not quest.get("repeat"):
+            raise QuestAlreadyCompletedError("Quest already completed.")
+        if is_on_cooldown(character, quest_id, now):
+            raise QuestAlreadyCompletedError(f"Quest resets {quest['repeat']}; come back later.")
 
     # Already active?
     if quest_id in character["active_quests"]:
@@ -57,14 +70,24 @@ def accept_quest(character, quest_id, quest_data_dict):
 
     # All good → accept quest
     character["active_quests"].append(quest_id)
+    character.get("quest_resets", {}).pop(quest_id, None)
+    if quest.get("time_limit"):
+        character.setdefault("quest_deadlines", {})[quest_id] = int(now) + quest["time_limit"] * 60
+    invalidate_quest_log(character)
+    notify("quest_accepted", character, quest_id)
+
+    # Objectives already met (e.g. "reach level 10") complete it right away
+    if quest_objectives.start_tracking(character, quest_id, quest):
+        complete_quest(character, quest_id, quest_data_dict, now)
     return True
 
 
 # ---------------------------------------------------------------------------
 
-def complete_quest(character, quest_id, quest_data_dict):
+def complete_quest(character, quest_id, quest_data_dict, now=None):
     """
     Complete quest → award XP & gold.
+    A timed quest past its deadline fails instead.
     Raises:
         QuestNotFoundError
         QuestNotActiveError
@@ -77,10 +100,341 @@ def complete_quest(character, quest_id, quest_data_dict):
         raise QuestNotActiveError("Quest is not active.")
 
     quest = quest_data_dict[quest_id]
+    now = time.time() if now is None else now
+
+    if is_expired(character, quest_id, now):
+        fail_quest(character, quest_id)
+        raise QuestNotActiveError("Quest time limit expired.")
 
     # Remove from active → move to completed
-    character["]()
+    character["active_quests"].remove(quest_id)
+    record_completion(character, quest_id, quest, now)
+    quest_objectives.stop_tracking(character, quest_id)
+    invalidate_quest_log(character)
+
+    rewards = {"xp": quest["reward_xp"], "gold": quest["reward_gold"]}
+    character_manager.gain_experience(character, rewards["xp"])
+    character_manager.add_gold(character, rewards["gold"], "quest")
+
+    notify("quest_completed", character, quest_id, rewards)
+    return rewards
+
+
+def abandon_quest(character, quest_id):
+    """
+    Drop an active quest (its objective progress is lost).
+    Raises QuestNotActiveError
+    """
+    if quest_id not in character["active_quests"]:
+        raise QuestNotActiveError("Quest is not active.")
+
+    character["active_quests"].remove(quest_id)
+    character.get("quest_deadlines", {}).pop(quest_id, None)
+    quest_objectives.stop_tracking(character, quest_id)
+    invalidate_quest_log(character)
+
+    notify("quest_abandoned", character, quest_id)
+    return True
+
+
+def fail_quest(character, quest_id):
+    """
+    A timed quest ran out of time: drop it like an abandoned quest.
+    Raises QuestNotActiveError
+    """
+    if quest_id not in character["active_quests"]:
+        raise QuestNotActiveError("Quest is not active.")
+
+    character["active_quests"].remove(quest_id)
+    character.get("quest_deadlines", {}).pop(quest_id, None)
+    quest_objectives.stop_tracking(character, quest_id)
+    invalidate_quest_log(character)
+
+    notify("quest_failed", character, quest_id)
+    return True
+
+
+def reset_quest(character, quest_id):
+    """
+    A repeatable quest's reset time came: it can be accepted again.
+    Returns False if it was not waiting for a reset.
+    """
+    if character.get("quest_resets", {}).pop(quest_id, None) is None:
+        return False
+
+    invalidate_quest_log(character)
+    notify("quest_reset", character, quest_id)
+    return True
+
+
+def notify(kind, character, quest_id, rewards=None):
+    if game_events.listening(kind):
+        game_events.emit(game_events.QuestEvent(kind, character, quest_id, rewards))
+
+# ============================================================================
+# REPEATABLE & TIMED QUESTS
+# ============================================================================
+
+def record_completion(character, quest_id, quest, now):
+    """
+    Mark quest completed; repeatable quests also get their reset time.
+    """
+    character.get("quest_deadlines", {}).pop(quest_id, None)
+    if quest_id not in character["completed_quests"]:
+        character["completed_quests"].append(quest_id)
+    if quest.get("repeat"):
+        character.setdefault("quest_resets", {})[quest_id] = next_reset_time(quest["repeat"], now)
+
+
+def next_reset_time(repeat, now):
+    """
+    Daily quests reset at the next midnight (UTC), weekly ones at the
+    next Monday midnight.
+    """
+    day = int(now // SECONDS_PER_DAY)
+    if repeat == "daily":
+        return (day + 1) * SECONDS_PER_DAY
+    weekday = (day + 3) % 7     # day 0 (1970-01-01) was a Thursday; Monday = 0
+    return (day + 7 - weekday) * SECONDS_PER_DAY
+
+
+def is_expired(character, quest_id, now):
+    deadline = character.get("quest_deadlines", {}).get(quest_id)
+    return deadline is not None and now >= deadline
+
+
+def is_on_cooldown(character, quest_id, now=None):
+    reset_at = character.get("quest_resets", {}).get(quest_id)
+    if reset_at is None:
+        return False
+    return (time.time() if now is None else now) < reset_at
+
+# ============================================================================
+# BULK SETTLEMENT
+# ============================================================================
+
+def settle_quest_batch(characters, quest_id, quest_data_dict,
+                       save_directory="data/save_games", save=True, now=None):
+    """
+    Complete the same quest for many characters at once (server events).
+    Characters without the quest active, or dead, are skipped, and a
+    character listed twice is settled once. Every character is checked
+    before any is changed. XP goes
+    through gain_experience_batch and every settled character is saved
+    in one save_characters batch.
+    Returns {"settled": [names], "rejected": {name: reason}}.
+    Raises QuestNotFoundError
+    """
+    if quest_id not in quest_data_dict:
+        raise QuestNotFoundError(f"Quest not found: {quest_id}")
+
+    quest = quest_data_dict[quest_id]
+    rewards = {"xp": quest["reward_xp"], "gold": quest["reward_gold"]}
+    now = time.time() if now is None else now
+
+    eligible = []
+    rejected = {}
+    seen = set()
+    for character in characters:
+        if id(character) in seen:
+            continue
+        seen.add(id(character))
+        if quest_id not in character["active_quests"]:
+            rejected[character["name"]] = "Quest is not active."
+        elif is_expired(character, quest_id, now):
+            rejected[character["name"]] = "Quest time limit expired."
+        elif character["health"] <= 0:
+            rejected[character["name"]] = "Character is dead."
+        else:
+            eligible.append(character)
+
+    for character in eligible:
+        character["active_quests"].remove(quest_id)
+        record_completion(character, quest_id, quest, now)
+        quest_objectives.stop_tracking(character, quest_id)
+        invalidate_quest_log(character)
+        character_manager.add_gold(character, rewards["gold"], "quest")
+
+    character_manager.gain_experience_batch(eligible, rewards["xp"])
+
+    if game_events.listening("quest_completed"):
+        for character in eligible:
+            notify("quest_completed", character, quest_id, rewards)
+
+    if save:
+        character_manager.save_characters(eligible, save_directory)
+
+    return {"settled": [c["name"] for c in eligible], "rejected": rejected}
+
+# ============================================================================
+# QUEST QUERIES
+# ============================================================================
+
+def get_active_quests(character, quest_data_dict):
+    return [quest_data_dict[q] for q in character["active_quests"] if q in quest_data_dict]
+
+
+def get_completed_quests(character, quest_data_dict):
+    return [quest_data_dict[q] for q in character["completed_quests"] if q in quest_data_dict]
+
+
+def get_available_quests(character, quest_data_dict, now=None):
+    """
+    Quests the character could accept at `now` (default: right now).
+    """
+    return [quest for quest_id, quest in quest_data_dict.items()
+            if can_accept_quest(character, quest_id, quest_data_dict, now)]
+
+
+def can_accept_quest(character, quest_id, quest_data_dict, now=None):
+    quest = quest_data_dict[quest_id]
+    prereq = quest["prerequisite"]
+    if quest_id in character["completed_quests"]:
+        if not quest.get("repeat") or is_on_cooldown(character, quest_id, now):
+            return False
+    return (quest_id not in character["active_quests"]
+            and character["level"] >= quest["required_level"]
+            and (prereq == "NONE" or prereq in character["completed_quests"]))
+
+# ============================================================================
+# OBJECTIVE TRACKING
+# ============================================================================
+
+def attach_objective_tracking(quest_data_dict, item_data_dict, announce=None, clock=None, report=None):
+    """
+    Complete quests automatically once their objectives are met.
+    announce(character, quest, rewards) is called for each one.
+    clock(character) gives the time to complete at (default: the current
+    time). A timed quest past its deadline is left for the scheduler to
+    fail, and a quest that cannot be completed goes to
+    report(character, message) instead of raising out of the event.
+    Returns the ObjectiveTracker (detach() to stop).
+    """
+    def on_complete(character, quest_id):
+        now = time.time() if clock is None else clock(character)
+        if is_expired(character, quest_id, now):
+            return
+        try:
+            rewards = complete_quest(character, quest_id, quest_data_dict, now)
+        except QuestError as e:
+            if report:
+                report(character, str(e))
+            return
+        if announce:
+            announce(character, quest_data_dict[quest_id], rewards)
+
+    tracker = quest_objectives.ObjectiveTracker(quest_data_dict, item_data_dict, on_complete)
+    tracker.attach()
+    return tracker
+
+# ============================================================================
+# QUEST LOG VIEWS
+# ============================================================================
+#
+# Rendered quest lists are cached per character in character["quest_log"]
+# (never saved). The active/completed views only change when a quest is
+# accepted, completed or abandoned, so those are the only places that drop
+# the cache; the available view is also keyed by level. Progress
+# percentages are read from quest_objectives, which keeps them up to date
+# as events arrive.
+
+QUEST_LOG_VIEWS = ("active", "completed", "available")
+
+
+def invalidate_quest_log(character):
+    character.pop("quest_log", None)
+
+
+def get_quest_log_view(character, quest_data_dict, view, now=None):
+    """
+    Cached list of (quest_id, rendered lines) for "active", "completed"
+    or "available" quests (available as of `now`).
+    Raises ValueError for an unknown view.
+    """
+    if view not in QUEST_LOG_VIEWS:
+        raise ValueError(f"Unknown quest log view: {view}")
+
+    cache = character.get("quest_log")
+    if cache is None or cache["source"] is not quest_data_dict:
+        cache = character["quest_log"] = {"source": quest_data_dict}
+
+    key = (view, character["level"]) if view == "available" else view
+    entries = cache.get(key)
+    if entries is None:
+        if view == "active":
+            quests = get_active_quests(character, quest_data_dict)
+        elif view == "completed":
+            quests = get_completed_quests(character, quest_data_dict)
+        else:
+            cache.pop(cache.get("available_key"), None)
+            cache["available_key"] = key
+            quests = get_available_quests(character, quest_data_dict, now)
+        entries = cache[key] = [(quest["quest_id"], render_quest(quest)) for quest in quests]
+    return entries
+
+
+def render_quest(quest):
+    return [
+        f"\n{quest['title']} (ID: {quest['quest_id']})",
+        f"  {quest['description']}",
+        f"  Level {quest['required_level']}+ | Rewards: {quest['reward_xp']} XP, {quest['reward_gold']} gold",
+    ]
+
+
+def display_quest_log(character, quest_data_dict, view, now=None):
+    print("\n".join(quest_log_lines(character, quest_data_dict, view, now)))
+
+
+def quest_log_lines(character, quest_data_dict, view, now=None):
+    entries = get_quest_log_view(character, quest_data_dict, view, now)
+    if not entries:
+        return ["No quests."]
+
+    if view == "active":
+        quest_objectives.ensure_index(character, quest_data_dict)
+    lines = []
+    for quest_id, rendered in entries:
+        lines.extend(rendered)
+        if view == "active":
+            percent = quest_objectives.get_percent(character, quest_id)
+            if percent is not None:
+                lines.append(f"  Progress: {percent}%")
+    return lines
+
+# ============================================================================
+# DISPLAY
+# ============================================================================
+
+def display_quest_list(quest_list):
+    if not quest_list:
+        print("No quests.")
+        return
+
+    for quest in quest_list:
+        print("\n".join(render_quest(quest)))
+
+
+def display_character_quest_progress(character, quest_data_dict):
+    print("\n".join(quest_progress_lines(character, quest_data_dict)))
+
+
+def quest_progress_lines(character, quest_data_dict):
+    lines = [
+        "\n=== QUEST PROGRESS ===",
+        f"Active quests: {len(character['active_quests'])}",
+        f"Completed quests: {len(character['completed_quests'])}",
+    ]
+
+    quest_objectives.ensure_index(character, quest_data_dict)
+    for quest_id, _ in get_quest_log_view(character, quest_data_dict, "active"):
+        percent = quest_objectives.get_percent(character, quest_id)
+        title = quest_data_dict[quest_id]["title"]
+        lines.append(f"- {title}" if percent is None else f"- {title} ({percent}%)")
 
+        progress = quest_objectives.get_progress(character, quest_id) or ()
+        for objective, done in zip(quest_data_dict[quest_id].get("objectives", ()), progress):
+            lines.append(f"    {quest_objectives.describe_objective(objective, done)}")
+    return lines
 
 
 # ============================================================================
@@ -0,0 +1,251 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Objectives Module
+
+Progress tracking for quest OBJECTIVE lines (see
+game_data.parse_objective_string).
+
+Each character keeps:
+    character["quest_progress"]    {quest_id: [progress per objective]}
+    character["quest_percent"]     {quest_id: percent complete}
+    character["objective_index"]   {(kind, target): [(quest_id, i), ...]}
+
+The index maps an event key such as ("kill", "goblin") to just the
+objectives waiting for it, so a game event only touches the objectives
+that care about it, never every active quest. It is not saved: it is
+dropped whenever the set of tracked quests changes and rebuilt on the next
+event. Percentages are adjusted by each progress change rather than
+recomputed from every objective.
+
+Counter objectives (kill, buy) add up event amounts; state objectives
+(level, collect) take the current value when their event fires.
+"""
+
+import game_events
+import inventory_system
+
+ANY = "any"
+STATE_KINDS = ("level", "collect")
+
+# ============================================================================
+# TRACKING
+# ============================================================================
+
+def start_tracking(character, quest_id, quest):
+    """
+    Set up progress for a newly accepted quest.
+    Returns True if its objectives are already met (e.g. a level objective).
+    """
+    objectives = quest.get("objectives")
+    if not objectives:
+        return False
+
+    progress = [0] * len(objectives)
+    for i, (kind, _, count) in enumerate(objectives):
+        if kind in STATE_KINDS:
+            progress[i] = min(state_value(character, kind), count)
+
+    character.setdefault("quest_progress", {})[quest_id] = progress
+    character.setdefault("quest_percent", {})[quest_id] = percent_complete(progress, objectives)
+    character.pop("objective_index", None)
+    return is_complete(progress, objectives)
+
+
+def stop_tracking(character, quest_id):
+    """
+    Forget a quest's progress (completed or abandoned).
+    """
+    if character.get("quest_progress", {}).pop(quest_id, None) is not None:
+        character.get("quest_percent", {}).pop(quest_id, None)
+        character.pop("objective_index", None)
+
+
+def get_progress(character, quest_id):
+    return character.get("quest_progress", {}).get(quest_id)
+
+
+def get_percent(character, quest_id):
+    """
+    Percent complete (0-100), or None for quests without objectives.
+    """
+    percent = character.get("quest_percent", {}).get(quest_id)
+    return None if percent is None else round(percent)
+
+
+def percent_complete(progress, objectives):
+    return sum(done / count for done, (_, _, count) in zip(progress, objectives)) * 100 / len(objectives)
+
+
+def is_complete(progress, objectives):
+    return all(done >= count for done, (_, _, count) in zip(progress, objectives))
+
+
+def state_value(character, kind):
+    if kind == "level":
+        return character["level"]
+    return len(inventory_system.get_inventory(character).counts)
+
+
+def objective_keys(objective):
+    kind, targets, _ = objective
+    if kind in STATE_KINDS:
+        return [(kind, None)]
+    return [(kind, target) for target in targets]
+
+
+def build_index(character, quest_data_dict):
+    """
+    Index every objective of the character's active quests by event key.
+    Active quests saved before objectives existed start from zero.
+    """
+    all_progress = character.setdefault("quest_progress", {})
+    all_percent = character.setdefault("quest_percent", {})
+    index = {}
+    for quest_id in character["active_quests"]:
+        objectives = quest_data_dict.get(quest_id, {}).get("objectives")
+        if not objectives:
+            continue
+        if quest_id not in all_progress:
+            all_progress[quest_id] = [0] * len(objectives)
+        if quest_id not in all_percent:
+            all_percent[quest_id] = percent_complete(all_progress[quest_id], objectives)
+        for i, objective in enumerate(objectives):
+            for key in objective_keys(objective):
+                index.setdefault(key, []).append((quest_id, i))
+
+    character["objective_index"] = index
+    return index
+
+
+def ensure_index(character, quest_data_dict):
+    index = character.get("objective_index")
+    if index is None:
+        index = build_index(character, quest_data_dict)
+    return index
+
+
+def record_event(character, keys, quest_data_dict, amount=1):
+    """
+    Apply one game event to the objectives waiting on any of `keys`.
+    For state kinds `amount` is the current value rather than an increment.
+    Returns the ids of quests whose objectives are now all met.
+    """
+    index = ensure_index(character, quest_data_dict)
+
+    # Insertion-ordered (not a set), so quests complete in the same order
+    # in every process: by key, then by the order quests were accepted
+    touched = {}
+    for key in keys:
+        for entry in index.get(key, ()):
+            touched[entry] = None
+    if not touched:
+        return []
+
+    finished = []
+    all_progress = character["quest_progress"]
+    all_percent = character["quest_percent"]
+    for quest_id, i in touched:
+        objectives = quest_data_dict[quest_id]["objectives"]
+        kind, _, count = objectives[i]
+        progress = all_progress[quest_id]
+        before = progress[i]
+        if kind in STATE_KINDS:
+            progress[i] = min(amount, count)
+        else:
+            progress[i] = min(progress[i] + amount, count)
+        all_percent[quest_id] += (progress[i] - before) / count * 100 / len(objectives)
+
+    for quest_id in dict.fromkeys(quest_id for quest_id, _ in touched):
+        if is_complete(all_progress[quest_id], quest_data_dict[quest_id]["objectives"]):
+            finished.append(quest_id)
+    return finished
+
+# ============================================================================
+# EVENT HOOKS
+# ============================================================================
+
+class ObjectiveTracker:
+    """
+    Feeds game events into quest objectives.
+    on_complete(character, quest_id) is called when a quest's objectives
+    are all met.
+    """
+
+    def __init__(self, quest_data_dict, item_data_dict, on_complete):
+        self.quest_data_dict = quest_data_dict
+        self.item_data_dict = item_data_dict
+        self.on_complete = on_complete
+        self.handlers = {
+            "enemy_defeated": self.on_enemy_defeated,
+            "item_purchased": self.on_item_purchased,
+            "item_added": self.on_item_added,
+            "level_up": self.on_level_up,
+        }
+
+    def attach(self):
+        for kind, handler in self.handlers.items():
+            game_events.subscribe(kind, handler)
+
+    def detach(self):
+        for kind, handler in self.handlers.items():
+            game_events.unsubscribe(kind, handler)
+
+    def dispatch(self, character, keys, amount):
+        if not character.get("active_quests"):
+            return
+        for quest_id in record_event(character, keys, self.quest_data_dict, amount):
+            self.on_complete(character, quest_id)
+
+    def on_enemy_defeated(self, event):
+        self.dispatch(event.character, [("kill", event.enemy_type), ("kill", ANY)], 1)
+
+    def on_item_purchased(self, event):
+        item_type = self.item_data_dict.get(event.item_id, {}).get("type")
+        keys = [("buy", event.item_id), ("buy", ANY)]
+        if item_type:
+            keys.append(("buy", item_type))
+        self.dispatch(event.character, keys, event.quantity)
+        self.on_item_added(event)
+
+    def on_item_added(self, event):
+        self.dispatch(event.character, [("collect", None)], state_value(event.character, "collect"))
+
+    def on_level_up(self, event):
+        self.dispatch(event.character, [("level", None)], event.level)
+
+# ============================================================================
+# DISPLAY & SAVE FORMAT
+# ============================================================================
+
+def describe_objective(objective, done):
+    kind, targets, count = objective
+    if kind == "kill":
+        return f"Defeat {count} {' or '.join(targets)}: {done}/{count}"
+    if kind == "buy":
+        return f"Buy {count} {' or '.join(targets)}: {done}/{count}"
+    if kind == "level":
+        return f"Reach level {count}: {done}/{count}"
+    return f"Hold {count} different items: {done}/{count}"
+
+
+def encode_progress(character):
+    """
+    "goblin_hunter=2;equipment_upgrade=0,1"
+    """
+    return ";".join(
+        f"{quest_id}=" + ",".join(str(done) for done in progress)
+        for quest_id, progress in character.get("quest_progress", {}).items()
+    )
+
+
+def decode_progress(encoded):
+    """
+    Raises ValueError on malformed data.
+    """
+    progress = {}
+    for part in encoded.split(";"):
+        if not part:
+            continue
+        quest_id, values = part.split("=", 1)
+        progress[quest_id.strip()] = [int(v) for v in values.split(",")]
+    return progress
@@ -0,0 +1,144 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Planner Module
+
+"What is the fastest way to unlock dragon_slayer from here?"
+
+Each quest has at most one prerequisite, so the quests needed before a
+target are the target's prerequisite chain up to the first quest the
+character has already completed. The planner walks that chain, then
+estimates XP and levels along the way: when a quest needs a higher level
+than the character would have, the missing XP is counted as grind XP.
+
+Plans are memoized on (target, completed quests on the target's chain,
+level, experience). Only the chain members matter, so characters with
+very different histories still share cached plans.
+"""
+
+from collections import OrderedDict, namedtuple
+import character_manager
+from custom_exceptions import (
+    QuestNotFoundError,
+    QuestAlreadyCompletedError,
+    InvalidDataFormatError
+)
+
+PlanStep = namedtuple("PlanStep", "quest_id required_level level_before grind_xp reward_xp level_after")
+QuestPlan = namedtuple("QuestPlan", "target steps reward_xp grind_xp final_level")
+
+MAX_CACHED_PLANS = 1024
+
+
+class QuestPlanner:
+    """
+    Shortest quest sequences over one quest dictionary.
+    """
+
+    def __init__(self, quest_data_dict, max_cached=MAX_CACHED_PLANS):
+        self.quest_data_dict = quest_data_dict
+        self.max_cached = max_cached
+        self.chains = {}
+        self.plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def chain(self, target):
+        """
+        The target and its prerequisites, nearest first (cached).
+        Raises QuestNotFoundError, InvalidDataFormatError on a cycle.
+        """
+        chain = self.chains.get(target)
+        if chain is not None:
+            return chain
+
+        chain = []
+        seen = set()
+        quest_id = target
+        while quest_id != "NONE":
+            if quest_id not in self.quest_data_dict:
+                raise QuestNotFoundError(f"Quest not found: {quest_id}")
+            if quest_id in seen:
+                raise InvalidDataFormatError(f"Prerequisite cycle at quest: {quest_id}")
+            seen.add(quest_id)
+            chain.append(quest_id)
+            quest_id = self.quest_data_dict[quest_id]["prerequisite"]
+
+        chain = tuple(chain)
+        self.chains[target] = chain
+        return chain
+
+    def plan(self, character, target):
+        """
+        QuestPlan for reaching and completing `target`.
+        Raises:
+            QuestNotFoundError
+            QuestAlreadyCompletedError
+        """
+        if target in character["completed_quests"]:
+            raise QuestAlreadyCompletedError("Quest already completed.")
+
+        chain = self.chain(target)
+        completed = character["completed_quests"]
+        done = frozenset(quest_id for quest_id in chain if quest_id in completed)
+        key = (target, done, character["level"], character["experience"])
+
+        plan = self.plans.get(key)
+        if plan is not None:
+            self.hits += 1
+            self.plans.move_to_end(key)
+            return plan
+
+        self.misses += 1
+        plan = self.build_plan(target, chain, done, character["level"], character["experience"])
+        self.plans[key] = plan
+        if len(self.plans) > self.max_cached:
+            self.plans.popitem(last=False)
+        return plan
+
+    def build_plan(self, target, chain, done, level, experience):
+        needed = []
+        for quest_id in chain:
+            if quest_id in done:
+                break
+            needed.append(quest_id)
+        needed.reverse()
+
+        total = character_manager.xp_to_reach(level) + experience
+        steps = []
+        for quest_id in needed:
+            quest = self.quest_data_dict[quest_id]
+            level_before = character_manager.level_for_total_xp(total)
+            grind = 0
+            if level_before < quest["required_level"]:
+                grind = character_manager.xp_to_reach(quest["required_level"]) - total
+                total += grind
+                level_before = quest["required_level"]
+
+            total += quest["reward_xp"]
+            steps.append(PlanStep(quest_id, quest["required_level"], level_before, grind,
+                                  quest["reward_xp"], character_manager.level_for_total_xp(total)))
+
+        return QuestPlan(
+            target,
+            tuple(steps),
+            sum(step.reward_xp for step in steps),
+            sum(step.grind_xp for step in steps),
+            steps[-1].level_after if steps else level
+        )
+
+
+def display_plan(plan, quest_data_dict):
+    print("\n".join(plan_lines(plan, quest_data_dict)))
+
+
+def plan_lines(plan, quest_data_dict):
+    lines = [f"\n=== ROUTE TO {quest_data_dict[plan.target]['title'].upper()} ==="]
+    for number, step in enumerate(plan.steps, 1):
+        title = quest_data_dict[step.quest_id]["title"]
+        line = f"{number}. {title} (Lv {step.level_before} → {step.level_after}, +{step.reward_xp} XP)"
+        if step.grind_xp:
+            line += f" - first earn {step.grind_xp} XP to reach level {step.required_level}"
+        lines.append(line)
+    lines.append(f"Total: {plan.reward_xp} quest XP, {plan.grind_xp} XP from other sources, "
+                 f"ending at level {plan.final_level}")
+    return lines
@@ -0,0 +1,99 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Scheduler Module
+
+Fires quest time limits and repeatable-quest resets when they are due.
+
+Every pending deadline (character["quest_deadlines"]) and reset
+(character["quest_resets"]) is pushed onto one heap keyed by time, so
+advance(now) only looks at entries that are actually due: O(log n) per
+expiry, with no sweep over every character's quests on each tick.
+
+Entries are never removed from the heap early. When a quest is completed
+or abandoned its timestamp disappears from the character, and the stale
+entry is skipped when it comes up (the same lazy deletion PartyBattle
+uses for its health heaps).
+"""
+
+import heapq
+import itertools
+import game_events
+import quest_handler
+
+DEADLINE = "deadline"
+RESET = "reset"
+
+
+class QuestScheduler:
+    """
+    Min-heap of (time, sequence, kind, character, quest_id).
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.sequence = itertools.count()
+        self.attached = False
+
+    def attach(self):
+        """
+        Pick up new deadlines and resets as quests are accepted and completed.
+        """
+        if not self.attached:
+            game_events.subscribe("quest_accepted", self.on_quest_event)
+            game_events.subscribe("quest_completed", self.on_quest_event)
+            self.attached = True
+
+    def detach(self):
+        if self.attached:
+            game_events.unsubscribe("quest_accepted", self.on_quest_event)
+            game_events.unsubscribe("quest_completed", self.on_quest_event)
+            self.attached = False
+
+    def on_quest_event(self, event):
+        self.track_quest(event.character, event.quest_id)
+
+    def track(self, character):
+        """
+        Schedule everything pending for a character (e.g. after loading).
+        """
+        for quest_id in list(character.get("quest_deadlines", {})) + list(character.get("quest_resets", {})):
+            self.track_quest(character, quest_id)
+
+    def track_quest(self, character, quest_id):
+        deadline = character.get("quest_deadlines", {}).get(quest_id)
+        if deadline is not None:
+            self.push(deadline, DEADLINE, character, quest_id)
+        reset_at = character.get("quest_resets", {}).get(quest_id)
+        if reset_at is not None:
+            self.push(reset_at, RESET, character, quest_id)
+
+    def push(self, when, kind, character, quest_id):
+        heapq.heappush(self.heap, (when, next(self.sequence), kind, character, quest_id))
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+    def __len__(self):
+        return len(self.heap)
+
+    def advance(self, now):
+        """
+        Fail every timed quest and reset every repeatable quest due by `now`.
+        Returns a list of ("failed" | "reset", character, quest_id).
+        """
+        fired = []
+        while self.heap and self.heap[0][0] <= now:
+            when, _, kind, character, quest_id = heapq.heappop(self.heap)
+
+            if kind == DEADLINE:
+                if character.get("quest_deadlines", {}).get(quest_id) != when:
+                    continue    # completed, abandoned or re-accepted since
+                quest_handler.fail_quest(character, quest_id)
+                fired.append(("failed", character, quest_id))
+            else:
+                if character.get("quest_resets", {}).get(quest_id) != when:
+                    continue
+                quest_handler.reset_quest(character, quest_id)
+                fired.append(("reset", character, quest_id))
+
+        return fired
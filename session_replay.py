@@ -0,0 +1,273 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Session Replay Module
+
+Records game sessions and replays them headless, timing every command,
+so a slow session seen in play can be reproduced and releases compared.
+
+A recording holds everything a session depends on besides the code:
+
+    - the RNG seed (combat, escapes and loot all use the random module)
+    - every command with its clock reading, as an offset from the start
+    - the battle actions chosen during each command
+    - the save file of any character loaded, as it was at load time
+    - the character's level/XP/gold/health after each command, to spot
+      a replay that went differently
+
+The file has one JSON value per line (gzip-compressed when the name ends
+in .gz). The first line is a header; commands are short arrays:
+
+    {"format": "qcrec", "version": 1, "seed": 1234, "start": 1700000000.0}
+    {"session": 1}
+    [0, "new", "Warrior Aria", [], [1, 0, 100, 120]]
+    [5210, "explore", "", ["1", "1", "2", "1"], [1, 25, 110, 105]]
+    [9000, null]                      quest timers fired between commands
+
+    python main.py --record session.qcr.gz
+    python session_replay.py session.qcr.gz
+"""
+
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import namedtuple
+import economy_ledger
+import game_session
+from custom_exceptions import CorruptedDataError
+
+FORMAT = "qcrec"
+VERSION = 1
+
+Recording = namedtuple("Recording", "seed start events")
+ReplayResult = namedtuple("ReplayResult", "latencies diverged")
+LatencyStats = namedtuple("LatencyStats", "count total mean p50 p95 worst")
+
+
+def open_recording(filename, mode):
+    if filename.endswith(".gz"):
+        return gzip.open(filename, mode + "t", encoding="utf-8")
+    return open(filename, mode, encoding="utf-8")
+
+
+def character_state(session):
+    character = session.character
+    if character is None:
+        return None
+    return [character["level"], character["experience"], character["gold"], character["health"]]
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+class SessionRecorder:
+    """
+    Writes what attached sessions do to a recording file.
+    Seeds the random module on creation so the run can be repeated.
+    """
+
+    def __init__(self, filename, seed=None, clock=time.time):
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        random.seed(self.seed)
+        self.start = clock()
+        self.file = open_recording(filename, "w")
+        self.pending = None
+        self.sessions = 0
+        self.write({"format": FORMAT, "version": VERSION, "seed": self.seed, "start": self.start})
+
+    def write(self, value):
+        self.file.write(json.dumps(value, separators=(",", ":")) + "\n")
+
+    def offset(self, session):
+        return round((session.now - self.start) * 1000)
+
+    def flush_pending(self):
+        if self.pending is not None:
+            self.write(self.pending)
+            self.pending = None
+
+    def attach(self, session):
+        self.flush_pending()
+        self.sessions += 1
+        session.recorder = self
+        self.write({"session": self.sessions})
+
+    def close(self):
+        self.flush_pending()
+        self.file.close()
+
+    # Hooks called by GameSession ------------------------------------------
+
+    def record_command(self, session, name, argument):
+        self.flush_pending()
+        if name == "load":
+            self.record_save_file(session, argument)
+        self.pending = [self.offset(session), name, argument, [], None]
+
+    def record_action(self, action):
+        if self.pending is not None:
+            self.pending[3].append(action)
+
+    def record_state(self, session):
+        if self.pending is not None:
+            self.pending[4] = character_state(session)
+            self.flush_pending()
+
+    def record_tick(self, session):
+        self.flush_pending()
+        self.write([self.offset(session), None])
+
+    def record_save_file(self, session, name):
+        filename = os.path.join(session.save_directory, f"{name}_save.txt")
+        if os.path.isfile(filename):
+            with open(filename, "r") as f:
+                self.write({"file": name, "text": f.read()})
+
+
+def load_recording(filename):
+    """
+    Raises CorruptedDataError if the file is not a valid recording.
+    """
+    try:
+        with open_recording(filename, "r") as f:
+            header = json.loads(f.readline())
+            if header.get("format") != FORMAT or header.get("version") != VERSION:
+                raise ValueError("not a session recording")
+            events = [json.loads(line) for line in f if line.strip()]
+        return Recording(header["seed"], header["start"], events)
+    except (OSError, ValueError, KeyError, AttributeError, EOFError) as e:
+        raise CorruptedDataError(f"Invalid session recording {filename}: {e}")
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+class ReplayInput:
+    """
+    Battle actions for the command being replayed.
+    Falls back to attacking if a replay runs past the recorded actions.
+    """
+
+    def __init__(self):
+        self.actions = []
+
+    def __call__(self, battle):
+        return self.actions.pop() if self.actions else "1"
+
+    def load(self, actions):
+        self.actions = list(reversed(actions))
+
+
+def replay(recording, world, save_directory=None):
+    """
+    Run a recording against `world` as fast as possible.
+    Saves go to save_directory (a temporary directory by default), so the
+    player's real save files are never touched.
+    Returns ReplayResult: (command, seconds) per command, and the indexes
+    of commands whose resulting character state differs from the recording.
+    """
+    if save_directory is None:
+        with tempfile.TemporaryDirectory() as directory:
+            return replay(recording, world, directory)
+
+    random.seed(recording.seed)
+    clock_time = [recording.start]
+    actions = ReplayInput()
+    session = None
+    latencies = []
+    diverged = []
+
+    def clock():
+        return clock_time[0]
+
+    for event in recording.events:
+        if isinstance(event, dict):
+            if "session" in event:
+                if session is not None:
+                    session.quit()
+                session = game_session.GameSession(world, save_directory, battle_input=actions, clock=clock)
+            elif "file" in event:
+                with open(os.path.join(save_directory, f"{event['file']}_save.txt"), "w") as f:
+                    f.write(event["text"])
+            continue
+
+        clock_time[0] = recording.start + event[0] / 1000
+        if event[1] is None:
+            session.tick()
+            continue
+
+        offset, name, argument, battle_actions, state = event
+        actions.load(battle_actions)
+        started = time.perf_counter()
+        session.run_command(name, argument)
+        latencies.append((name, time.perf_counter() - started))
+        if state is not None and character_state(session) != state:
+            diverged.append(len(latencies) - 1)
+
+    if session is not None:
+        session.quit()
+    return ReplayResult(latencies, diverged)
+
+# ============================================================================
+# LATENCY REPORT
+# ============================================================================
+
+def summarize(latencies):
+    """
+    {command: LatencyStats} in seconds, plus "all" for every command.
+    """
+    by_command = {"all": []}
+    for name, seconds in latencies:
+        by_command.setdefault(name, []).append(seconds)
+        by_command["all"].append(seconds)
+
+    summary = {}
+    for name, samples in by_command.items():
+        if not samples:
+            continue
+        samples.sort()
+        count = len(samples)
+        total = sum(samples)
+        summary[name] = LatencyStats(count, total, total / count, samples[count // 2],
+                                     samples[min(count - 1, count * 95 // 100)], samples[-1])
+    return summary
+
+
+def latency_report(summary):
+    lines = [f"{'command':<12}{'count':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+    for name in sorted(summary, key=lambda name: (name == "all", name)):
+        stats = summary[name]
+        lines.append(f"{name:<12}{stats.count:>7}{stats.mean * 1000:>10.3f}{stats.p50 * 1000:>10.3f}"
+                     f"{stats.p95 * 1000:>10.3f}{stats.worst * 1000:>10.3f}")
+    return lines
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python session_replay.py RECORDING")
+        return 1
+
+    recording = load_recording(argv[0])
+    with tempfile.TemporaryDirectory() as directory:
+        ledger = economy_ledger.EconomyLedger(os.path.join(directory, "economy_ledger.txt"))
+        world = game_session.load_world(ledger=ledger)
+        world.load()
+        world.attach()
+        try:
+            result = replay(recording, world, directory)
+        finally:
+            world.detach()
+
+    for line in latency_report(summarize(result.latencies)):
+        print(line)
+    if result.diverged:
+        print(f"Warning: {len(result.diverged)} commands ended in a different state than recorded.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
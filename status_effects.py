@@ -0,0 +1,156 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Status Effects Module
+
+Tracks ability cooldowns and timed status effects (stat buffs, damage over
+time and stuns) for the combatants of one battle.
+
+Every expiry and damage-over-time tick is scheduled on a heap keyed by turn
+number, so advancing a turn only touches the effects that are actually due
+instead of scanning every active effect.
+"""
+
+import heapq
+import character_stats
+from custom_exceptions import AbilityOnCooldownError
+
+
+class EffectTracker:
+    """
+    Cooldowns and status effects for one battle, keyed by combatant.
+    """
+
+    def __init__(self):
+        self.turn = 0
+        self.timeline = []      # heap of (turn, effect_id, event_kind)
+        self.effects = {}       # effect_id -> effect dict
+        self.cooldowns = {}     # (id(combatant), ability_name) -> ready turn
+        self.stuns = {}         # id(combatant) -> first turn they can act again
+        self.next_id = 0
+        self.on_stat_change = None  # callback(combatant) when a buff changes stats
+
+    # ----------------------------------------------------------------------
+    # COOLDOWNS
+    # ----------------------------------------------------------------------
+
+    def cooldown_remaining(self, combatant, ability_name):
+        ready = self.cooldowns.get((id(combatant), ability_name), 0)
+        return max(ready - self.turn, 0)
+
+    def check_cooldown(self, combatant, ability_name):
+        """
+        Raises AbilityOnCooldownError if the ability is not ready yet.
+        """
+        remaining = self.cooldown_remaining(combatant, ability_name)
+        if remaining > 0:
+            raise AbilityOnCooldownError(
+                f"{ability_name} is on cooldown for {remaining} more turn(s)."
+            )
+
+    def start_cooldown(self, combatant, ability_name, turns):
+        if turns > 0:
+            self.cooldowns[(id(combatant), ability_name)] = self.turn + turns
+
+    # ----------------------------------------------------------------------
+    # STATUS EFFECTS
+    # ----------------------------------------------------------------------
+
+    def add_buff(self, combatant, name, stat, amount, turns):
+        """
+        Raise (or lower, if negative) a stat until the buff expires.
+        The buff is a modifier on the combatant, so it can never outlive
+        the battle or drift the base stat.
+        """
+        effect_id = self.add_effect(combatant, "buff", name, stat=stat, amount=amount)
+        character_stats.set_modifier(combatant, f"buff:{effect_id}", ((stat, amount),))
+        self.stats_changed(combatant)
+        self.schedule(self.turn + turns, "expire", effect_id)
+        return effect_id
+
+    def add_damage_over_time(self, combatant, name, damage, turns):
+        """
+        Deal damage at the start of each of the next `turns` turns.
+        """
+        effect_id = self.add_effect(combatant, "dot", name, damage=damage, ticks_left=turns)
+        self.schedule(self.turn + 1, "tick", effect_id)
+        return effect_id
+
+    def add_stun(self, combatant, turns):
+        """
+        Combatant loses their actions for `turns` turns, starting this one.
+        """
+        key = id(combatant)
+        self.stuns[key] = max(self.stuns.get(key, 0), self.turn + turns)
+
+    def is_stunned(self, combatant):
+        return self.stuns.get(id(combatant), 0) > self.turn
+
+    # ----------------------------------------------------------------------
+
+    def add_effect(self, combatant, kind, name, **data):
+        self.next_id += 1
+        effect = {"kind": kind, "name": name, "combatant": combatant}
+        effect.update(data)
+        self.effects[self.next_id] = effect
+        return self.next_id
+
+    def schedule(self, turn, event_kind, effect_id):
+        heapq.heappush(self.timeline, (turn, effect_id, event_kind))
+
+    def advance(self, turn):
+        """
+        Move the clock to `turn` and process every event due by then.
+        Returns a list of dicts describing damage dealt by DoT effects.
+        """
+        self.turn = turn
+        results = []
+
+        while self.timeline and self.timeline[0][0] <= turn:
+            _, effect_id, event_kind = heapq.heappop(self.timeline)
+            effect = self.effects.get(effect_id)
+            if effect is None:
+                continue
+
+            if event_kind == "expire":
+                self.remove_effect(effect_id)
+            elif event_kind == "tick":
+                results.append(self.tick_damage(effect))
+                effect["ticks_left"] -= 1
+                if effect["ticks_left"] > 0 and effect["combatant"]["health"] > 0:
+                    self.schedule(turn + 1, "tick", effect_id)
+                else:
+                    self.remove_effect(effect_id)
+
+        return results
+
+    def tick_damage(self, effect):
+        target = effect["combatant"]
+        damage = min(effect["damage"], target["health"])
+        target["health"] -= damage
+        return {
+            "actor": effect["name"],
+            "combatant": target,
+            "target": target["name"],
+            "damage": damage,
+            "hp_after": target["health"]
+        }
+
+    def remove_effect(self, effect_id):
+        effect = self.effects.pop(effect_id, None)
+        if effect is not None and effect["kind"] == "buff":
+            character_stats.remove_modifier(effect["combatant"], f"buff:{effect_id}")
+            self.stats_changed(effect["combatant"])
+
+    def stats_changed(self, combatant):
+        if self.on_stat_change is not None:
+            self.on_stat_change(combatant)
+
+    def clear(self):
+        """
+        End of battle: revert all buffs and forget every timer.
+        """
+        for effect_id in list(self.effects):
+            self.remove_effect(effect_id)
+        self.timeline = []
+        self.cooldowns = {}
+        self.stuns = {}
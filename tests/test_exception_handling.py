@@ -63,6 +63,24 @@ def test_insufficient_resources_exception():
     with pytest.raises(InsufficientResourcesError):
         inventory_system.purchase_item(char, "expensive_item", item_data)
 
+def test_invalid_quantity_exception():
+    """Test that quantities below 1 raise ValueError and change nothing"""
+    char = {'inventory': ['potion'], 'gold': 100}
+    item_data = {'cost': 20}
+
+    for quantity in (0, -3):
+        with pytest.raises(ValueError):
+            inventory_system.purchase_item(char, "potion", item_data, quantity)
+        with pytest.raises(ValueError):
+            inventory_system.sell_item(char, "potion", item_data, quantity)
+        with pytest.raises(ValueError):
+            inventory_system.add_item_to_inventory(char, "potion", quantity)
+        with pytest.raises(ValueError):
+            inventory_system.remove_item_from_inventory(char, "potion", quantity)
+
+    assert char['gold'] == 100
+    assert inventory_system.count_item(char, "potion") == 1
+
 def test_invalid_item_type_exception():
     """Test that InvalidItemTypeError is raised for wrong item types"""
     char = {'inventory': ['weapon1'], 'health': 80, 'max_health': 100}
@@ -72,6 +90,11 @@ def test_invalid_item_type_exception():
     with pytest.raises(InvalidItemTypeError):
         inventory_system.use_item(char, "weapon1", item_data)
 
+def test_invalid_item_effect_exception():
+    """Test that InvalidDataFormatError is raised for malformed multi-stat effects"""
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_effect_string("strength:5,magic")
+
 # ============================================================================
 # QUEST HANDLER EXCEPTION TESTS
 # ============================================================================
@@ -160,6 +183,33 @@ def test_invalid_data_format_exception():
     finally:
         os.remove("test_bad_data.txt")
 
+def test_invalid_loot_table_exception():
+    """Test that InvalidDataFormatError is raised for bad loot tables"""
+    with open("test_bad_loot.txt", "w") as f:
+        f.write("ENEMY: goblin\nDROP: health_potion:0\n")
+    
+    try:
+        with pytest.raises(InvalidDataFormatError):
+            game_data.load_loot_tables("test_bad_loot.txt")
+    finally:
+        os.remove("test_bad_loot.txt")
+
+def test_corrupted_battle_log_exception():
+    """Test that CorruptedDataError is raised for unreadable battle logs"""
+    import battle_log
+    
+    with pytest.raises(CorruptedDataError):
+        battle_log.decode_events(b"not a battle log")
+
+def test_corrupted_session_recording_exception(tmp_path):
+    """Test that CorruptedDataError is raised for files that are not recordings"""
+    import session_replay
+    
+    path = tmp_path / "bad.qcr"
+    path.write_text('{"format": "something else"}\n')
+    with pytest.raises(CorruptedDataError):
+        session_replay.load_recording(str(path))
+
 # ============================================================================
 # COMBAT EXCEPTION TESTS
 # ============================================================================
@@ -184,6 +234,21 @@ def test_combat_not_active_exception():
     with pytest.raises(CombatNotActiveError):
         battle.player_turn()
 
+def test_ability_on_cooldown_exception():
+    """Test that AbilityOnCooldownError is raised when a special is reused too soon"""
+    import combat_system
+    from status_effects import EffectTracker
+    
+    char = character_manager.create_character("Test", "Warrior")
+    enemy = combat_system.create_enemy("dragon")
+    effects = EffectTracker()
+    effects.advance(1)
+    
+    combat_system.use_special_ability(char, enemy, effects)
+    
+    with pytest.raises(AbilityOnCooldownError):
+        combat_system.use_special_ability(char, enemy, effects)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
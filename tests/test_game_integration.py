@@ -104,6 +104,69 @@ def test_equipment_system():
     assert 'equipped_weapon' in char
     assert char['equipped_weapon'] == "iron_sword"
 
+def test_equipment_swap_does_not_drift_stats():
+    """Test that swapping and unequipping gear restores the base stats"""
+    char = character_manager.create_character("SwapTest", "Mage")
+    items = game_data.load_items("data/items.txt")
+    
+    for item_id in ["iron_sword", "fire_staff", "magic_robe"]:
+        inventory_system.add_item_to_inventory(char, item_id)
+    
+    inventory_system.equip_weapon(char, "iron_sword", items['iron_sword'])
+    inventory_system.equip_weapon(char, "fire_staff", items['fire_staff'])
+    inventory_system.equip_armor(char, "magic_robe", items['magic_robe'])
+    character_manager.gain_experience(char, 100)
+    
+    assert char['strength'] == 8 + 2
+    assert char['magic'] == 20 + 2 + 8 + 5
+    assert inventory_system.has_item(char, "iron_sword")
+    
+    character_manager.save_character(char)
+    try:
+        loaded = character_manager.load_character("SwapTest")
+    finally:
+        character_manager.delete_character("SwapTest")
+    
+    assert loaded['equipped_weapon'] == "fire_staff"
+    assert loaded['magic'] == char['magic']
+    
+    inventory_system.unequip_weapon(loaded)
+    inventory_system.unequip_armor(loaded)
+    assert loaded['magic'] == 20 + 2
+    assert inventory_system.count_item(loaded, "fire_staff") == 1
+
+def test_battle_buffs_never_reach_save_files(tmp_path, monkeypatch):
+    """Test that saving during or after an abandoned battle keeps base stats"""
+    import economy_ledger
+    import game_session
+    
+    monkeypatch.setattr(inventory_system, "STACK_SIZES", {})
+    char = character_manager.create_character("Buffed", "Cleric")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"))
+    battle.effects.add_buff(char, "Blessing", "strength", 3, 3)
+    assert char['strength'] == 13
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Buffed", str(tmp_path))
+    assert loaded['strength'] == 10 and loaded['base_stats']['strength'] == 10
+    
+    actions = iter(["2"])
+    def read_action(battle):
+        for action in actions:
+            return action
+        raise EOFError
+    
+    world = game_session.GameWorld(
+        game_data.load_quests("data/quests.txt"),
+        game_data.load_items("data/items.txt"),
+        ledger=economy_ledger.EconomyLedger(str(tmp_path / "ledger.txt")))
+    session = game_session.GameSession(world, str(tmp_path), battle_input=read_action)
+    session.execute("new cleric Interrupted")
+    with pytest.raises(EOFError):
+        session.execute("explore")
+    assert session.character['strength'] == 10
+    session.execute("save")
+    assert character_manager.load_character("Interrupted", str(tmp_path))['strength'] == 10
+
 def test_shop_system():
     """Test buying and selling items"""
     char = character_manager.create_character("ShopTest", "Mage")
@@ -123,6 +186,239 @@ def test_shop_system():
     assert gold_received == 12  # Half of cost (25 // 2)
     assert "health_potion" not in char['inventory']
 
+def test_counted_inventory_save_round_trip():
+    """Test that the counted inventory saves and loads as a list of ids"""
+    char = character_manager.create_character("CountTest", "Rogue")
+    
+    for _ in range(3):
+        inventory_system.add_item_to_inventory(char, "health_potion")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    
+    assert inventory_system.count_item(char, "health_potion") == 3
+    assert inventory_system.get_inventory_space_remaining(char) == inventory_system.MAX_INVENTORY_SIZE - 4
+    
+    character_manager.save_character(char)
+    try:
+        loaded = character_manager.load_character("CountTest")
+    finally:
+        character_manager.delete_character("CountTest")
+    
+    assert inventory_system.count_item(loaded, "health_potion") == 3
+    assert inventory_system.has_item(loaded, "iron_sword")
+    assert len(loaded['inventory']) == 4
+    
+    inventory_system.remove_item_from_inventory(loaded, "iron_sword")
+    assert not inventory_system.has_item(loaded, "iron_sword")
+
+def test_stackable_items_and_capacity():
+    """Test bulk purchases of stackable items against per-character capacity"""
+    from custom_exceptions import InventoryFullError
+    
+    char = character_manager.create_character("StackTest", "Warrior")
+    char['gold'] = 100000
+    char['inventory_capacity'] = 3
+    arrows = {'cost': 1, 'type': 'consumable', 'effect': 'strength:0', 'stack_size': 100}
+    
+    inventory_system.purchase_item(char, "arrow", arrows, 250)
+    
+    assert inventory_system.count_item(char, "arrow") == 250
+    assert char['gold'] == 100000 - 250
+    assert inventory_system.get_inventory_space_remaining(char) == 0
+    
+    with pytest.raises(InventoryFullError):
+        inventory_system.purchase_item(char, "arrow", arrows, 51)
+    
+    assert inventory_system.sell_item(char, "arrow", arrows, 60) == 0
+    assert inventory_system.get_inventory_space_remaining(char) == 1
+    
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "steel_sword")
+
+def test_stack_sizes_fixed_per_inventory(monkeypatch):
+    """Test that slot accounting survives stack size changes while items are held"""
+    monkeypatch.setattr(inventory_system, "STACK_SIZES", {})
+    char = character_manager.create_character("StackFixTest", "Rogue")
+    inventory = inventory_system.get_inventory(char)
+    
+    inventory_system.add_item_to_inventory(char, "arrow", 150, {'stack_size': 100})
+    assert inventory.slots_used == 2
+    assert inventory_system.STACK_SIZES == {}      # item data never changes the registry
+    
+    inventory_system.register_item_catalog({'arrow': {'stack_size': 10}})
+    inventory_system.add_item_to_inventory(char, "arrow", 50)
+    assert inventory.slots_used == 2
+    inventory_system.remove_item_from_inventory(char, "arrow", 200)
+    assert inventory.slots_used == 0
+    
+    inventory_system.add_item_to_inventory(char, "arrow", 15)
+    assert inventory.slots_used == 2
+
+def test_batch_shop_transactions_are_atomic():
+    """Test that cart purchases and sales apply all items or none"""
+    from custom_exceptions import InsufficientResourcesError, InventoryFullError, ItemNotFoundError
+    
+    char = character_manager.create_character("CartTest", "Warrior")
+    char['inventory_capacity'] = 3
+    catalog = {
+        'health_potion': {'cost': 10, 'type': 'consumable', 'stack_size': 10},
+        'iron_sword': {'cost': 40, 'type': 'weapon'},
+        'plate_armor': {'cost': 80, 'type': 'armor'},
+    }
+    
+    with pytest.raises(InsufficientResourcesError):
+        inventory_system.purchase_items(char, {'iron_sword': 1, 'plate_armor': 1}, catalog)
+    assert char['gold'] == 100 and len(char['inventory']) == 0
+    
+    spent = inventory_system.purchase_items(char, [('health_potion', 4), ('iron_sword', 1), ('health_potion', 2)], catalog)
+    assert spent == 100 and char['gold'] == 0
+    assert inventory_system.count_item(char, 'health_potion') == 6
+    
+    char['gold'] = 1000
+    with pytest.raises(InventoryFullError):
+        inventory_system.purchase_items(char, {'health_potion': 5, 'plate_armor': 1}, catalog)
+    assert char['gold'] == 1000
+    assert inventory_system.count_item(char, 'health_potion') == 6
+    
+    with pytest.raises(ItemNotFoundError):
+        inventory_system.sell_items(char, {'health_potion': 2, 'plate_armor': 1}, catalog)
+    assert inventory_system.count_item(char, 'health_potion') == 6
+    
+    received = inventory_system.sell_items(char, {'health_potion': 6, 'iron_sword': 1}, catalog)
+    assert received == 6 * 5 + 20
+    assert char['gold'] == 1050 and len(char['inventory']) == 0
+
+def test_item_catalog_filtered_pages():
+    """Test catalog indexes by type, stat and cost range with paging"""
+    import item_catalog
+    
+    items = {f"blade_{i}": {'name': f"Blade {i}", 'type': 'weapon', 'effect': 'strength:1', 'cost': i * 10}
+             for i in range(1, 51)}
+    items['tonic'] = {'name': 'Tonic', 'type': 'consumable', 'effect': 'health:5,magic:1', 'cost': 15}
+    catalog = item_catalog.ItemCatalog(items, page_size=4)
+    
+    cheap = catalog.query(item_type='weapon', max_cost=200, page=3)
+    assert cheap.total == 20 and cheap.pages == 5
+    assert cheap.item_ids == ['blade_9', 'blade_10', 'blade_11', 'blade_12']
+    
+    assert catalog.query(stat='magic').item_ids == ['tonic']
+    assert catalog.count(item_type='weapon', stat='strength', min_cost=95, max_cost=120) == 3
+    assert catalog.query(item_type='armor').total == 0
+    assert catalog.query(item_type='weapon', max_cost=200, page=9).item_ids == []
+    assert catalog.types() == ['consumable', 'weapon']
+
+def test_inventory_events_report_deltas():
+    """Test that inventory and equipment changes emit events to subscribers"""
+    import game_events
+    
+    char = character_manager.create_character("EventTest", "Warrior")
+    sword = {'name': 'Sword', 'type': 'weapon', 'effect': 'strength:5', 'cost': 40}
+    axe = {'name': 'Axe', 'type': 'weapon', 'effect': 'strength:8', 'cost': 60}
+    events = []
+    kinds = ["item_added", "item_removed", "item_purchased", "item_sold", "item_equipped", "item_unequipped"]
+    for kind in kinds:
+        game_events.subscribe(kind, events.append)
+    try:
+        inventory_system.purchase_item(char, "sword", sword)
+        inventory_system.add_item_to_inventory(char, "axe")
+        inventory_system.equip_weapon(char, "sword", sword)
+        inventory_system.equip_weapon(char, "axe", axe)
+        inventory_system.sell_item(char, "sword", sword)
+    finally:
+        for kind in kinds:
+            game_events.unsubscribe(kind, events.append)
+    
+    assert [e.kind for e in events] == ["item_purchased", "item_added", "item_equipped", "item_equipped", "item_sold"]
+    assert (events[0].quantity, events[0].gold) == (1, -40)
+    assert (events[3].item_id, events[3].previous) == ("axe", "sword")
+    assert (events[4].quantity, events[4].gold) == (-1, 20)
+    assert not game_events.listening("item_added")
+    
+    inventory_system.add_item_to_inventory(char, "potion")
+    assert len(events) == 5
+
+def test_economy_ledger_tracks_gold_flow(tmp_path):
+    """Test that the ledger aggregates gold sources and sinks by reason"""
+    import economy_ledger
+    
+    filename = str(tmp_path / "ledger.txt")
+    ledger = economy_ledger.EconomyLedger(filename, flush_every=3)
+    char = character_manager.create_character("LedgerTest", "Rogue")
+    potion = {'name': 'Potion', 'type': 'consumable', 'cost': 30}
+    
+    ledger.attach()
+    try:
+        character_manager.add_gold(char, 50, "battle")
+        inventory_system.purchase_items(char, {'potion': 2}, {'potion': potion})
+        inventory_system.sell_item(char, 'potion', potion)
+        character_manager.add_gold(char, -20, "revive")
+    finally:
+        ledger.detach()
+    character_manager.add_gold(char, 999, "battle")
+    
+    assert ledger.totals == {'battle': [50, 0, 1], 'shop_buy': [0, 60, 1],
+                             'shop_sell': [15, 0, 1], 'revive': [0, 20, 1]}
+    assert ledger.net_change() == char['gold'] - 999 - 100
+    assert ledger.pending == {'revive': [0, 20, 1]}
+    
+    ledger.flush()
+    assert economy_ledger.load_ledger_totals(filename) == ledger.totals
+
+def test_inventory_sort_and_compact_layout():
+    """Test slot layout sorting, compaction and persistence as positions"""
+    char = character_manager.create_character("SortTest", "Warrior")
+    items = {
+        'health_potion': {'name': 'Health Potion', 'type': 'consumable', 'cost': 25, 'stack_size': 10},
+        'iron_sword': {'name': 'Iron Sword', 'type': 'weapon', 'cost': 100},
+        'leather_armor': {'name': 'Leather Armor', 'type': 'armor', 'cost': 40},
+        'strength_elixir': {'name': 'Strength Elixir', 'type': 'consumable', 'cost': 50},
+    }
+    inventory_system.register_item_catalog(items)
+    for item_id, qty in [('iron_sword', 1), ('health_potion', 12), ('leather_armor', 1), ('strength_elixir', 1)]:
+        inventory_system.add_item_to_inventory(char, item_id, qty)
+    inventory = char['inventory']
+    
+    inventory_system.remove_item_from_inventory(char, 'leather_armor')
+    assert inventory.layout == ['iron_sword', 'health_potion', None, 'strength_elixir']
+    inventory_system.compact_inventory(char)
+    assert inventory.layout == ['iron_sword', 'health_potion', 'strength_elixir']
+    
+    inventory_system.sort_inventory(char, items, "cost")
+    assert inventory.layout == ['health_potion', 'strength_elixir', 'iron_sword']
+    assert inventory.slot_contents() == [('health_potion', 10), ('health_potion', 2),
+                                         ('strength_elixir', 1), ('iron_sword', 1)]
+    
+    inventory_system.sort_inventory(char, items, "type")
+    assert inventory.layout == ['health_potion', 'strength_elixir', 'iron_sword']
+    inventory_system.sort_inventory(char, items, "name")
+    assert inventory.layout == ['health_potion', 'iron_sword', 'strength_elixir']
+    
+    character_manager.save_character(char)
+    try:
+        loaded = character_manager.load_character("SortTest")
+    finally:
+        character_manager.delete_character("SortTest")
+    assert loaded['inventory'].layout == ['health_potion', 'iron_sword', 'strength_elixir']
+    assert "inventory_layout" not in loaded
+    
+    inventory_system.add_item_to_inventory(loaded, 'leather_armor')
+    assert loaded['inventory'].layout[-1] == 'leather_armor'
+
+def test_multi_stat_item_effects():
+    """Test that multi-stat effects are parsed once and applied together"""
+    items = game_data.load_items("data/items.txt")
+    assert items['iron_sword']['effects'] == (("strength", 5),)
+    
+    char = character_manager.create_character("EffectItemTest", "Mage")
+    tonic = {'name': 'Tonic', 'type': 'consumable', 'effect': 'strength:5,magic:3'}
+    inventory_system.add_item_to_inventory(char, "tonic")
+    
+    inventory_system.use_item(char, "tonic", tonic)
+    
+    assert char['strength'] == 8 + 5
+    assert char['magic'] == 20 + 3
+    assert tonic['effects'] == (("strength", 5), ("magic", 3))
+
 # ============================================================================
 # QUEST INTEGRATION TESTS
 # ============================================================================
@@ -187,6 +483,243 @@ def test_quest_prerequisite_system():
     quest_handler.accept_quest(char, 'second_quest', quests)
     assert 'second_quest' in char['active_quests']
 
+def test_quest_objectives_complete_from_events():
+    """Test that kill and buy objectives track events and complete quests"""
+    import quest_objectives
+    
+    quests = game_data.load_quests("data/quests.txt")
+    items = game_data.load_items("data/items.txt")
+    assert quests['goblin_hunter']['objectives'] == [("kill", ("goblin",), 3)]
+    
+    char = character_manager.create_character("ObjectiveTest", "Warrior")
+    finished = []
+    tracker = quest_handler.attach_objective_tracking(
+        quests, items, lambda c, quest, rewards: finished.append(quest['quest_id']))
+    
+    def defeat(enemy_type):
+        enemy = combat_system.create_enemy(enemy_type)
+        enemy['health'] = 0
+        combat_system.SimpleBattle(char, enemy).check_battle_end()
+    
+    try:
+        quest_handler.accept_quest(char, 'first_steps', quests)
+        defeat('goblin')
+        assert finished == ['first_steps']
+        assert char['completed_quests'] == ['first_steps']
+        
+        char['level'] = 2
+        quest_handler.accept_quest(char, 'goblin_hunter', quests)
+        quest_handler.accept_quest(char, 'equipment_upgrade', quests)
+        defeat('goblin')
+        defeat('orc')
+        defeat('goblin')
+        assert quest_objectives.get_progress(char, 'goblin_hunter') == [2]
+        
+        inventory_system.purchase_item(char, 'health_potion', items['health_potion'])
+        assert 'equipment_upgrade' in char['active_quests']
+        inventory_system.purchase_item(char, 'leather_armor', items['leather_armor'])
+        assert finished == ['first_steps', 'equipment_upgrade']
+        
+        character_manager.save_character(char)
+        try:
+            loaded = character_manager.load_character("ObjectiveTest")
+        finally:
+            character_manager.delete_character("ObjectiveTest")
+        assert quest_objectives.get_progress(loaded, 'goblin_hunter') == [2]
+        
+        char = loaded
+        defeat('goblin')
+        assert finished[-1] == 'goblin_hunter'
+        assert 'goblin_hunter' in loaded['completed_quests']
+    finally:
+        tracker.detach()
+
+def test_quest_log_views_are_cached():
+    """Test quest log views are reused until a quest changes state"""
+    import quest_objectives
+    
+    quests = game_data.load_quests("data/quests.txt")
+    char = character_manager.create_character("LogTest", "Rogue")
+    char['completed_quests'].append('first_steps')
+    char['level'] = 2
+    
+    available = quest_handler.get_quest_log_view(char, quests, "available")
+    assert [q for q, _ in available] == ['goblin_hunter', 'equipment_upgrade']
+    assert quest_handler.get_quest_log_view(char, quests, "available") is available
+    
+    quest_handler.accept_quest(char, 'goblin_hunter', quests)
+    active = quest_handler.get_quest_log_view(char, quests, "active")
+    assert [q for q, _ in active] == ['goblin_hunter']
+    assert quest_handler.get_quest_log_view(char, quests, "available") is not available
+    
+    quest_objectives.record_event(char, [("kill", "goblin")], quests)
+    assert quest_objectives.get_percent(char, 'goblin_hunter') == 33
+    quest_objectives.record_event(char, [("kill", "goblin")], quests)
+    assert quest_objectives.get_percent(char, 'goblin_hunter') == 67
+    assert quest_handler.get_quest_log_view(char, quests, "active") is active
+    
+    quest_handler.abandon_quest(char, 'goblin_hunter')
+    assert quest_handler.get_quest_log_view(char, quests, "active") == []
+    assert quest_objectives.get_percent(char, 'goblin_hunter') is None
+
+def test_quest_planner_route_and_cache():
+    """Test shortest prerequisite route with XP estimates and memoization"""
+    import quest_planner
+    
+    quests = game_data.load_quests("data/quests.txt")
+    planner = quest_planner.QuestPlanner(quests)
+    char = character_manager.create_character("PlanTest", "Warrior")
+    
+    plan = planner.plan(char, 'dragon_slayer')
+    assert [s.quest_id for s in plan.steps] == ['first_steps', 'goblin_hunter', 'orc_menace', 'dragon_slayer']
+    # first_steps: 50 XP (lv 1); goblin_hunter needs lv 2 -> grind 50 XP
+    assert plan.steps[1].grind_xp == 50 and plan.steps[1].level_before == 2
+    assert plan.reward_xp == 50 + 100 + 200 + 500
+    assert plan.final_level == character_manager.level_for_total_xp(plan.reward_xp + plan.grind_xp)
+    
+    other = character_manager.create_character("PlanTest2", "Mage")
+    other['completed_quests'] = ['equipment_upgrade']    # not on the dragon chain
+    assert planner.plan(other, 'dragon_slayer') is plan
+    assert (planner.hits, planner.misses) == (1, 1)
+    
+    char['completed_quests'] = ['first_steps', 'goblin_hunter']
+    char['level'] = 3
+    short = planner.plan(char, 'dragon_slayer')
+    assert [s.quest_id for s in short.steps] == ['orc_menace', 'dragon_slayer']
+
+def test_repeatable_and_timed_quests():
+    """Test quest resets and time limits driven by the deadline scheduler"""
+    import quest_scheduler
+    from custom_exceptions import QuestAlreadyCompletedError, QuestNotActiveError
+    
+    quests = game_data.load_quests("data/quests.txt")
+    assert quests['goblin_raid']['repeat'] == "weekly" and quests['goblin_raid']['time_limit'] == 30
+    
+    day = quest_handler.SECONDS_PER_DAY
+    monday = 4 * day                        # 1970-01-05 was a Monday
+    char = character_manager.create_character("TimedTest", "Warrior")
+    char['level'] = 2
+    char['completed_quests'] = ['first_steps', 'goblin_hunter']
+    scheduler = quest_scheduler.QuestScheduler()
+    scheduler.attach()
+    try:
+        quest_handler.accept_quest(char, 'daily_patrol', quests, now=monday + 100)
+        quest_handler.complete_quest(char, 'daily_patrol', quests, now=monday + 200)
+        assert char['quest_resets'] == {'daily_patrol': monday + day}
+        with pytest.raises(QuestAlreadyCompletedError):
+            quest_handler.accept_quest(char, 'daily_patrol', quests, now=monday + 300)
+        
+        quest_handler.accept_quest(char, 'goblin_raid', quests, now=monday + 1000)
+        assert char['quest_deadlines'] == {'goblin_raid': monday + 1000 + 30 * 60}
+        
+        assert scheduler.advance(monday + 1000) == []
+        fired = scheduler.advance(monday + day)
+        assert [(kind, quest_id) for kind, _, quest_id in fired] == [("failed", "goblin_raid"), ("reset", "daily_patrol")]
+        assert 'goblin_raid' not in char['active_quests']
+        assert len(scheduler) == 0
+        
+        quest_handler.accept_quest(char, 'daily_patrol', quests, now=monday + day + 5)
+        quest_handler.accept_quest(char, 'goblin_raid', quests, now=monday + day)
+        with pytest.raises(QuestNotActiveError):
+            quest_handler.complete_quest(char, 'goblin_raid', quests, now=monday + day + 31 * 60)
+        assert scheduler.advance(monday + 2 * day) == []    # stale entry skipped
+        
+        quest_handler.accept_quest(char, 'goblin_raid', quests, now=monday + 2 * day)
+        quest_handler.complete_quest(char, 'goblin_raid', quests, now=monday + 2 * day + 60)
+        assert char['quest_resets']['goblin_raid'] == monday + 7 * day
+    finally:
+        scheduler.detach()
+
+def test_objectives_met_after_deadline_leave_quest_to_scheduler(tmp_path):
+    """Test that objectives met too late neither complete the quest nor raise"""
+    import economy_ledger
+    import game_session
+
+    world = game_session.GameWorld(
+        game_data.load_quests("data/quests.txt"),
+        game_data.load_items("data/items.txt"),
+        ledger=economy_ledger.EconomyLedger(str(tmp_path / "ledger.txt")))
+    world.attach()
+    clock = [1000.0]
+    session = game_session.GameSession(world, str(tmp_path), clock=lambda: clock[0])
+
+    def defeat_goblin():
+        enemy = combat_system.create_enemy('goblin')
+        enemy['health'] = 0
+        combat_system.SimpleBattle(session.character, enemy).check_battle_end()
+
+    try:
+        session.execute("new warrior LateRaider")
+        session.character['level'] = 2
+        session.character['completed_quests'] = ['first_steps', 'goblin_hunter']
+        assert session.execute("accept goblin_raid") == ["Quest accepted!"]
+
+        clock[0] += 31 * 60
+        session.now = clock[0]
+        defeat_goblin()
+        defeat_goblin()
+        assert 'goblin_raid' in session.character['active_quests']
+        assert session.character['gold'] == 100
+
+        assert session.tick() == ["\n*** Out of time: Goblin Raid failed. ***"]
+        assert 'goblin_raid' not in session.character['active_quests']
+    finally:
+        world.detach()
+
+def test_bulk_quest_settlement(tmp_path):
+    """Test settling one quest for many characters in a single batch"""
+    quests = {
+        'festival': {
+            'quest_id': 'festival', 'title': 'Festival', 'description': 'Server event',
+            'reward_xp': 350, 'reward_gold': 40, 'required_level': 1, 'prerequisite': 'NONE'
+        }
+    }
+    heroes = [character_manager.create_character(f"Bulk{i}", "Mage") for i in range(5)]
+    for hero in heroes[:4]:
+        quest_handler.accept_quest(hero, 'festival', quests)
+    heroes[3]['health'] = 0
+    heroes[1]['experience'] = 60
+    
+    result = quest_handler.settle_quest_batch(heroes, 'festival', quests, str(tmp_path))
+    
+    assert result['settled'] == ['Bulk0', 'Bulk1', 'Bulk2']
+    assert set(result['rejected']) == {'Bulk3', 'Bulk4'}
+    # 350 XP from level 1: 100 -> level 2, 200 -> level 3, 50 left over
+    assert (heroes[0]['level'], heroes[0]['experience']) == (3, 50)
+    assert (heroes[1]['level'], heroes[1]['experience']) == (3, 110)
+    assert heroes[0]['gold'] == 140 and heroes[3]['gold'] == 100
+    assert heroes[0]['max_health'] == 80 + 20 and heroes[0]['health'] == 100
+    assert 'festival' in heroes[2]['completed_quests']
+    
+    loaded = character_manager.load_character("Bulk2", str(tmp_path))
+    assert loaded['level'] == 3 and loaded['completed_quests'] == ['festival']
+    assert sorted(os.listdir(tmp_path)) == ['Bulk0_save.txt', 'Bulk1_save.txt', 'Bulk2_save.txt']
+
+    twice = character_manager.create_character("Twice", "Mage")
+    quest_handler.accept_quest(twice, 'festival', quests)
+    result = quest_handler.settle_quest_batch([twice, twice], 'festival', quests, save=False)
+    assert result == {'settled': ['Twice'], 'rejected': {}}
+    assert (twice['level'], twice['experience'], twice['gold']) == (3, 50, 140)
+
+def test_batch_experience_matches_single_level_ups():
+    """Test that batch XP emits one level_up per level and skips the dead"""
+    import game_events
+    
+    hero = character_manager.create_character("Batch", "Mage")
+    fallen = character_manager.create_character("Fallen", "Mage")
+    fallen['health'] = 0
+    events = []
+    
+    game_events.subscribe("level_up", events.append)
+    try:
+        gained = character_manager.gain_experience_batch([hero, fallen], 350)
+    finally:
+        game_events.unsubscribe("level_up", events.append)
+    
+    assert gained == [2, 0]
+    assert [(e.character['name'], e.level) for e in events] == [("Batch", 2), ("Batch", 3)]
+    assert (fallen['level'], fallen['experience'], fallen['health']) == (1, 0, 0)
+
 # ============================================================================
 # COMBAT INTEGRATION TESTS
 # ============================================================================
@@ -204,6 +737,20 @@ def test_combat_system_basic_battle():
     assert battle.character == char
     assert battle.enemy == enemy
 
+def test_battle_log_quiet_by_default(capsys):
+    """Test that a battle only prints when its caller opts in"""
+    from battle_log import BattleLog
+    
+    char = character_manager.create_character("Quiet", "Warrior")
+    battle = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"))
+    battle.enemy_turn()
+    assert capsys.readouterr().out == ""
+    assert len(battle.log) == 1
+    
+    loud = combat_system.SimpleBattle(char, combat_system.create_enemy("goblin"), log=BattleLog(echo=True))
+    loud.enemy_turn()
+    assert "Goblin" in capsys.readouterr().out
+
 def test_combat_victory_rewards():
     """Test that winning combat grants rewards"""
     char = character_manager.create_character("RewardTest", "Mage")
@@ -222,6 +769,187 @@ def test_combat_victory_rewards():
     assert rewards['xp'] == expected_xp
     assert rewards['gold'] == expected_gold
 
+def test_party_battle_turn_order():
+    """Test that faster combatants act more often in a party battle"""
+    fast = character_manager.create_character("FastTest", "Rogue")
+    fast['speed'] = 20
+    slow = combat_system.create_enemy("dragon")
+    slow['speed'] = 5
+    slow['strength'] = 1
+    
+    battle = combat_system.PartyBattle([fast], [slow])
+    actors = [battle.take_turn()['actor'] for _ in range(5)]
+    
+    assert actors.count("FastTest") == 4
+    assert actors.count("Dragon") == 1
+
+def test_party_battle_targets_weakest():
+    """Test that party battles finish and always hit the weakest enemy"""
+    party = [character_manager.create_character(f"Party{i}", "Warrior") for i in range(3)]
+    for member in party:
+        member['strength'] = 60
+    goblins = [combat_system.create_enemy("goblin") for _ in range(10)]
+    goblins[4]['health'] = 5
+    
+    battle = combat_system.PartyBattle(party, goblins)
+    while True:
+        action = battle.take_turn()
+        if action['actor'].startswith("Party"):
+            break
+    
+    assert goblins[4]['health'] == 0
+    
+    result = battle.start_battle()
+    assert result['winner'] == "player"
+    assert result['xp_gained'] == 10 * goblins[0]['xp_reward']
+    assert all(goblin['health'] == 0 for goblin in goblins)
+
+def test_party_battle_kills_advance_objectives():
+    """Test that every party member gets kill credit and quests finish in a fixed order"""
+    import game_events
+    import quest_objectives
+    
+    quests = {quest_id: {'quest_id': quest_id, 'objectives': [("kill", ("goblin",), 2)]}
+              for quest_id in ("zeta", "alpha", "mid")}
+    party = [character_manager.create_character(f"Hunter{i}", "Warrior") for i in range(2)]
+    for member in party:
+        member['strength'] = 60
+        member['active_quests'] = ["zeta", "alpha", "mid"]
+    
+    finished = []
+    def on_defeated(event):
+        done = quest_objectives.record_event(event.character, [("kill", event.enemy_type)], quests)
+        finished.extend((event.character['name'], quest_id) for quest_id in done)
+    
+    game_events.subscribe("enemy_defeated", on_defeated)
+    try:
+        goblins = [combat_system.create_enemy("goblin") for _ in range(2)]
+        assert combat_system.PartyBattle(party, goblins).start_battle()['winner'] == "player"
+    finally:
+        game_events.unsubscribe("enemy_defeated", on_defeated)
+    
+    assert finished == [(name, quest_id) for name in ("Hunter0", "Hunter1")
+                        for quest_id in ("zeta", "alpha", "mid")]
+
+def test_status_effects_expire_on_schedule():
+    """Test cooldowns, damage over time, stuns and buff expiry"""
+    from status_effects import EffectTracker
+    
+    char = character_manager.create_character("EffectTest", "Cleric")
+    enemy = combat_system.create_enemy("orc")
+    effects = EffectTracker()
+    effects.advance(1)
+    
+    effects.add_damage_over_time(enemy, "Burn", 5, 2)
+    effects.add_buff(char, "Blessing", "strength", 3, 2)
+    effects.add_stun(enemy, 1)
+    effects.start_cooldown(char, "Heal", 3)
+    
+    assert char['strength'] == 13
+    assert effects.is_stunned(enemy)
+    
+    ticks = effects.advance(2)
+    assert [tick['damage'] for tick in ticks] == [5]
+    assert not effects.is_stunned(enemy)
+    
+    effects.advance(3)
+    assert enemy['health'] == 70
+    assert char['strength'] == 10
+    assert effects.cooldown_remaining(char, "Heal") == 1
+    
+    effects.advance(4)
+    assert enemy['health'] == 70
+    assert effects.cooldown_remaining(char, "Heal") == 0
+
+def test_battle_log_binary_round_trip():
+    """Test that battle events survive the binary archive format"""
+    import battle_log
+    
+    party = [character_manager.create_character("LogTest", "Mage")]
+    enemies = [combat_system.create_enemy("goblin") for _ in range(3)]
+    log = battle_log.BattleLog(capacity=5, echo=False)
+    
+    result = combat_system.PartyBattle(party, enemies, log=log).start_battle()
+    assert result['winner'] in ("player", "enemy")
+    assert len(log) == 5  # Ring buffer keeps only the newest events
+    
+    log.save("test_battle_log.bin")
+    try:
+        loaded = battle_log.load_battle_log("test_battle_log.bin")
+    finally:
+        os.remove("test_battle_log.bin")
+    
+    assert loaded == list(log)
+    assert list(log.lines())[-1] == battle_log.format_event(loaded[-1])
+
+def test_concurrent_async_battle_sessions():
+    """Test many battles sharing one event loop"""
+    import asyncio
+    import combat_session
+    
+    async def play():
+        sessions = []
+        for i in range(500):
+            char = character_manager.create_character(f"Async{i}", "Warrior")
+            sessions.append((char, combat_system.create_enemy("goblin"),
+                             combat_session.ScriptedInput(["2", "1"])))
+        
+        queued = combat_session.QueueInput()
+        char = character_manager.create_character("Queued", "Mage")
+        battle = asyncio.ensure_future(combat_session.run_battle_session(
+            char, combat_system.create_enemy("goblin"), queued))
+        for _ in range(10):
+            queued.send("1")
+        
+        results = await combat_session.run_battle_sessions(sessions)
+        return results, await battle
+    
+    results, queued_result = asyncio.run(play())
+    
+    assert len(results) == 500
+    assert all(result['winner'] == "player" for result in results)
+    assert queued_result['winner'] == "player"
+
+def test_loot_tables_and_batch_drops():
+    """Test alias-sampled drops, batch rolls and awarding loot"""
+    import loot_system
+    
+    tables = loot_system.load_loot_tables("data/loot_tables.txt")
+    assert set(tables) == {"goblin", "orc", "dragon"}
+    
+    table = loot_system.LootTable("slime", [(None, 50, 1), ("gel", 30, 1), ("gem", 20, 2)])
+    loot = table.roll_batch(20000, seed=7)
+    assert abs(loot["gel"] / 20000 - 0.30) < 0.02
+    assert abs(loot["gem"] / 2 / 20000 - 0.20) < 0.02
+    assert table.roll_batch(20000, seed=7) == loot
+    
+    char = character_manager.create_character("LootTest", "Warrior")
+    char['inventory_capacity'] = 2
+    items = {"gel": {"stack_size": 100}, "gem": {}}
+    awarded, left_behind = loot_system.award_loot(char, {"gel": 150, "gem": 3}, items)
+    assert awarded == {"gel": 150}
+    assert left_behind == {"gem": 3}
+    assert inventory_system.get_inventory_space_remaining(char) == 0
+
+def test_damage_table_invalidated_by_buffs():
+    """Test that cached damage follows stat changes made by buffs"""
+    char = character_manager.create_character("TableTest", "Cleric")
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(char, enemy)
+    
+    assert battle.calculate_damage(char, enemy) == 10 - 12 // 4
+    
+    battle.effects.add_buff(char, "Blessing", "strength", 3, 1)
+    assert battle.calculate_damage(char, enemy) == 13 - 12 // 4
+    
+    battle.effects.advance(2)
+    assert battle.calculate_damage(char, enemy) == 10 - 12 // 4
+    
+    # Combatants outside the battle fall back to the plain damage rule
+    dragon = combat_system.create_enemy("dragon")
+    assert battle.calculate_damage(dragon, char) == combat_system.calculate_damage(dragon, char)
+    assert battle.calculate_damage(char, dragon) == 10 - 25 // 4
+
 # ============================================================================
 # DATA LOADING INTEGRATION TESTS
 # ============================================================================
@@ -274,6 +1002,364 @@ def test_data_validation():
     
     assert game_data.validate_item_data(valid_item) == True
 
+def test_headless_game_session(tmp_path):
+    """Test driving a game through GameSession commands"""
+    import economy_ledger
+    import game_session
+    
+    world = game_session.GameWorld(
+        game_data.load_quests("data/quests.txt"),
+        game_data.load_items("data/items.txt"),
+        ledger=economy_ledger.EconomyLedger(str(tmp_path / "ledger.txt")))
+    world.attach()
+    session = game_session.GameSession(world, save_directory=str(tmp_path))
+    
+    try:
+        assert session.execute("stats") == ["No character loaded."]
+        assert session.execute("new Paladin Bot") == ["Invalid class name. Try again."]
+        session.execute("new warrior Bot")
+        assert session.character['class'] == "Warrior"
+        
+        assert session.execute("accept first_steps") == ["Quest accepted!"]
+        lines = session.execute("explore")
+        assert "You encounter a Goblin!" in lines
+        assert any("Quest complete: First Steps" in line for line in lines)
+        assert session.character['completed_quests'] == ['first_steps']
+        
+        assert session.execute("buy health_potion x2, bogus") == ["Error: Invalid item: bogus"]
+        assert session.execute("buy health_potion x2") == ["Purchase successful! Spent 50 gold."]
+        assert "Page 1/1 (3 items)" in session.execute("shop filter type=weapon")
+        assert session.execute("use health_potion")[0].startswith("Used Health Potion")
+        
+        output = session.run_script(["stats", "quests available", "explore"] * 100 + ["save", "quit", "stats"])
+        assert session.commands_run == 310
+        assert not session.running
+        assert "Game saved successfully." in output
+        assert character_manager.load_character("Bot", str(tmp_path))['level'] == session.character['level']
+    finally:
+        world.detach()
+
+def test_game_server_hosts_concurrent_sessions(tmp_path):
+    """Test many players on one local game server"""
+    import asyncio
+    import economy_ledger
+    import game_server
+    import game_session
+    
+    world = game_session.GameWorld(
+        game_data.load_quests("data/quests.txt"),
+        game_data.load_items("data/items.txt"),
+        ledger=economy_ledger.EconomyLedger(str(tmp_path / "ledger.txt")))
+    
+    async def request(reader, writer, line):
+        writer.write((line + "\n").encode())
+        return await read_reply(reader)
+    
+    async def read_reply(reader):
+        lines = []
+        while True:
+            line = (await reader.readline()).decode().rstrip("\n")
+            if line == game_server.END_OF_REPLY:
+                return lines
+            lines.append(line)
+    
+    async def play(port, i):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        await read_reply(reader)
+        await request(reader, writer, f"new Rogue Player{i}")
+        await request(reader, writer, "accept first_steps")
+        for _ in range(i % 3 + 1):
+            await request(reader, writer, "explore")
+        stats = await request(reader, writer, "stats")
+        await request(reader, writer, "quit")
+        writer.close()
+        return stats
+    
+    async def run():
+        server = game_server.GameServer(world, port=0, save_directory=str(tmp_path),
+                                        autosave_interval=0.01)
+        await server.start()
+        try:
+            results = await asyncio.gather(*(play(server.port, i) for i in range(30)))
+            
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            await read_reply(reader)
+            await request(reader, writer, "new Mage Holder")
+            other_reader, other_writer = await asyncio.open_connection("127.0.0.1", server.port)
+            await read_reply(other_reader)
+            duplicate = await request(other_reader, other_writer, "load Holder")
+            await asyncio.sleep(0.05)
+            writer.close()
+            other_writer.close()
+            return results, duplicate, server.saves_written
+        finally:
+            await server.stop()
+    
+    results, duplicate, saves = asyncio.run(run())
+    
+    assert duplicate == ["Character already in play."]
+    assert saves >= 31
+    for i, stats in enumerate(results):
+        assert f"Name: Player{i}" in stats
+        loaded = character_manager.load_character(f"Player{i}", str(tmp_path))
+        assert loaded['completed_quests'] == ['first_steps']
+        assert f"Experience: {loaded['experience']}" in stats
+
+def test_game_server_saves_before_switching_characters(tmp_path):
+    """Test that a pending autosave is written for the character being left"""
+    import asyncio
+    import economy_ledger
+    import game_server
+    import game_session
+
+    world = game_session.GameWorld(
+        game_data.load_quests("data/quests.txt"),
+        game_data.load_items("data/items.txt"),
+        ledger=economy_ledger.EconomyLedger(str(tmp_path / "ledger.txt")))
+    character_manager.save_character(character_manager.create_character("Second", "Cleric"),
+                                      str(tmp_path))
+
+    async def run():
+        server = game_server.GameServer(world, port=0, save_directory=str(tmp_path),
+                                        autosave_interval=60)
+        await server.start()
+        connection = game_server.PlayerConnection(server, writer=None)
+        try:
+            await server.execute(connection, "new Rogue First")
+            await server.execute(connection, "accept first_steps")
+            assert connection.save_handle is not None
+            await server.execute(connection, "load Second")
+            await asyncio.gather(*connection.saving)
+            first = character_manager.load_character("First", str(tmp_path))
+
+            saved = await server.execute(connection, "save")
+            return first, saved, server.saves_written
+        finally:
+            await connection.close()
+            await server.stop()
+
+    first, saved, saves = asyncio.run(run())
+
+    assert first['active_quests'] == ['first_steps']
+    assert saved == ["Game saved successfully."]
+    assert saves == 3
+
+def test_game_server_rejects_unsafe_character_names(tmp_path):
+    """Test that network clients cannot reach files outside the save directory"""
+    import asyncio
+    import economy_ledger
+    import game_server
+    import game_session
+    
+    world = game_session.GameWorld(
+        game_data.load_quests("data/quests.txt"),
+        game_data.load_items("data/items.txt"),
+        ledger=economy_ledger.EconomyLedger(str(tmp_path / "ledger.txt")))
+    save_directory = tmp_path / "saves" / "inner"
+    
+    async def run():
+        server = game_server.GameServer(world, port=0, save_directory=str(save_directory))
+        await server.start()
+        connection = game_server.PlayerConnection(server, writer=None)
+        try:
+            replies = [await server.execute(connection, line) for line in [
+                "new Warrior ../../escaped", "new Warrior a/b", "new Warrior ..", "new Warrior",
+                "new Warrior back\\slash", "load ../inner/x", "load"]]
+            replies.append(await server.execute(connection, "save"))
+            return replies
+        finally:
+            await connection.close()
+            await server.stop()
+    
+    replies = asyncio.run(run())
+    
+    assert replies[:-1] == [["Invalid character name."]] * 7
+    assert replies[-1] == ["No character loaded."]
+    assert list(tmp_path.rglob("*_save.txt")) == []
+
+def test_scripted_input_drives_menus_iteratively(tmp_path, monkeypatch, capsys):
+    """Test long and hostile input streams against the terminal menus"""
+    import itertools
+    import main
+    import game_input
+    
+    monkeypatch.chdir(tmp_path)     # default data files are created here
+    monkeypatch.setattr(main, "world", None)
+    monkeypatch.setattr(main, "session", None)
+    
+    monkeypatch.setattr(main, "player_input", game_input.ScriptedInput(["bad"] * 10))
+    assert main.main_menu() is None
+    assert main.player_input.lines_read == game_input.MAX_RETRIES
+    
+    menus = itertools.chain.from_iterable(itertools.repeat(["0", "1"], 20000))
+    script = itertools.chain(["1", "InputBot", "1"], menus, ["nope"] * 100)
+    monkeypatch.setattr(main, "player_input", game_input.ScriptedInput(script))
+    main.main([])
+    
+    # Invalid answers only re-show the game menu; the end of input saves and quits
+    assert main.player_input.lines_read == 3 + 40000 + 100
+    assert not main.session.running
+    assert character_manager.load_character("InputBot")['name'] == "InputBot"
+    out = capsys.readouterr().out
+    assert out.count("=== CHARACTER STATS ===") == 20000
+    assert out.count("=== GAME MENU ===") == 20000 + 100 // game_input.MAX_RETRIES + 1
+
+def test_lazy_world_and_startup_profile(tmp_path, monkeypatch, capsys):
+    """Test catalogs are parsed on first use and startup can be profiled"""
+    import main
+    import game_session
+    from custom_exceptions import MissingDataFileError
+    
+    world = game_session.load_world()
+    assert world.catalogs == {}
+    assert 'goblin_hunter' in world.planner.chain('dragon_slayer')
+    assert set(world.catalogs) == {'quests', 'planner'}
+    
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(MissingDataFileError):
+        game_session.load_world()
+    
+    monkeypatch.setattr(main, "world", None)
+    main.main(["--profile-startup"])
+    report = capsys.readouterr().out
+    assert "Missing data files. Creating defaults..." in report
+    assert "=== STARTUP PROFILE ===" in report
+    assert "load quests" in report and "total" in report
+    assert main.world.catalogs['items']
+
+def test_lazy_world_registers_stack_sizes_before_loading(tmp_path, monkeypatch):
+    """Test that a save loaded on a fresh lazy world uses catalog stack sizes"""
+    import game_session
+
+    monkeypatch.setattr(inventory_system, "STACK_SIZES", {})
+    char = character_manager.create_character("Stacker", "Rogue")
+    char['inventory'] = ["health_potion"] * 12
+    character_manager.save_character(char, str(tmp_path))
+
+    world = game_session.load_world()
+    session = game_session.GameSession(world, str(tmp_path))
+    session.execute("load Stacker")
+    inventory = session.character['inventory']
+    assert inventory.slots_used == 2            # health potions stack by 10
+
+    session.execute("sell health_potion x12")
+    assert inventory.total == 0 and inventory.slots_used == 0
+
+def test_session_record_and_replay(tmp_path):
+    """Test that a recorded session replays to the same states"""
+    import random
+    import economy_ledger
+    import game_session
+    import loot_system
+    import session_replay
+    
+    def new_world(name):
+        world = game_session.GameWorld(
+            game_data.load_quests("data/quests.txt"),
+            game_data.load_items("data/items.txt"),
+            loot_system.load_loot_tables("data/loot_tables.txt"),
+            ledger=economy_ledger.EconomyLedger(str(tmp_path / name)))
+        world.attach()
+        return world
+    
+    character_manager.save_character(character_manager.create_character("Replayed", "Rogue"),
+                                      str(tmp_path))
+    recording_file = str(tmp_path / "session.qcr.gz")
+    recorder = session_replay.SessionRecorder(recording_file, seed=1234)
+    world = new_world("recorded.txt")
+    player = random.Random(7)     # the player's choices must not draw from the game's RNG
+    session = game_session.GameSession(world, str(tmp_path),
+                                       battle_input=lambda battle: player.choice("1123"))
+    recorder.attach(session)
+    try:
+        session.run_script(["load Replayed", "accept first_steps"] + ["explore", "stats"] * 20 +
+                           ["buy health_potion x2", "bogus", "save"])
+    finally:
+        recorder.close()
+        world.detach()
+    
+    recording = session_replay.load_recording(recording_file)
+    assert recording.seed == 1234
+    assert recording.events[1]['file'] == "Replayed"
+    
+    world = new_world("replayed.txt")
+    try:
+        result = session_replay.replay(recording, world)
+    finally:
+        world.detach()
+    
+    assert result.diverged == []
+    assert len(result.latencies) == 45
+    summary = session_replay.summarize(result.latencies)
+    assert summary['explore'].count == 20
+    assert summary['all'].count == 45
+    assert session_replay.latency_report(summary)[-1].startswith("all")
+
+def test_replay_timed_and_repeatable_quests_on_session_clock(tmp_path):
+    """Test that quest deadlines and resets follow the recorded clock"""
+    import random
+    import economy_ledger
+    import game_session
+    import loot_system
+    import session_replay
+
+    def new_world(name):
+        world = game_session.GameWorld(
+            game_data.load_quests("data/quests.txt"),
+            game_data.load_items("data/items.txt"),
+            loot_system.load_loot_tables("data/loot_tables.txt"),
+            ledger=economy_ledger.EconomyLedger(str(tmp_path / name)))
+        world.attach()
+        return world
+
+    char = character_manager.create_character("Patrol", "Warrior")
+    char['level'] = 2
+    char['completed_quests'] = ['first_steps', 'goblin_hunter']
+    character_manager.save_character(char, str(tmp_path))
+
+    day = quest_handler.SECONDS_PER_DAY
+    monday = 4 * day                        # far from the wall clock on purpose
+    clock = [monday + 3600]
+    recording_file = str(tmp_path / "timed.qcr")
+    recorder = session_replay.SessionRecorder(recording_file, seed=1234, clock=lambda: clock[0])
+    world = new_world("recorded.txt")
+    player = random.Random(7)
+    session = game_session.GameSession(world, str(tmp_path), clock=lambda: clock[0],
+                                       battle_input=lambda battle: player.choice("1123"))
+    recorder.attach(session)
+
+    def run(*commands):
+        output = []
+        for command in commands:
+            clock[0] += 60
+            output.extend(session.execute(command))
+        return output
+
+    try:
+        run("load Patrol", "accept daily_patrol", "accept goblin_raid")
+        lines = run(*["explore"] * 10)
+        assert any("Quest complete: Goblin Raid" in line for line in lines)
+        assert any("Quest complete: Daily Patrol" in line for line in lines)
+        assert session.character['quest_resets'] == {'goblin_raid': monday + 7 * day,
+                                                     'daily_patrol': monday + day}
+        assert not any("Daily Patrol" in line for line in run("quests available"))
+
+        clock[0] = monday + day + 60
+        assert session.tick() == ["\n*** Daily Patrol is available again. ***"]
+        assert any("Daily Patrol" in line for line in run("quests available"))
+        assert run("accept daily_patrol") == ["Quest accepted!"]
+    finally:
+        recorder.close()
+        world.detach()
+
+    world = new_world("replayed.txt")
+    try:
+        result = session_replay.replay(session_replay.load_recording(recording_file), world)
+    finally:
+        world.detach()
+    assert result.diverged == []
+    assert len(result.latencies) == 16
+
 # ============================================================================
 # FULL GAME WORKFLOW TEST
 # ============================================================================